@@ -0,0 +1,58 @@
+"""
+Utilidades sobre la caché de Django
+
+Varias funciones usan la caché como memoria compartida entre procesos
+(contadores diferidos, semáforos, límites de frecuencia, modelos entrenados).
+Eso solo funciona si la caché la ven todos los procesos web y los workers de
+Celery, como Redis; la caché en memoria de desarrollo es propia de cada proceso.
+"""
+import logging
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.cache.backends.redis import RedisCache
+
+logger = logging.getLogger(__name__)
+
+PROCESS_LOCAL_BACKENDS = (LocMemCache, DummyCache)
+
+# Alternativa elegida cuando la caché por defecto no es compartida, una vez por proceso
+_fallback = {}
+
+
+def is_shared_cache(alias='default'):
+    """True si la caché `alias` es visible desde todos los procesos."""
+    return not isinstance(caches[alias], PROCESS_LOCAL_BACKENDS)
+
+
+def shared_cache():
+    """La mejor caché compartida disponible.
+
+    La caché por defecto si es compartida; si no, el Redis del broker de Celery
+    (`REDIS_URL`), que ven todos los workers. Si el broker no es Redis o no
+    responde se usa la caché del proceso y se registra una advertencia: todo
+    sigue funcionando, pero cada proceso ve solo sus propios datos.
+    """
+    if is_shared_cache():
+        return cache
+    if 'cache' not in _fallback:
+        _fallback['cache'] = _broker_cache()
+    return _fallback['cache']
+
+
+def _broker_cache():
+    url = getattr(settings, 'CELERY_BROKER_URL', '') or ''
+    if url.startswith(('redis://', 'rediss://')):
+        broker = RedisCache(url, {'KEY_PREFIX': settings.CACHES['default'].get('KEY_PREFIX', 'siese')})
+        try:
+            broker.get('core:shared-cache:ping')
+            return broker
+        except Exception as exc:
+            logger.warning('No se pudo usar el Redis del broker como caché compartida (%s).', exc)
+    logger.warning(
+        'Sin caché compartida (CACHE_URL) ni broker Redis: los límites por host y por IP, '
+        'y el filtro de spam entrenado, quedan por proceso.'
+    )
+    return cache
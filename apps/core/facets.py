@@ -0,0 +1,125 @@
+"""
+Índice de facetas para búsquedas con filtros y conteos
+
+Cada objeto indexado tiene una fila por valor de faceta (`FacetEntry`). Filtrar
+es intersecar los conjuntos de objetos de cada valor elegido y contar es un
+único GROUP BY sobre las filas del conjunto de resultados, sin importar cuántas
+facetas se muestren.
+"""
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Count
+
+from .models import FacetEntry
+
+
+class FacetIndex:
+    """Facetas de un tipo de documento.
+
+    `facets` asocia cada nombre de faceta a una función que recibe el objeto y
+    retorna una lista de pares `(valor, etiqueta)`; una lista vacía omite la faceta.
+    """
+
+    def __init__(self, kind, facets):
+        self.kind = kind
+        self.facets = facets
+
+    # ------------------------------------------------------------------ indexación
+
+    @staticmethod
+    def _model(apps=None):
+        return FacetEntry if apps is None else apps.get_model('core', 'FacetEntry')
+
+    def entries(self, instance, apps=None):
+        Entry = self._model(apps)
+        rows = []
+        for facet, extract in self.facets.items():
+            seen = set()
+            for value, label in extract(instance) or ():
+                value = str(value)[:200]
+                if not value or value in seen:
+                    continue
+                seen.add(value)
+                rows.append(Entry(
+                    kind=self.kind, object_id=instance.pk, facet=facet, value=value, label=str(label)[:200],
+                ))
+        return rows
+
+    def index(self, instance):
+        self.index_many([instance])
+
+    def index_many(self, instances, apps=None):
+        """Reemplaza las facetas de los objetos con dos consultas más la inserción en bloque."""
+        Entry = self._model(apps)
+        instances = list(instances)
+        if not instances:
+            return 0
+        with transaction.atomic():
+            Entry.objects.filter(kind=self.kind, object_id__in=[instance.pk for instance in instances]).delete()
+            Entry.objects.bulk_create(
+                [entry for instance in instances for entry in self.entries(instance, apps)],
+                batch_size=1000,
+            )
+        return len(instances)
+
+    def remove(self, object_id):
+        self.remove_many([object_id])
+
+    def remove_many(self, object_ids):
+        FacetEntry.objects.filter(kind=self.kind, object_id__in=list(object_ids)).delete()
+
+    def rebuild(self, instances, batch_size=500, apps=None):
+        """Reconstruye las facetas del tipo completo a partir de un iterable de objetos.
+
+        Desde una migración de datos se pasa `apps` para usar los modelos históricos.
+        """
+        Entry = self._model(apps)
+        with transaction.atomic():
+            Entry.objects.filter(kind=self.kind).delete()
+            count = 0
+            batch = []
+            for instance in instances:
+                batch.append(instance)
+                if len(batch) >= batch_size:
+                    count += self.index_many(batch, apps)
+                    batch = []
+            count += self.index_many(batch, apps)
+        return count
+
+    # ------------------------------------------------------------------ consulta
+
+    def filter(self, queryset, selected):
+        """Restringe `queryset` a los objetos que tienen todos los valores elegidos.
+
+        `selected` asocia facetas a un valor (o lista de valores alternativos).
+        """
+        for facet, values in selected.items():
+            if facet not in self.facets or not values:
+                continue
+            if isinstance(values, str):
+                values = [values]
+            matching = FacetEntry.objects.filter(
+                kind=self.kind, facet=facet, value__in=list(values),
+            ).values('object_id')
+            queryset = queryset.filter(pk__in=matching)
+        return queryset
+
+    def counts(self, object_ids):
+        """Conteos por faceta para un conjunto de resultados en una sola consulta.
+
+        `object_ids` puede ser una lista o un queryset de ids (se usa como subconsulta).
+        Retorna `{faceta: [{'value', 'label', 'count'}, ...]}` ordenado por conteo.
+        """
+        rows = (
+            FacetEntry.objects.filter(kind=self.kind, object_id__in=object_ids)
+            .values('facet', 'value', 'label')
+            .annotate(count=Count('id'))
+            .order_by()
+        )
+        result = defaultdict(list)
+        for row in rows:
+            result[row['facet']].append({'value': row['value'], 'label': row['label'], 'count': row['count']})
+        for values in result.values():
+            values.sort(key=lambda item: (-item['count'], item['label']))
+        return {facet: result.get(facet, []) for facet in self.facets}
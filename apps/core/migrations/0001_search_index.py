@@ -0,0 +1,45 @@
+# Generated by Django 5.0.6 on 2026-10-19 11:04
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(max_length=60, verbose_name='Tipo de documento indexado')),
+                ('object_id', models.PositiveBigIntegerField(verbose_name='ID del objeto')),
+                ('weighted_length', models.FloatField(default=0, verbose_name='Longitud ponderada')),
+                ('indexed_at', models.DateTimeField(auto_now=True, verbose_name='Indexado el')),
+            ],
+            options={
+                'verbose_name': 'Documento indexado',
+                'verbose_name_plural': 'Documentos indexados',
+                'unique_together': {('kind', 'object_id')},
+            },
+        ),
+        migrations.CreateModel(
+            name='SearchPosting',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=64, verbose_name='Término')),
+                ('weight', models.FloatField(default=0, verbose_name='Frecuencia ponderada')),
+                ('document', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='postings', to='core.searchdocument', verbose_name='Documento')),
+            ],
+            options={
+                'verbose_name': 'Entrada del índice',
+                'verbose_name_plural': 'Entradas del índice',
+                'indexes': [models.Index(fields=['term', 'document'], name='core_search_term_43f7a6_idx')],
+                'unique_together': {('document', 'term')},
+            },
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.0.6 on 2026-10-19 11:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FacetEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(max_length=60, verbose_name='Tipo de documento indexado')),
+                ('object_id', models.PositiveBigIntegerField(verbose_name='ID del objeto')),
+                ('facet', models.CharField(max_length=30, verbose_name='Faceta')),
+                ('value', models.CharField(max_length=200, verbose_name='Valor')),
+                ('label', models.CharField(blank=True, max_length=200, verbose_name='Etiqueta visible')),
+            ],
+            options={
+                'verbose_name': 'Valor de faceta',
+                'verbose_name_plural': 'Valores de facetas',
+                'indexes': [models.Index(fields=['kind', 'facet', 'value', 'object_id'], name='core_facete_kind_7b9552_idx')],
+                'unique_together': {('kind', 'object_id', 'facet', 'value')},
+            },
+        ),
+    ]
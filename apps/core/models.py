@@ -28,3 +28,53 @@ class BaseModel(models.Model):
 
     class Meta:
         abstract = True
+
+
+class SearchDocument(models.Model):
+    """Documento registrado en el índice invertido de búsqueda (ver apps.core.search)"""
+    kind = models.CharField(max_length=60, verbose_name='Tipo de documento indexado')
+    object_id = models.PositiveBigIntegerField(verbose_name='ID del objeto')
+    weighted_length = models.FloatField(default=0, verbose_name='Longitud ponderada')
+    indexed_at = models.DateTimeField(auto_now=True, verbose_name='Indexado el')
+
+    class Meta:
+        verbose_name = 'Documento indexado'
+        verbose_name_plural = 'Documentos indexados'
+        unique_together = ('kind', 'object_id')
+
+    def __str__(self):
+        return f"{self.kind} #{self.object_id}"
+
+
+class SearchPosting(models.Model):
+    """Aparición de un término normalizado en un documento, con su frecuencia ponderada por campo"""
+    document = models.ForeignKey(SearchDocument, on_delete=models.CASCADE, related_name='postings', verbose_name='Documento')
+    term = models.CharField(max_length=64, verbose_name='Término')
+    weight = models.FloatField(default=0, verbose_name='Frecuencia ponderada')
+
+    class Meta:
+        verbose_name = 'Entrada del índice'
+        verbose_name_plural = 'Entradas del índice'
+        unique_together = ('document', 'term')
+        indexes = [models.Index(fields=['term', 'document'])]
+
+    def __str__(self):
+        return f"{self.term} -> {self.document}"
+
+
+class FacetEntry(models.Model):
+    """Valor de faceta de un objeto (tipo, entidad, año, etiqueta...) para conteos agregados (ver apps.core.facets)"""
+    kind = models.CharField(max_length=60, verbose_name='Tipo de documento indexado')
+    object_id = models.PositiveBigIntegerField(verbose_name='ID del objeto')
+    facet = models.CharField(max_length=30, verbose_name='Faceta')
+    value = models.CharField(max_length=200, verbose_name='Valor')
+    label = models.CharField(max_length=200, blank=True, verbose_name='Etiqueta visible')
+
+    class Meta:
+        verbose_name = 'Valor de faceta'
+        verbose_name_plural = 'Valores de facetas'
+        unique_together = ('kind', 'object_id', 'facet', 'value')
+        indexes = [models.Index(fields=['kind', 'facet', 'value', 'object_id'])]
+
+    def __str__(self):
+        return f"{self.kind} #{self.object_id} {self.facet}={self.value}"
@@ -0,0 +1,130 @@
+"""
+Paginación por cursor (keyset) para listados de desplazamiento infinito
+
+En lugar de OFFSET y COUNT(*), cada página filtra las filas que vienen después
+de la última mostrada según el orden del listado, así que su costo es el mismo
+en la primera página que en la milésima. El cursor es opaco para el cliente:
+codifica los valores de orden de la última fila en base64.
+"""
+import base64
+import bisect
+import json
+from dataclasses import dataclass
+
+from django.db.models import Q
+
+
+class InvalidCursor(ValueError):
+    """El cursor recibido no se puede decodificar para este orden."""
+
+
+@dataclass
+class KeysetPage:
+    object_list: list
+    next_cursor: str | None
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+
+class KeysetPaginator:
+    """Pagina `queryset` según `ordering`, p. ej. `('-created_at', '-id')`.
+
+    El último campo debe ser único (normalmente el id) para que el orden sea
+    total, y ninguno de los campos puede ser nulo. Acepta también querysets de
+    `values()` agrupados, ordenados por sus anotaciones.
+    """
+
+    def __init__(self, queryset, ordering, per_page):
+        self.queryset = queryset
+        self.ordering = tuple(ordering)
+        self.per_page = per_page
+        self.fields = [name.lstrip('-') for name in self.ordering]
+
+    def page(self, cursor=None):
+        queryset = self.queryset.order_by(*self.ordering)
+        if cursor:
+            queryset = queryset.filter(self._after(self.decode(cursor)))
+        rows = list(queryset[:self.per_page + 1])
+        has_next = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        return KeysetPage(rows, self.encode(rows[-1]) if has_next else None)
+
+    def _after(self, values):
+        """Condición "fila posterior a `values`" expandida como (a > x) OR (a = x AND b > y) ..."""
+        condition = Q()
+        equal = Q()
+        for name, field, value in zip(self.ordering, self.fields, values):
+            lookup = 'lt' if name.startswith('-') else 'gt'
+            condition |= equal & Q(**{f'{field}__{lookup}': value})
+            equal &= Q(**{field: value})
+        return condition
+
+    def encode(self, instance):
+        values = []
+        for field in self.fields:
+            value = instance[field] if isinstance(instance, dict) else getattr(instance, field)
+            values.append(value.isoformat() if hasattr(value, 'isoformat') else value)
+        raw = json.dumps(values, separators=(',', ':')).encode('utf-8')
+        return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+    def decode(self, cursor):
+        try:
+            raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+            values = json.loads(raw)
+        except (ValueError, TypeError) as exc:
+            raise InvalidCursor('Cursor inválido.') from exc
+        if not isinstance(values, list) or len(values) != len(self.fields):
+            raise InvalidCursor('Cursor inválido.')
+
+        try:
+            return [self._field(field).to_python(value) for field, value in zip(self.fields, values)]
+        except Exception as exc:
+            raise InvalidCursor('Cursor inválido.') from exc
+
+    def _field(self, name):
+        """Campo del modelo o, para valores anotados (p. ej. agregados), su `output_field`"""
+        annotation = self.queryset.query.annotations.get(name)
+        if annotation is not None:
+            return annotation.output_field
+        return self.queryset.model._meta.get_field(name)
+
+
+def ranked_page(queryset, ranked, cursor=None, per_page=20):
+    """Página por cursor sobre resultados `[(object_id, score)]` de `SearchIndex.search`.
+
+    El cursor guarda el puntaje y el id del último resultado, así que la página
+    siguiente se ubica con una búsqueda binaria y solo se cargan sus objetos.
+    """
+    start = 0
+    if cursor:
+        try:
+            raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+            score, object_id = json.loads(raw)
+            key = (-float(score), int(object_id))
+        except (ValueError, TypeError) as exc:
+            raise InvalidCursor('Cursor inválido.') from exc
+        start = bisect.bisect_right(ranked, key, key=lambda item: (-item[1], item[0]))
+
+    window = ranked[start:start + per_page]
+    objects = queryset.in_bulk([object_id for object_id, _ in window])
+    page = []
+    for object_id, score in window:
+        obj = objects.get(object_id)
+        if obj is not None:
+            obj.relevance = score
+            page.append(obj)
+
+    next_cursor = None
+    if start + per_page < len(ranked):
+        object_id, score = window[-1]
+        raw = json.dumps([score, object_id], separators=(',', ':')).encode('utf-8')
+        next_cursor = base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+    return KeysetPage(page, next_cursor)
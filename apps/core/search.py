@@ -0,0 +1,292 @@
+"""
+Índice invertido de búsqueda con ranking BM25 y normalización para español
+
+Cada app registra un `SearchIndex` con su tipo de documento y el peso de cada
+campo. Los términos se normalizan (minúsculas, sin tildes, sin palabras vacías y
+con un stemming ligero de género y número), de modo que "Energías renovables"
+y "energia renovable" producen los mismos términos.
+"""
+import math
+import re
+import unicodedata
+from collections import Counter, defaultdict
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Avg, Count
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+from .models import SearchDocument, SearchPosting
+
+TOKEN_RE = re.compile(r'[a-z0-9ñ]+')
+WORD_RE = re.compile(r'\w+')
+
+SPANISH_STOPWORDS = frozenset("""
+a al algo algunas algunos ante antes como con contra cual cuando de del desde donde durante e el ella ellas
+ellos en entre era es esa esas ese eso esos esta estas este esto estos fue fueron ha han hasta hay la las le
+les lo los mas me mi mientras muy ni no nos o otra otras otro otros para pero poco por porque que quien se
+sea segun ser si sin sobre son su sus tambien tanto te tiene tienen todo todos tras tu un una unas uno unos
+y ya
+""".split())
+
+
+def fold_accents(text):
+    """Elimina tildes y diéresis conservando la ñ."""
+    text = text.replace('ñ', '\0').replace('Ñ', '\1')
+    decomposed = unicodedata.normalize('NFKD', text)
+    stripped = ''.join(char for char in decomposed if not unicodedata.combining(char))
+    return stripped.replace('\0', 'ñ').replace('\1', 'ñ')
+
+
+def stem(token):
+    """Stemming ligero para español: elimina número (plural) y vocal final de género."""
+    if len(token) > 4 and token.endswith('s'):
+        token = token[:-1]
+    if len(token) > 4 and token[-1] in 'aeo':
+        token = token[:-1]
+    return token
+
+
+def tokenize(text):
+    """Convierte texto libre en la lista de términos normalizados del índice."""
+    if not text:
+        return []
+    folded = fold_accents(str(text).lower())
+    return [
+        stem(token)[:64]
+        for token in TOKEN_RE.findall(folded)
+        if len(token) > 1 and token not in SPANISH_STOPWORDS
+    ]
+
+
+def highlight(text, query, length=240):
+    """Fragmento de `text` alrededor de las coincidencias con `query`, marcadas con <mark>.
+
+    Las palabras se comparan con la misma normalización del índice, así que
+    "energia" resalta "Energías". Retorna HTML seguro; sin coincidencias
+    retorna el inicio del texto.
+    """
+    text = str(text or '')
+    terms = set(tokenize(query))
+    matches = [
+        match for match in WORD_RE.finditer(text)
+        if terms and set(tokenize(match.group())) & terms
+    ]
+
+    # Ventana que contiene más coincidencias, empezando en una de ellas
+    start = 0
+    best = 0
+    last = 0
+    for first, match in enumerate(matches):
+        while last < len(matches) and matches[last].start() < match.start() + length:
+            last += 1
+        if last - first > best:
+            best, start = last - first, match.start()
+    if start:
+        start = max(0, start - length // 4)
+        while start > 0 and not text[start - 1].isspace():
+            start -= 1
+    end = min(len(text), start + length)
+    while end < len(text) and not text[end].isspace():
+        end += 1
+
+    parts = ['…' if start else '']
+    cursor = start
+    for match in matches:
+        if match.start() < start or match.end() > end:
+            continue
+        parts.append(escape(text[cursor:match.start()]))
+        parts.append(f'<mark>{escape(match.group())}</mark>')
+        cursor = match.end()
+    parts.append(escape(text[cursor:end]))
+    parts.append('…' if end < len(text) else '')
+    return mark_safe(' '.join(''.join(parts).split()))
+
+
+class SearchIndex:
+    """Índice BM25F simplificado sobre las tablas SearchDocument/SearchPosting.
+
+    La frecuencia de cada término se pondera por el peso del campo donde aparece
+    y la longitud del documento se pondera igual, así un término en el título
+    cuenta tanto como varias apariciones en el cuerpo.
+    """
+
+    k1 = 1.2
+    b = 0.75
+
+    def __init__(self, kind, fields):
+        self.kind = kind
+        self.fields = fields
+
+    @property
+    def _stats_key(self):
+        return f'core:search-stats:{self.kind}'
+
+    # ------------------------------------------------------------------ indexación
+
+    @staticmethod
+    def _models(apps=None):
+        if apps is None:
+            return SearchDocument, SearchPosting
+        return apps.get_model('core', 'SearchDocument'), apps.get_model('core', 'SearchPosting')
+
+    def analyze(self, values):
+        weights = Counter()
+        length = 0.0
+        for field, boost in self.fields.items():
+            terms = tokenize(values.get(field))
+            length += boost * len(terms)
+            for term in terms:
+                weights[term] += boost
+        return weights, length
+
+    def index(self, object_id, values):
+        """(Re)indexa un objeto a partir de un diccionario campo -> texto."""
+        weights, length = self.analyze(values)
+        with transaction.atomic():
+            document, _ = SearchDocument.objects.update_or_create(
+                kind=self.kind, object_id=object_id, defaults={'weighted_length': length},
+            )
+            document.postings.all().delete()
+            SearchPosting.objects.bulk_create(
+                [SearchPosting(document=document, term=term, weight=weight) for term, weight in weights.items()],
+                batch_size=1000,
+            )
+        cache.delete(self._stats_key)
+
+    def index_many(self, items, apps=None):
+        """Indexa en bloque pares (object_id, valores) con un número fijo de consultas."""
+        Document, Posting = self._models(apps)
+        analyzed = {object_id: self.analyze(values) for object_id, values in items}
+        if not analyzed:
+            return 0
+        with transaction.atomic():
+            Document.objects.filter(kind=self.kind, object_id__in=analyzed).delete()
+            Document.objects.bulk_create(
+                [Document(kind=self.kind, object_id=object_id, weighted_length=length)
+                 for object_id, (_, length) in analyzed.items()],
+                batch_size=500,
+            )
+            # Recuperar los ids: no todos los motores los retornan desde bulk_create
+            document_ids = dict(
+                Document.objects.filter(kind=self.kind, object_id__in=analyzed).values_list('object_id', 'id')
+            )
+            Posting.objects.bulk_create(
+                [Posting(document_id=document_ids[object_id], term=term, weight=weight)
+                 for object_id, (weights, _) in analyzed.items()
+                 for term, weight in weights.items()],
+                batch_size=1000,
+            )
+        cache.delete(self._stats_key)
+        return len(analyzed)
+
+    def remove(self, object_id):
+        SearchDocument.objects.filter(kind=self.kind, object_id=object_id).delete()
+        cache.delete(self._stats_key)
+
+    def remove_many(self, object_ids):
+        SearchDocument.objects.filter(kind=self.kind, object_id__in=list(object_ids)).delete()
+        cache.delete(self._stats_key)
+
+    def rebuild(self, items, apps=None):
+        """Reconstruye el índice completo a partir de pares (object_id, valores).
+
+        Desde una migración de datos se pasa `apps` para usar los modelos históricos.
+        """
+        Document, _ = self._models(apps)
+        with transaction.atomic():
+            Document.objects.filter(kind=self.kind).delete()
+            count = 0
+            batch = []
+            for item in items:
+                batch.append(item)
+                if len(batch) >= 500:
+                    count += self.index_many(batch, apps)
+                    batch = []
+            count += self.index_many(batch, apps)
+        cache.delete(self._stats_key)
+        return count
+
+    # ------------------------------------------------------------------ consulta
+
+    def stats(self):
+        stats = cache.get(self._stats_key)
+        if stats is None:
+            stats = SearchDocument.objects.filter(kind=self.kind).aggregate(
+                total=Count('id'), avg_length=Avg('weighted_length'),
+            )
+            stats['avg_length'] = stats['avg_length'] or 1.0
+            cache.set(self._stats_key, stats, 60 * 60)
+        return stats
+
+    def search(self, query, object_ids=None):
+        """Retorna `[(object_id, score)]` ordenado por relevancia descendente.
+
+        Cada término de la consulta debe aparecer en el documento (semántica AND,
+        como el filtro original). `object_ids` restringe el resultado a un
+        subconjunto ya filtrado.
+        """
+        terms = set(tokenize(query))
+        if not terms:
+            return []
+
+        postings = SearchPosting.objects.filter(term__in=terms, document__kind=self.kind)
+        if object_ids is not None:
+            postings = postings.filter(document__object_id__in=object_ids)
+        rows = list(postings.values_list('term', 'document__object_id', 'weight', 'document__weighted_length'))
+
+        stats = self.stats()
+        total = max(stats['total'], 1)
+        avg_length = stats['avg_length']
+        if object_ids is None:
+            doc_freq = Counter(term for term, *_ in rows)
+        else:
+            # El IDF se calcula sobre todo el índice, no sobre el subconjunto filtrado
+            doc_freq = dict(
+                SearchPosting.objects.filter(term__in=terms, document__kind=self.kind)
+                .values_list('term').annotate(df=Count('id')).order_by()
+            )
+
+        scores = defaultdict(float)
+        matched = defaultdict(int)
+        for term, object_id, weight, length in rows:
+            df = doc_freq[term]
+            idf = math.log(1 + (total - df + 0.5) / (df + 0.5))
+            norm = self.k1 * (1 - self.b + self.b * length / avg_length)
+            scores[object_id] += idf * weight * (self.k1 + 1) / (weight + norm)
+            matched[object_id] += 1
+
+        ranked = [(object_id, score) for object_id, score in scores.items() if matched[object_id] == len(terms)]
+        ranked.sort(key=lambda item: (-item[1], item[0]))
+        return ranked
+
+
+class RankedResults:
+    """Secuencia perezosa de resultados ordenados por relevancia para `Paginator`.
+
+    Solo carga desde la base de datos los objetos de la página solicitada.
+    """
+
+    def __init__(self, queryset, ranked):
+        self.queryset = queryset
+        self.ranked = ranked
+
+    def count(self):
+        return len(self.ranked)
+
+    def __len__(self):
+        return len(self.ranked)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            window = self.ranked[key]
+            objects = self.queryset.in_bulk([object_id for object_id, _ in window])
+            page = []
+            for object_id, score in window:
+                obj = objects.get(object_id)
+                if obj is not None:
+                    obj.relevance = score
+                    page.append(obj)
+            return page
+        return self[key:key + 1][0]
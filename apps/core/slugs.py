@@ -0,0 +1,72 @@
+"""
+Asignación de slugs únicos
+
+El siguiente sufijo libre ("titulo", "titulo-2", "titulo-3"...) se calcula con
+una sola consulta que retorna el sufijo más alto ya usado, sin importar cuántas
+publicaciones compartan el título. Si otra petición toma el mismo slug entre la
+consulta y el INSERT, el guardado falla por la restricción única y se reintenta
+con el siguiente sufijo.
+"""
+from django.db import IntegrityError, models, transaction
+from django.db.models import Case, F, IntegerField, Max, Q, Value, When
+from django.db.models.functions import Cast, Substr
+from django.utils.text import slugify
+
+SUFFIX_ROOM = 8
+
+
+def unique_slug(model, text, field='slug', default='item', exclude_pk=None):
+    """Primer slug libre para `text` en `model.<field>`, con una consulta."""
+    max_length = model._meta.get_field(field).max_length
+    base = slugify(text)[:max_length - SUFFIX_ROOM].strip('-') or default
+
+    # El slug base cuenta como sufijo 1; los demás son base-2, base-3...
+    suffix = Case(
+        When(**{field: base}, then=Value(1)),
+        default=Cast(Substr(F(field), len(base) + 2), IntegerField()),
+        output_field=IntegerField(),
+    )
+    # El prefijo permite recorrer el índice único por rango; la expresión regular solo
+    # descarta, dentro de ese rango, los slugs de otro título ("base-solar")
+    suffixed = Q(**{f'{field}__startswith': f'{base}-', f'{field}__regex': rf'^{base}-[0-9]{{1,7}}$'})
+    taken = model._default_manager.filter(Q(**{field: base}) | suffixed)
+    if exclude_pk is not None:
+        taken = taken.exclude(pk=exclude_pk)
+    highest = taken.aggregate(highest=Max(suffix))['highest']
+    return base if highest is None else f'{base}-{highest + 1}'
+
+
+def save_with_unique_slug(instance, text, field='slug', default='item', attempts=5, save=None):
+    """Asigna un slug libre y guarda `instance`, reintentando si otro proceso lo tomó primero.
+
+    `save` permite usar otro método de guardado (por defecto `instance.save`).
+    """
+    model = type(instance)
+    save = save or instance.save
+    for attempt in range(attempts):
+        setattr(instance, field, unique_slug(model, text, field, default, exclude_pk=instance.pk))
+        try:
+            with transaction.atomic():
+                return save()
+        except IntegrityError:
+            taken = model._default_manager.filter(**{field: getattr(instance, field)}).exclude(pk=instance.pk)
+            if attempt == attempts - 1 or not taken.exists():
+                raise
+
+
+class UniqueSlugMixin(models.Model):
+    """Genera el slug desde `slug_source` al guardar si quedó vacío."""
+
+    slug_source = 'title'
+    slug_default = 'item'
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        if self.slug:
+            return super().save(*args, **kwargs)
+        return save_with_unique_slug(
+            self, getattr(self, self.slug_source), default=self.slug_default,
+            save=lambda: super(UniqueSlugMixin, self).save(*args, **kwargs),
+        )
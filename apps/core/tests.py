@@ -1,3 +1,111 @@
-from django.test import TestCase
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from . import cache as core_cache
+from .models import SearchDocument
+from .pagination import InvalidCursor, KeysetPaginator, ranked_page
+from .search import SearchIndex
+
+
+class SearchIndexTests(TestCase):
+    def setUp(self):
+        self.index = SearchIndex('core.test', {'title': 1})
+        self.index.index_many([
+            (1, {'title': 'energía solar'}),
+            (2, {'title': 'energía eólica'}),
+            (3, {'title': 'eficiencia energética'}),
+            (4, {'title': 'movilidad eléctrica'}),
+        ])
+
+    def test_filtered_search_keeps_global_document_frequency(self):
+        scores = dict(self.index.search('energia'))
+        filtered = dict(self.index.search('energia', object_ids=[1]))
+        self.assertEqual(list(filtered), [1])
+        self.assertAlmostEqual(filtered[1], scores[1])
+
+    def test_all_terms_must_match(self):
+        self.assertEqual([object_id for object_id, _ in self.index.search('energia solar')], [1])
+
+
+class SharedCacheTests(SimpleTestCase):
+    def test_shared_default_cache_is_used(self):
+        with mock.patch.object(core_cache, 'is_shared_cache', return_value=True):
+            self.assertIs(core_cache.shared_cache(), cache)
+
+    @override_settings(CELERY_BROKER_URL='amqp://localhost//')
+    def test_without_shared_cache_or_redis_broker_falls_back_with_a_warning(self):
+        with mock.patch.dict(core_cache._fallback, clear=True), self.assertLogs('apps.core.cache', 'WARNING'):
+            self.assertIs(core_cache.shared_cache(), cache)
+
+
+class KeysetPaginatorTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        # Longitudes repetidas: el id desempata en el límite entre páginas
+        for object_id, length in enumerate([3, 1, 2, 2, 2, 1, 3], start=1):
+            SearchDocument.objects.create(kind='core.test', object_id=object_id, weighted_length=length)
+        cls.queryset = SearchDocument.objects.filter(kind='core.test')
+
+    def collect(self, paginator):
+        pages = []
+        cursor = None
+        while True:
+            page = paginator.page(cursor)
+            pages.append([document.object_id for document in page])
+            if not page.has_next:
+                return pages
+            cursor = page.next_cursor
+
+    def test_pages_follow_the_ordering_without_gaps_or_repeats(self):
+        pages = self.collect(KeysetPaginator(self.queryset, ('-weighted_length', 'id'), 2))
+        self.assertEqual(pages, [[1, 7], [3, 4], [5, 2], [6]])
+
+    def test_exact_multiple_of_page_size_has_no_empty_last_page(self):
+        pages = self.collect(KeysetPaginator(self.queryset.exclude(object_id=7), ('weighted_length', 'id'), 3))
+        self.assertEqual(pages, [[2, 6, 3], [4, 5, 1]])
+
+    def test_cursor_round_trip_with_dates(self):
+        paginator = KeysetPaginator(self.queryset, ('-indexed_at', '-id'), 2)
+        document = self.queryset.first()
+        self.assertEqual(paginator.decode(paginator.encode(document)), [document.indexed_at, document.id])
+
+    def test_invalid_cursors(self):
+        paginator = KeysetPaginator(self.queryset, ('-weighted_length', 'id'), 2)
+        other = KeysetPaginator(self.queryset, ('-indexed_at', 'weighted_length', 'id'), 2)
+        for cursor in ('no es base64!', paginator.encode({'weighted_length': 'alto', 'id': 1}), other.encode(self.queryset.first())):
+            with self.subTest(cursor=cursor), self.assertRaises(InvalidCursor):
+                paginator.page(cursor)
+
+
+class RankedPageTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for object_id in range(1, 6):
+            SearchDocument.objects.create(kind='core.test', object_id=object_id)
+        documents = SearchDocument.objects.filter(kind='core.test')
+        ids = {document.object_id: document.pk for document in documents}
+        cls.queryset = documents
+        cls.ranked = [(ids[1], 3.0), (ids[4], 2.0), (ids[2], 2.0), (ids[5], 2.0), (ids[3], 1.0)]
+        cls.ranked.sort(key=lambda item: (-item[1], item[0]))
+
+    def test_pages_cover_the_ranking_in_order(self):
+        seen = []
+        cursor = None
+        while True:
+            page = ranked_page(self.queryset, self.ranked, cursor, per_page=2)
+            seen.extend((document.pk, document.relevance) for document in page)
+            if not page.has_next:
+                break
+            cursor = page.next_cursor
+        self.assertEqual(seen, self.ranked)
+
+    def test_last_full_page_has_no_cursor(self):
+        self.assertFalse(ranked_page(self.queryset, self.ranked[:4], per_page=4).has_next)
+        self.assertTrue(ranked_page(self.queryset, self.ranked, per_page=4).has_next)
+
+    def test_invalid_cursors(self):
+        for cursor in ('no es base64!', 'WzFd', 'WyJhbHRvIiwxXQ'):
+            with self.subTest(cursor=cursor), self.assertRaises(InvalidCursor):
+                ranked_page(self.queryset, self.ranked, cursor)
@@ -0,0 +1,77 @@
+from django.db import models
+
+from apps.core.models import BaseModel
+
+from .course_models import Course, Module
+
+QUESTION_KINDS = [
+    ('module', 'Cuestionario de módulo'),
+    ('final', 'Examen final'),
+]
+
+
+class QuestionStatistic(BaseModel):
+    """Análisis de ítem precalculado para una pregunta (tabla resumen nocturna)"""
+    kind = models.CharField(max_length=10, choices=QUESTION_KINDS, verbose_name='Tipo de pregunta')
+    question_id = models.PositiveBigIntegerField(verbose_name='ID de la pregunta')
+    course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name='question_statistics', verbose_name='Curso')
+    module = models.ForeignKey(Module, on_delete=models.CASCADE, null=True, blank=True, related_name='question_statistics', verbose_name='Módulo')
+    answers_count = models.PositiveIntegerField(default=0, verbose_name='Respuestas')
+    correct_count = models.PositiveIntegerField(default=0, verbose_name='Respuestas correctas')
+    difficulty = models.FloatField(default=0, verbose_name='Índice de dificultad', help_text='Proporción de respuestas correctas (0-1)')
+    discrimination = models.FloatField(null=True, blank=True, verbose_name='Índice de discriminación', help_text='Correlación punto-biserial entre acierto y puntaje del intento')
+    computed_at = models.DateTimeField(verbose_name='Calculado el')
+
+    class Meta:
+        verbose_name = 'Estadística de pregunta'
+        verbose_name_plural = 'Estadísticas de preguntas'
+        unique_together = ('kind', 'question_id')
+        indexes = [models.Index(fields=['course', 'kind'])]
+
+    def __str__(self):
+        return f"{self.get_kind_display()} #{self.question_id} - dificultad {self.difficulty:.2f}"
+
+
+class OptionStatistic(BaseModel):
+    """Tasa de selección de cada opción (análisis de distractores)"""
+    kind = models.CharField(max_length=10, choices=QUESTION_KINDS, verbose_name='Tipo de pregunta')
+    option_id = models.PositiveBigIntegerField(verbose_name='ID de la opción')
+    question_id = models.PositiveBigIntegerField(verbose_name='ID de la pregunta')
+    course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name='option_statistics', verbose_name='Curso')
+    is_correct = models.BooleanField(default=False, verbose_name='Correcta')
+    selected_count = models.PositiveIntegerField(default=0, verbose_name='Veces seleccionada')
+    selection_rate = models.FloatField(default=0, verbose_name='Tasa de selección', help_text='Selecciones / respuestas a la pregunta (0-1)')
+    computed_at = models.DateTimeField(verbose_name='Calculado el')
+
+    class Meta:
+        verbose_name = 'Estadística de opción'
+        verbose_name_plural = 'Estadísticas de opciones'
+        unique_together = ('kind', 'option_id')
+        indexes = [models.Index(fields=['kind', 'question_id'])]
+
+    def __str__(self):
+        return f"Opción #{self.option_id} - {self.selection_rate:.0%}"
+
+
+class DailyPassRate(BaseModel):
+    """Tasa de aprobación diaria por módulo (o del examen final si module es nulo)"""
+    course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name='daily_pass_rates', verbose_name='Curso')
+    module = models.ForeignKey(Module, on_delete=models.CASCADE, null=True, blank=True, related_name='daily_pass_rates', verbose_name='Módulo')
+    day = models.DateField(verbose_name='Día')
+    attempts_count = models.PositiveIntegerField(default=0, verbose_name='Intentos finalizados')
+    passed_count = models.PositiveIntegerField(default=0, verbose_name='Intentos aprobados')
+    average_score = models.FloatField(default=0, verbose_name='Puntaje promedio')
+
+    class Meta:
+        verbose_name = 'Tasa de aprobación diaria'
+        verbose_name_plural = 'Tasas de aprobación diarias'
+        ordering = ['course', 'module', 'day']
+        unique_together = ('course', 'module', 'day')
+
+    def __str__(self):
+        target = self.module.title if self.module_id else 'Examen final'
+        return f"{target} {self.day:%d/%m/%Y} - {self.pass_rate:.0%}"
+
+    @property
+    def pass_rate(self):
+        return self.passed_count / self.attempts_count if self.attempts_count else 0
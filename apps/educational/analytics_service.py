@@ -0,0 +1,219 @@
+"""
+Agregación nocturna de analítica de cursos (análisis de ítems y tasas de aprobación)
+"""
+import logging
+import math
+from collections import defaultdict
+
+from django.db import transaction
+from django.utils import timezone
+
+from apps.educational.analytics_models import DailyPassRate, OptionStatistic, QuestionStatistic
+from apps.educational.course_models import (
+    FinalExamAnswer, FinalExamAttempt, FinalExamOption, FinalExamQuestion,
+    Module, ModuleAnswer, ModuleAttempt, ModuleQuizOption, ModuleQuizQuestion,
+)
+
+logger = logging.getLogger(__name__)
+
+FINISHED_STATES = ('passed', 'failed')
+
+
+def scan_in_chunks(queryset, fields, chunk_size=5000):
+    """Recorre una tabla por rangos de llave primaria y produce tuplas de `fields`.
+
+    Cada consulta es `WHERE id > ultimo ORDER BY id LIMIT n`, que usa el índice
+    primario y no mantiene un cursor abierto sobre la tabla viva. Con MariaDB
+    el driver no transmite resultados en streaming, así que `iterator()` no
+    sería suficiente para acotar memoria.
+    """
+    last_pk = 0
+    while True:
+        rows = list(
+            queryset.filter(pk__gt=last_pk).order_by('pk').values_list('pk', *fields)[:chunk_size]
+        )
+        if not rows:
+            return
+        for row in rows:
+            yield row[1:]
+        last_pk = rows[-1][0]
+
+
+class _ItemAccumulator:
+    """Estadísticos suficientes para dificultad y correlación punto-biserial.
+
+    Se acumulan sumas (n, Σx, Σy, Σxy, Σy²) en una sola pasada; como x es
+    binario, Σx² = Σx.
+    """
+
+    __slots__ = ('n', 'sum_x', 'sum_y', 'sum_xy', 'sum_yy')
+
+    def __init__(self):
+        self.n = self.sum_x = self.sum_y = self.sum_xy = self.sum_yy = 0
+
+    def add(self, correct, score):
+        x = 1 if correct else 0
+        self.n += 1
+        self.sum_x += x
+        self.sum_y += score
+        self.sum_xy += x * score
+        self.sum_yy += score * score
+
+    @property
+    def difficulty(self):
+        return self.sum_x / self.n if self.n else 0
+
+    @property
+    def discrimination(self):
+        var_x = self.n * self.sum_x - self.sum_x ** 2
+        var_y = self.n * self.sum_yy - self.sum_y ** 2
+        if var_x <= 0 or var_y <= 0:
+            return None
+        return (self.n * self.sum_xy - self.sum_x * self.sum_y) / math.sqrt(var_x * var_y)
+
+
+class CourseAnalyticsService:
+    """Recalcula las tablas resumen que leen los tableros de editores."""
+
+    def __init__(self, chunk_size=5000):
+        self.chunk_size = chunk_size
+
+    def rebuild(self):
+        now = timezone.now()
+        question_stats, option_stats = [], []
+
+        for kind, config in self._sources().items():
+            questions = {
+                pk: (course_id, module_id)
+                for pk, course_id, module_id in config['questions']
+            }
+            options = {
+                pk: (question_id, is_correct)
+                for pk, question_id, is_correct in config['options']
+            }
+
+            items = defaultdict(_ItemAccumulator)
+            for question_id, correct, score in scan_in_chunks(
+                config['answers'], ('question_id', 'is_correct', 'attempt__score'), self.chunk_size
+            ):
+                items[question_id].add(correct, score)
+
+            selections = defaultdict(int)
+            for (option_id,) in scan_in_chunks(config['selections'], (config['option_field'],), self.chunk_size):
+                selections[option_id] += 1
+
+            for question_id, acc in items.items():
+                if question_id not in questions:
+                    continue
+                course_id, module_id = questions[question_id]
+                question_stats.append(QuestionStatistic(
+                    kind=kind, question_id=question_id, course_id=course_id, module_id=module_id,
+                    answers_count=acc.n, correct_count=acc.sum_x,
+                    difficulty=acc.difficulty, discrimination=acc.discrimination, computed_at=now,
+                ))
+
+            for option_id, (question_id, is_correct) in options.items():
+                if question_id not in questions:
+                    continue
+                answered = items[question_id].n if question_id in items else 0
+                selected = selections.get(option_id, 0)
+                option_stats.append(OptionStatistic(
+                    kind=kind, option_id=option_id, question_id=question_id,
+                    course_id=questions[question_id][0], is_correct=is_correct,
+                    selected_count=selected, selection_rate=selected / answered if answered else 0,
+                    computed_at=now,
+                ))
+
+        pass_rates = self._daily_pass_rates()
+
+        with transaction.atomic():
+            QuestionStatistic.objects.all().delete()
+            OptionStatistic.objects.all().delete()
+            DailyPassRate.objects.all().delete()
+            QuestionStatistic.objects.bulk_create(question_stats, batch_size=1000)
+            OptionStatistic.objects.bulk_create(option_stats, batch_size=1000)
+            DailyPassRate.objects.bulk_create(pass_rates, batch_size=1000)
+
+        summary = {
+            'questions': len(question_stats),
+            'options': len(option_stats),
+            'pass_rate_days': len(pass_rates),
+        }
+        logger.info('Analítica de cursos recalculada: %s', summary)
+        return summary
+
+    def _sources(self):
+        module_through = ModuleAnswer.selected_options.through
+        final_through = FinalExamAnswer.selected_options.through
+        return {
+            'module': {
+                'questions': ModuleQuizQuestion.objects.values_list('pk', 'module__course_id', 'module_id'),
+                'options': ModuleQuizOption.objects.values_list('pk', 'question_id', 'is_correct'),
+                'answers': ModuleAnswer.objects.filter(attempt__state__in=FINISHED_STATES),
+                'selections': module_through.objects.filter(moduleanswer__attempt__state__in=FINISHED_STATES),
+                'option_field': 'modulequizoption_id',
+            },
+            'final': {
+                'questions': (
+                    (pk, course_id, None)
+                    for pk, course_id in FinalExamQuestion.objects.values_list('pk', 'course_id')
+                ),
+                'options': FinalExamOption.objects.values_list('pk', 'question_id', 'is_correct'),
+                'answers': FinalExamAnswer.objects.filter(attempt__state__in=FINISHED_STATES),
+                'selections': final_through.objects.filter(finalexamanswer__attempt__state__in=FINISHED_STATES),
+                'option_field': 'finalexamoption_id',
+            },
+        }
+
+    def _daily_pass_rates(self):
+        buckets = defaultdict(lambda: [0, 0, 0])  # intentos, aprobados, suma de puntajes
+
+        module_courses = dict(Module.objects.values_list('pk', 'course_id'))
+        module_attempts = ModuleAttempt.objects.filter(state__in=FINISHED_STATES, finished_at__isnull=False)
+        for module_id, finished_at, passed, score in scan_in_chunks(
+            module_attempts, ('module_id', 'finished_at', 'passed', 'score'), self.chunk_size
+        ):
+            bucket = buckets[(module_courses.get(module_id), module_id, timezone.localdate(finished_at))]
+            bucket[0] += 1
+            bucket[1] += 1 if passed else 0
+            bucket[2] += score
+
+        final_attempts = FinalExamAttempt.objects.filter(state__in=FINISHED_STATES, finished_at__isnull=False)
+        for course_id, finished_at, passed, score in scan_in_chunks(
+            final_attempts, ('course_id', 'finished_at', 'passed', 'score'), self.chunk_size
+        ):
+            bucket = buckets[(course_id, None, timezone.localdate(finished_at))]
+            bucket[0] += 1
+            bucket[1] += 1 if passed else 0
+            bucket[2] += score
+
+        return [
+            DailyPassRate(
+                course_id=course_id, module_id=module_id, day=day,
+                attempts_count=attempts, passed_count=passed, average_score=total / attempts,
+            )
+            for (course_id, module_id, day), (attempts, passed, total) in buckets.items()
+            if course_id is not None
+        ]
+
+    def course_report(self, course):
+        """Lectura para tableros: solo consulta las tablas resumen."""
+        questions = list(
+            QuestionStatistic.objects.filter(course=course)
+            .order_by('kind', 'module_id', 'question_id')
+            .values('kind', 'question_id', 'module_id', 'answers_count', 'difficulty', 'discrimination', 'computed_at')
+        )
+        options = defaultdict(list)
+        for row in OptionStatistic.objects.filter(course=course).values(
+            'kind', 'question_id', 'option_id', 'is_correct', 'selected_count', 'selection_rate'
+        ):
+            options[(row['kind'], row['question_id'])].append(row)
+        for question in questions:
+            question['options'] = options.get((question['kind'], question['question_id']), [])
+
+        pass_rates = list(
+            DailyPassRate.objects.filter(course=course)
+            .order_by('module_id', 'day')
+            .values('module_id', 'day', 'attempts_count', 'passed_count', 'average_score')
+        )
+        return {'questions': questions, 'pass_rates': pass_rates}
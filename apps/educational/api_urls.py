@@ -1,6 +1,9 @@
 from django.urls import path
 
+from . import views
+
 # API URLs for educational app
 urlpatterns = [
-    # API endpoints will be added here
+    path('courses/<slug:slug>/analytics/', views.CourseAnalyticsAPIView.as_view(), name='course_analytics_api'),
+    path('certificates/<str:code>/verify/', views.CertificateVerifyAPIView.as_view(), name='certificate_verify_api'),
 ]
@@ -5,3 +5,6 @@ class EducationalConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.educational'
     verbose_name = 'Recursos Educativos'
+
+    def ready(self):
+        import apps.educational.signals
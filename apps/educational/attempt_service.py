@@ -0,0 +1,141 @@
+from typing import Dict, List
+
+from django.db import transaction
+from django.db.models import Max
+
+from apps.educational.course_models import (
+    Course, CourseEnrollment, FinalExamAttempt, Module, ModuleAttempt,
+)
+from .services import FinalExamService, QuizEvaluationService
+
+
+class AttemptLimitReached(ValueError):
+    """Se alcanzó el máximo de intentos permitidos para el examen."""
+
+
+class NotEnrolled(ValueError):
+    """El usuario no está inscrito en el curso del intento."""
+
+
+class AttemptService:
+    """Ciclo de vida de intentos de cuestionario y examen final.
+
+    Toda asignación de número de intento y todo envío ocurre con la fila de la
+    inscripción (usuario, curso) bloqueada con `select_for_update`, de modo que
+    dos pestañas o un doble clic del mismo usuario se serializan en lugar de
+    chocar contra el `unique_together` de los intentos. Los demás usuarios no
+    comparten ese bloqueo.
+
+    Es la única vía para crear intentos: el límite de intentos se valida aquí,
+    antes de crearlos, y no al calificar.
+    """
+
+    # ------------------------------------------------------------------ inicio
+
+    def start_module_attempt(self, user, module: Module) -> ModuleAttempt:
+        """Retorna el intento en progreso del módulo o asigna uno nuevo."""
+        with transaction.atomic():
+            self._lock_enrollment(user, module.course_id)
+            attempts = ModuleAttempt.objects.filter(user=user, module=module)
+            current = attempts.filter(state='in_progress').order_by('-attempt_number').first()
+            if current:
+                return current
+            return ModuleAttempt.objects.create(
+                user=user,
+                module=module,
+                attempt_number=self._next_number(attempts),
+            )
+
+    def start_final_attempt(self, user, course: Course) -> FinalExamAttempt:
+        """Retorna el intento en progreso del examen final o asigna uno nuevo.
+
+        El límite `max_final_attempts` se valida antes de crear el intento.
+        """
+        with transaction.atomic():
+            self._lock_enrollment(user, course.pk)
+            attempts = FinalExamAttempt.objects.filter(user=user, course=course)
+            current = attempts.filter(state='in_progress').order_by('-attempt_number').first()
+            if current:
+                return current
+            if course.max_final_attempts and attempts.count() >= course.max_final_attempts:
+                raise AttemptLimitReached('Se alcanzó el número máximo de intentos del examen final.')
+            return FinalExamAttempt.objects.create(
+                user=user,
+                course=course,
+                attempt_number=self._next_number(attempts),
+            )
+
+    # ------------------------------------------------------------------ envío
+
+    def submit_module_attempt(self, attempt_id: int, user, answers_payload: Dict[int, List[int]]):
+        """Califica el intento una sola vez; los reenvíos retornan el resultado guardado."""
+        with transaction.atomic():
+            attempt = (
+                ModuleAttempt.objects.select_for_update()
+                .select_related('module__course')
+                .get(pk=attempt_id, user=user)
+            )
+            if attempt.state != 'in_progress':
+                return self._module_result(attempt)
+            result = QuizEvaluationService().evaluate_attempt(attempt, answers_payload)
+            return {**result, 'already_submitted': False}
+
+    def submit_final_attempt(self, attempt_id: int, user, answers_payload: Dict[int, List[int]]):
+        """Califica el examen final una sola vez; los reenvíos retornan el resultado guardado."""
+        with transaction.atomic():
+            attempt = (
+                FinalExamAttempt.objects.select_for_update()
+                .select_related('course')
+                .get(pk=attempt_id, user=user)
+            )
+            if attempt.state != 'in_progress':
+                return self._final_result(attempt)
+            result = FinalExamService().evaluate_final_exam(attempt, answers_payload)
+            return {**result, 'already_submitted': False}
+
+    # ------------------------------------------------------------------ auxiliares
+
+    @staticmethod
+    def _lock_enrollment(user, course_id):
+        """Bloquea la inscripción existente; iniciar un intento no inscribe al usuario."""
+        try:
+            return CourseEnrollment.objects.select_for_update().get(user=user, course_id=course_id)
+        except CourseEnrollment.DoesNotExist:
+            raise NotEnrolled('El usuario no está inscrito en este curso.') from None
+
+    @staticmethod
+    def _next_number(attempts):
+        return (attempts.aggregate(last=Max('attempt_number'))['last'] or 0) + 1
+
+    @staticmethod
+    def _module_result(attempt: ModuleAttempt):
+        details = [
+            {
+                'question_id': answer.question_id,
+                'is_correct': answer.is_correct,
+                'selected': [option.pk for option in answer.selected_options.all()],
+            }
+            for answer in attempt.answers.prefetch_related('selected_options')
+        ]
+        return {'score': attempt.score, 'passed': attempt.passed, 'details': details, 'already_submitted': True}
+
+    @staticmethod
+    def _final_result(attempt: FinalExamAttempt):
+        course = attempt.course
+        certificate = course.certificates.filter(user_id=attempt.user_id).first() if attempt.passed else None
+        return {
+            'score': attempt.score,
+            'passed': attempt.passed,
+            'required': course.final_pass_score,
+            'course_slug': course.slug,
+            'details': [
+                {
+                    'question_id': answer.question_id,
+                    'is_correct': answer.is_correct,
+                    'selected': [option.pk for option in answer.selected_options.all()],
+                }
+                for answer in attempt.answers.prefetch_related('selected_options')
+            ],
+            'certificate_code': certificate.certificate_code if certificate else None,
+            'already_submitted': True,
+        }
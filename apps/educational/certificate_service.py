@@ -1,30 +1,97 @@
+import logging
+
 from django.core.files.base import ContentFile
-from django.template.loader import render_to_string
-from weasyprint import HTML
-from io import BytesIO
+from django.template.loader import get_template, render_to_string
 
 from .course_models import CourseCertificate
 
+logger = logging.getLogger(__name__)
+
+
+class _WarmRenderer:
+    """Renderizador WeasyPrint reutilizable dentro de un mismo proceso.
+
+    La configuración de fuentes y la hoja de estilos del certificado se compilan
+    una sola vez; cada worker de Celery paga ese costo al primer render y luego
+    solo convierte el HTML de cada certificado.
+    """
+
+    css_template = 'educational/certificate_pdf.css'
+
+    def __init__(self):
+        self._font_config = None
+        self._stylesheet = None
+
+    def _warm_up(self):
+        from weasyprint import CSS
+        from weasyprint.text.fonts import FontConfiguration
+
+        font_config = FontConfiguration()
+        css_source = get_template(self.css_template).template.source
+        self._stylesheet = CSS(string=css_source, font_config=font_config)
+        self._font_config = font_config
+
+    def write_pdf(self, html_content: str) -> bytes:
+        from weasyprint import HTML
+
+        if self._stylesheet is None:
+            self._warm_up()
+        return HTML(string=html_content).write_pdf(
+            stylesheets=[self._stylesheet],
+            font_config=self._font_config,
+        )
+
+
+_renderer = _WarmRenderer()
+
+
 class CertificatePDFService:
     """Servicio para generar PDF de certificados de curso usando HTML.
-    
+
     Genera un PDF renderizando el template HTML del certificado con WeasyPrint.
+    Se ejecuta normalmente desde las tareas Celery de `apps.educational.tasks`.
     """
 
     def generate_pdf(self, certificate: CourseCertificate, regenerate: bool = False) -> CourseCertificate:
         if certificate.pdf_file and not regenerate:
+            if certificate.pdf_status != 'ready':
+                certificate.pdf_status = 'ready'
+                certificate.save(update_fields=['pdf_status'])
             return certificate  # Ya existe
 
         # Renderizar el template HTML
         html_content = render_to_string('educational/certificate_pdf.html', {
             'certificate': certificate,
         })
-        
-        # Convertir HTML a PDF usando WeasyPrint
-        pdf_file = HTML(string=html_content).write_pdf()
-        
+
+        try:
+            pdf_file = _renderer.write_pdf(html_content)
+        except Exception as exc:
+            logger.exception('Error generando PDF del certificado %s', certificate.certificate_code)
+            certificate.pdf_status = 'failed'
+            certificate.pdf_error = str(exc)[:1000]
+            certificate.save(update_fields=['pdf_status', 'pdf_error'])
+            raise
+
         # Guardar el PDF
         filename = f"certificado_{certificate.certificate_code}.pdf".lower()
-        certificate.pdf_file.save(filename, ContentFile(pdf_file), save=True)
-        
+        if certificate.pdf_file and regenerate:
+            certificate.pdf_file.delete(save=False)
+        certificate.pdf_file.save(filename, ContentFile(pdf_file), save=False)
+        certificate.pdf_status = 'ready'
+        certificate.pdf_error = ''
+        certificate.save(update_fields=['pdf_file', 'pdf_status', 'pdf_error'])
+
         return certificate
+
+    def generate_batch(self, certificate_ids, regenerate: bool = True) -> dict:
+        """Genera los PDF de varios certificados y retorna un resumen de resultados."""
+        generated, failed = 0, []
+        queryset = CourseCertificate.objects.select_related('user', 'course').filter(pk__in=certificate_ids)
+        for certificate in queryset.iterator(chunk_size=100):
+            try:
+                self.generate_pdf(certificate, regenerate=regenerate)
+                generated += 1
+            except Exception:
+                failed.append(certificate.pk)
+        return {'generated': generated, 'failed': failed}
@@ -3,6 +3,7 @@ from django.utils import timezone
 from django.conf import settings
 
 from apps.core.models import BaseModel
+from apps.core.slugs import UniqueSlugMixin
 from apps.accounts.models import User
 
 # Niveles sugeridos del curso
@@ -30,10 +31,16 @@ QUESTION_TYPES = [
     ('multiple', 'Selección múltiple'),
 ]
 
-class Course(BaseModel):
+PDF_STATES = [
+    ('pending', 'Pendiente'),
+    ('ready', 'Generado'),
+    ('failed', 'Fallido'),
+]
+
+class Course(UniqueSlugMixin, BaseModel):
     """Curso teórico de energía solar compuesto por módulos"""
     title = models.CharField(max_length=200, verbose_name='Título')
-    slug = models.SlugField(unique=True, verbose_name='Slug')
+    slug = models.SlugField(unique=True, blank=True, verbose_name='Slug', help_text='Se genera a partir del título si se deja vacío')
     description = models.TextField(verbose_name='Descripción')
     level = models.CharField(max_length=15, choices=COURSE_LEVELS, default='basic', verbose_name='Nivel')
     estimated_hours = models.DecimalField(max_digits=5, decimal_places=2, default=1.0, verbose_name='Horas estimadas')
@@ -43,6 +50,8 @@ class Course(BaseModel):
     publish_state = models.CharField(max_length=10, choices=PUBLISH_STATES, default='draft', verbose_name='Estado de publicación')
     max_final_attempts = models.PositiveIntegerField(default=0, verbose_name='Máx intentos examen final', help_text='0 = ilimitado')
 
+    slug_default = 'curso'
+
     class Meta:
         verbose_name = 'Curso'
         verbose_name_plural = 'Cursos'
@@ -345,6 +354,8 @@ class CourseCertificate(BaseModel):
     final_score = models.PositiveIntegerField(default=0, verbose_name='Puntaje final')
     metadata = models.JSONField(default=dict, blank=True, verbose_name='Metadatos')
     pdf_file = models.FileField(upload_to='certificates/', blank=True, null=True, verbose_name='Archivo PDF')
+    pdf_status = models.CharField(max_length=10, choices=PDF_STATES, default='pending', db_index=True, verbose_name='Estado del PDF', help_text='El PDF se genera en segundo plano tras emitir el certificado')
+    pdf_error = models.TextField(blank=True, verbose_name='Error de generación del PDF')
     is_revoked = models.BooleanField(default=False, verbose_name='Revocado')
 
     class Meta:
@@ -359,3 +370,12 @@ class CourseCertificate(BaseModel):
     @property
     def is_valid(self):
         return not self.is_revoked
+
+    def revoke(self):
+        """Revoca el certificado; la señal post_save invalida la verificación cacheada."""
+        self.is_revoked = True
+        self.save(update_fields=['is_revoked', 'updated_at'])
+
+    @property
+    def pdf_pending(self):
+        return self.pdf_status == 'pending'
@@ -0,0 +1,421 @@
+"""
+Formato declarativo de paquetes de curso (JSON + medios) para importar y exportar cursos
+
+Un paquete es un directorio (o un .zip con la misma estructura)::
+
+    course.json
+    media/<archivos referenciados por las diapositivas>
+
+`course.json` describe el curso completo: datos generales, módulos con sus
+diapositivas y cuestionarios, y el examen final.
+"""
+import json
+import os
+import zipfile
+from datetime import timedelta
+from decimal import Decimal, InvalidOperation
+from pathlib import Path, PurePosixPath
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.utils import timezone
+
+from apps.accounts.models import User
+from apps.educational.course_models import (
+    COURSE_LEVELS, CONTENT_TYPES, PUBLISH_STATES, QUESTION_TYPES,
+    Course, FinalExamOption, FinalExamQuestion, Module, ModuleQuizOption,
+    ModuleQuizQuestion, Slide,
+)
+from apps.educational.models import Category
+
+FORMAT_VERSION = 1
+MANIFEST_NAME = 'course.json'
+MEDIA_DIR = 'media'
+
+COURSE_FIELDS = ('title', 'description', 'level', 'estimated_hours', 'final_pass_score', 'publish_state', 'max_final_attempts')
+MODULE_FIELDS = ('title', 'summary', 'required_pass_score')
+SLIDE_FIELDS = ('title', 'subtitle', 'content', 'content_type', 'video_url', 'duration_minutes', 'key_points', 'additional_resources')
+QUESTION_FIELDS = ('text', 'question_type', 'explanation')
+
+
+class CoursePackageError(ValueError):
+    """Error de validación de un paquete de curso; acumula todos los problemas encontrados."""
+
+    def __init__(self, errors):
+        self.errors = list(errors)
+        super().__init__('Paquete de curso inválido:\n' + '\n'.join(f'- {error}' for error in self.errors))
+
+
+class _PackageSource:
+    """Acceso uniforme a un paquete en directorio o en .zip."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._zip = zipfile.ZipFile(self.path) if self.path.suffix == '.zip' else None
+        if self._zip is None and not self.path.is_dir():
+            raise CoursePackageError([f'No se encontró el paquete: {self.path}'])
+
+    def read(self, name):
+        if self._zip is not None:
+            return self._zip.read(name)
+        return (self.path / name).read_bytes()
+
+    def exists(self, name):
+        if self._zip is not None:
+            return name in self._zip.namelist()
+        return (self.path / name).is_file()
+
+    def close(self):
+        if self._zip is not None:
+            self._zip.close()
+
+
+class CoursePackageImporter:
+    """Valida un paquete completo y lo escribe con `bulk_create` en una sola transacción."""
+
+    def __init__(self, path):
+        self.source = _PackageSource(path)
+        self.errors = []
+
+    def load(self):
+        try:
+            data = json.loads(self.source.read(MANIFEST_NAME).decode('utf-8'))
+        except (KeyError, FileNotFoundError):
+            raise CoursePackageError([f'El paquete no contiene {MANIFEST_NAME}'])
+        except (UnicodeDecodeError, json.JSONDecodeError) as exc:
+            raise CoursePackageError([f'{MANIFEST_NAME} no es JSON válido: {exc}'])
+        self.validate(data)
+        return data
+
+    # ------------------------------------------------------------------ validación
+
+    def validate(self, data):
+        self.errors = []
+        if not isinstance(data, dict):
+            raise CoursePackageError(['La raíz del paquete debe ser un objeto JSON'])
+        if data.get('format_version') != FORMAT_VERSION:
+            self._error('format_version', f'se esperaba {FORMAT_VERSION}')
+
+        course = data.get('course')
+        if not isinstance(course, dict):
+            self._error('course', 'es obligatorio')
+        else:
+            self._require(course, 'course', ('slug', 'title', 'description'))
+            self._choice(course, 'course', 'level', COURSE_LEVELS)
+            self._choice(course, 'course', 'publish_state', PUBLISH_STATES)
+            self._positive_int(course, 'course', ('final_pass_score', 'max_final_attempts'))
+            if course.get('estimated_hours') is not None:
+                try:
+                    Decimal(str(course['estimated_hours']))
+                except InvalidOperation:
+                    self._error('course.estimated_hours', 'debe ser numérico')
+
+        modules = data.get('modules', [])
+        if not isinstance(modules, list):
+            self._error('modules', 'debe ser una lista')
+            modules = []
+        orders = set()
+        for index, module in enumerate(modules):
+            path = f'modules[{index}]'
+            if not isinstance(module, dict):
+                self._error(path, 'debe ser un objeto')
+                continue
+            self._require(module, path, ('order', 'title'))
+            self._positive_int(module, path, ('order', 'required_pass_score'))
+            if module.get('order') in orders:
+                self._error(f'{path}.order', f"orden {module.get('order')} repetido")
+            orders.add(module.get('order'))
+
+            slide_orders = set()
+            for slide_index, slide in enumerate(self._list(module, path, 'slides')):
+                slide_path = f'{path}.slides[{slide_index}]'
+                if not isinstance(slide, dict):
+                    self._error(slide_path, 'debe ser un objeto')
+                    continue
+                self._require(slide, slide_path, ('order', 'title', 'content'))
+                self._positive_int(slide, slide_path, ('order', 'duration_minutes'))
+                self._choice(slide, slide_path, 'content_type', CONTENT_TYPES)
+                if slide.get('order') in slide_orders:
+                    self._error(f'{slide_path}.order', f"orden {slide.get('order')} repetido")
+                slide_orders.add(slide.get('order'))
+                image = slide.get('image')
+                if image and not self._media_exists(image):
+                    self._error(f'{slide_path}.image', f'no existe el archivo {image} en el paquete')
+
+            for question_index, question in enumerate(self._list(module, path, 'questions')):
+                self._validate_question(question, f'{path}.questions[{question_index}]')
+
+        for question_index, question in enumerate(self._list(data, '', 'final_exam')):
+            self._validate_question(question, f'final_exam[{question_index}]')
+
+        if self.errors:
+            raise CoursePackageError(self.errors)
+
+    def _validate_question(self, question, path):
+        if not isinstance(question, dict):
+            self._error(path, 'debe ser un objeto')
+            return
+        self._require(question, path, ('text',))
+        self._choice(question, path, 'question_type', QUESTION_TYPES)
+        options = self._list(question, path, 'options')
+        for option_index, option in enumerate(options):
+            option_path = f'{path}.options[{option_index}]'
+            if not isinstance(option, dict):
+                self._error(option_path, 'debe ser un objeto')
+            else:
+                self._require(option, option_path, ('text',))
+        if len(options) < 2:
+            self._error(f'{path}.options', 'se requieren al menos dos opciones')
+        correct = [option for option in options if isinstance(option, dict) and option.get('is_correct')]
+        if not correct:
+            self._error(f'{path}.options', 'debe haber al menos una opción correcta')
+        elif question.get('question_type', 'single') == 'single' and len(correct) > 1:
+            self._error(f'{path}.options', 'una pregunta de selección única solo admite una opción correcta')
+
+    def _media_exists(self, name):
+        relative = PurePosixPath(name)
+        if relative.is_absolute() or '..' in relative.parts:
+            return False
+        return self.source.exists(str(PurePosixPath(MEDIA_DIR) / relative))
+
+    def _list(self, node, path, field):
+        """Retorna la lista `field` del nodo; si no es una lista registra el error y retorna []."""
+        value = node.get(field)
+        if value is None:
+            return []
+        if not isinstance(value, list):
+            self._error(f'{path}.{field}' if path else field, 'debe ser una lista')
+            return []
+        return value
+
+    def _require(self, node, path, fields):
+        for field in fields:
+            if node.get(field) in (None, ''):
+                self._error(f'{path}.{field}', 'es obligatorio')
+
+    def _choice(self, node, path, field, choices):
+        value = node.get(field)
+        if value is not None and value not in {key for key, _ in choices}:
+            self._error(f'{path}.{field}', f'valor inválido "{value}"')
+
+    def _positive_int(self, node, path, fields):
+        for field in fields:
+            value = node.get(field)
+            if value is not None and (not isinstance(value, int) or isinstance(value, bool) or value < 0):
+                self._error(f'{path}.{field}', 'debe ser un entero positivo')
+
+    def _error(self, path, message):
+        self.errors.append(f'{path}: {message}')
+
+    # ------------------------------------------------------------------ escritura
+
+    def import_course(self, author=None, replace=False):
+        """Importa el paquete. Con `replace` reemplaza el contenido de un curso existente."""
+        data = self.load()
+        course_data = data['course']
+
+        with transaction.atomic():
+            course = Course.objects.select_for_update().filter(slug=course_data['slug']).first()
+            if course is not None and not replace:
+                raise CoursePackageError([
+                    f"course.slug: el curso '{course.slug}' ya existe; usa replace para reemplazar su contenido"
+                ])
+
+            author = author or self._resolve_author(course_data.get('author_email'))
+            category = self._resolve_category(course_data.get('category'))
+            values = {field: course_data[field] for field in COURSE_FIELDS if field in course_data}
+            values.update({'author': author, 'category': category})
+
+            if course is None:
+                course = Course.objects.create(slug=course_data['slug'], **values)
+            else:
+                for field, value in values.items():
+                    setattr(course, field, value)
+                course.save()
+                course.modules.all().delete()
+                course.final_questions.all().delete()
+
+            self._write_tree(course, data)
+
+        self.source.close()
+        return course
+
+    def _write_tree(self, course, data):
+        # created_at escalonado: las preguntas y opciones se ordenan por created_at.
+        clock = _Clock()
+
+        modules_data = sorted(data.get('modules', []), key=lambda m: m['order'])
+        modules = _bulk_create(Module, [
+            Module(
+                course=course, order=module['order'], created_at=clock(),
+                **{field: module[field] for field in MODULE_FIELDS if field in module}
+            )
+            for module in modules_data
+        ], course=course)
+
+        slides, questions, question_options = [], [], []
+        for module, module_data in zip(modules, modules_data):
+            for slide in module_data.get('slides', []):
+                values = {field: slide[field] for field in SLIDE_FIELDS if field in slide}
+                if slide.get('image'):
+                    values['image'] = self._store_media(slide['image'], 'educational/slides/')
+                slides.append(Slide(module=module, order=slide['order'], created_at=clock(), **values))
+            for question in module_data.get('questions', []):
+                questions.append(ModuleQuizQuestion(
+                    module=module, created_at=clock(),
+                    **{field: question[field] for field in QUESTION_FIELDS if field in question}
+                ))
+                question_options.append(question.get('options', []))
+
+        Slide.objects.bulk_create(slides, batch_size=500)
+        questions = _bulk_create(ModuleQuizQuestion, questions, module__course=course)
+        ModuleQuizOption.objects.bulk_create([
+            ModuleQuizOption(question=question, text=option['text'], is_correct=bool(option.get('is_correct')), created_at=clock())
+            for question, options in zip(questions, question_options)
+            for option in options
+        ], batch_size=500)
+
+        final_data = data.get('final_exam', [])
+        final_questions = _bulk_create(FinalExamQuestion, [
+            FinalExamQuestion(
+                course=course, created_at=clock(),
+                **{field: question[field] for field in QUESTION_FIELDS if field in question}
+            )
+            for question in final_data
+        ], course=course)
+        FinalExamOption.objects.bulk_create([
+            FinalExamOption(question=question, text=option['text'], is_correct=bool(option.get('is_correct')), created_at=clock())
+            for question, question_data in zip(final_questions, final_data)
+            for option in question_data.get('options', [])
+        ], batch_size=500)
+
+    def _store_media(self, name, upload_to):
+        content = self.source.read(str(PurePosixPath(MEDIA_DIR) / name))
+        return default_storage.save(upload_to + PurePosixPath(name).name, ContentFile(content))
+
+    @staticmethod
+    def _resolve_author(email):
+        author = None
+        if email:
+            author = User.objects.filter(email=email).first()
+        author = author or User.objects.filter(is_superuser=True).order_by('pk').first()
+        if author is None:
+            raise CoursePackageError(['course.author_email: no existe el autor ni un superusuario al cual asignar el curso'])
+        return author
+
+    @staticmethod
+    def _resolve_category(category):
+        if not category:
+            return None
+        instance, _ = Category.objects.get_or_create(
+            slug=category['slug'],
+            defaults={'name': category.get('name') or category['slug'], 'description': category.get('description', '')},
+        )
+        return instance
+
+
+class _Clock:
+    """Genera created_at estrictamente crecientes para conservar el orden del paquete."""
+
+    def __init__(self):
+        self.now = timezone.now()
+        self.tick = 0
+
+    def __call__(self):
+        self.tick += 1
+        return self.now + timedelta(microseconds=self.tick)
+
+
+def _bulk_create(model, objects, **scope):
+    """`bulk_create` que garantiza llaves primarias en los objetos devueltos.
+
+    MariaDB 10.5+, PostgreSQL y SQLite devuelven los ids insertados; en MySQL
+    se recuperan en orden de inserción dentro del mismo alcance y transacción.
+    """
+    created = model.objects.bulk_create(objects, batch_size=500)
+    if created and created[0].pk is None:
+        pks = list(model.objects.filter(**scope).order_by('-pk').values_list('pk', flat=True)[:len(created)])
+        for obj, pk in zip(created, reversed(pks)):
+            obj.pk = pk
+    return created
+
+
+class CoursePackageExporter:
+    """Exporta un curso al formato de paquete, en un directorio o un .zip."""
+
+    def build(self, course):
+        """Retorna `(manifest, media)` donde media mapea nombre -> ruta en el storage."""
+        media = {}
+        modules = []
+        module_qs = (
+            course.modules.order_by('order')
+            .prefetch_related('slides', 'questions__options')
+        )
+        for module in module_qs:
+            slides = []
+            for slide in sorted(module.slides.all(), key=lambda s: s.order):
+                item = {'order': slide.order}
+                item.update({field: getattr(slide, field) for field in SLIDE_FIELDS})
+                if slide.image:
+                    name = f'slides/{os.path.basename(slide.image.name)}'
+                    media[name] = slide.image.name
+                    item['image'] = name
+                slides.append(item)
+            modules.append({
+                'order': module.order,
+                **{field: getattr(module, field) for field in MODULE_FIELDS},
+                'slides': slides,
+                'questions': [self._question(question, question.options.all()) for question in module.questions.all()],
+            })
+
+        final_exam = [
+            self._question(question, question.final_options.all())
+            for question in course.final_questions.prefetch_related('final_options')
+        ]
+
+        manifest = {
+            'format_version': FORMAT_VERSION,
+            'course': {
+                'slug': course.slug,
+                **{field: getattr(course, field) for field in COURSE_FIELDS},
+                'estimated_hours': float(course.estimated_hours),
+                'author_email': course.author.email,
+                'category': (
+                    {'slug': course.category.slug, 'name': course.category.name, 'description': course.category.description}
+                    if course.category else None
+                ),
+            },
+            'modules': modules,
+            'final_exam': final_exam,
+        }
+        return manifest, media
+
+    @staticmethod
+    def _question(question, options):
+        return {
+            **{field: getattr(question, field) for field in QUESTION_FIELDS},
+            'options': [{'text': option.text, 'is_correct': option.is_correct} for option in options],
+        }
+
+    def export(self, course, path):
+        manifest, media = self.build(course)
+        payload = json.dumps(manifest, ensure_ascii=False, indent=2).encode('utf-8')
+        path = Path(path)
+
+        if path.suffix == '.zip':
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with zipfile.ZipFile(path, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+                archive.writestr(MANIFEST_NAME, payload)
+                for name, stored in media.items():
+                    with default_storage.open(stored, 'rb') as handle:
+                        archive.writestr(f'{MEDIA_DIR}/{name}', handle.read())
+        else:
+            path.mkdir(parents=True, exist_ok=True)
+            (path / MANIFEST_NAME).write_bytes(payload)
+            for name, stored in media.items():
+                target = path / MEDIA_DIR / name
+                target.parent.mkdir(parents=True, exist_ok=True)
+                with default_storage.open(stored, 'rb') as handle:
+                    target.write_bytes(handle.read())
+        return path
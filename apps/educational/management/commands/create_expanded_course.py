@@ -2,6 +2,7 @@
 Comando para crear un curso EXPANDIDO con mucho más contenido
 """
 from django.core.management.base import BaseCommand
+from django.db import transaction
 from apps.educational.course_models import (
     Course, Module, Slide, ModuleQuizQuestion, ModuleQuizOption,
     FinalExamQuestion, FinalExamOption
@@ -13,6 +14,7 @@ from apps.accounts.models import User
 class Command(BaseCommand):
     help = 'Expande el curso de Fundamentos de Energía Solar con más contenido'
 
+    @transaction.atomic
     def handle(self, *args, **kwargs):
         self.stdout.write(self.style.SUCCESS('Expandiendo curso con más contenido...'))
         
@@ -3,13 +3,14 @@ Script para EXPANDIR el curso existente con mucho más contenido por módulo
 Ejecutar con: python manage.py expand_course_content
 """
 from django.core.management.base import BaseCommand
-from django.db import models
+from django.db import models, transaction
 from apps.educational.course_models import Course, Module, Slide, ModuleQuizQuestion, ModuleQuizOption
 
 
 class Command(BaseCommand):
     help = 'Expande el curso Fundamentos de Energía Solar con más slides y preguntas'
 
+    @transaction.atomic
     def handle(self, *args, **kwargs):
         try:
             course = Course.objects.get(slug='fundamentos-energia-solar')
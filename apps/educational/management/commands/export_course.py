@@ -0,0 +1,24 @@
+"""
+Comando para exportar un curso al formato de paquete declarativo
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.educational.course_models import Course
+from apps.educational.course_package import CoursePackageExporter
+
+
+class Command(BaseCommand):
+    help = 'Exporta un curso a un paquete (directorio o .zip) que puede importarse con import_course.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('slug', help='Slug del curso a exportar.')
+        parser.add_argument('path', help='Directorio de destino o ruta terminada en .zip.')
+
+    def handle(self, *args, **options):
+        try:
+            course = Course.objects.select_related('author', 'category').get(slug=options['slug'])
+        except Course.DoesNotExist as exc:
+            raise CommandError(f"No existe un curso con slug '{options['slug']}'.") from exc
+
+        path = CoursePackageExporter().export(course, options['path'])
+        self.stdout.write(self.style.SUCCESS(f'✅ Curso "{course.title}" exportado en {path}'))
@@ -0,0 +1,43 @@
+"""
+Comando para importar un curso desde un paquete declarativo (course.json + media)
+"""
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.accounts.models import User
+from apps.educational.course_package import CoursePackageError, CoursePackageImporter
+
+
+class Command(BaseCommand):
+    help = 'Importa un curso completo desde un paquete (directorio o .zip con course.json y media/).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Ruta al directorio o .zip del paquete.')
+        parser.add_argument('--replace', action='store_true', help='Reemplaza el contenido si el curso ya existe.')
+        parser.add_argument('--author', dest='author_email', help='Correo del autor a asignar (por defecto el del paquete).')
+        parser.add_argument('--validate-only', action='store_true', help='Solo valida el paquete sin escribir en la base de datos.')
+
+    def handle(self, *args, **options):
+        author = None
+        if options['author_email']:
+            author = User.objects.filter(email=options['author_email']).first()
+            if author is None:
+                raise CommandError(f"No existe un usuario con correo {options['author_email']}.")
+
+        started = time.monotonic()
+        try:
+            importer = CoursePackageImporter(options['path'])
+            if options['validate_only']:
+                importer.load()
+                self.stdout.write(self.style.SUCCESS('✅ Paquete válido.'))
+                return
+            course = importer.import_course(author=author, replace=options['replace'])
+        except CoursePackageError as exc:
+            raise CommandError(str(exc)) from exc
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ Curso "{course.title}" importado en {elapsed * 1000:.0f} ms: '
+            f'{course.modules.count()} módulos, {course.final_questions.count()} preguntas de examen final.'
+        ))
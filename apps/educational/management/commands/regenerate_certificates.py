@@ -0,0 +1,100 @@
+"""
+Comando para regenerar masivamente los PDF de certificados de curso
+"""
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from apps.educational.course_models import CourseCertificate
+
+
+def _render_chunk(certificate_ids, regenerate):
+    """Punto de entrada de cada proceso hijo en modo --local."""
+    from apps.educational.certificate_service import CertificatePDFService
+
+    # Cada proceso abre su propia conexión; nunca reutilizar la heredada del padre.
+    connections.close_all()
+    return CertificatePDFService().generate_batch(certificate_ids, regenerate=regenerate)
+
+
+class Command(BaseCommand):
+    help = (
+        'Regenera los PDF de certificados en paralelo. Por defecto reparte lotes entre los '
+        'workers de Celery; con --local usa un pool de procesos en esta máquina.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--course', dest='course_slug', help='Slug del curso a regenerar.')
+        parser.add_argument(
+            '--only-missing',
+            action='store_true',
+            help='Solo genera certificados sin PDF o con generación fallida.'
+        )
+        parser.add_argument('--batch-size', type=int, default=50, help='Certificados por lote (default: 50).')
+        parser.add_argument(
+            '--local',
+            action='store_true',
+            help='Procesa en este equipo con un pool de procesos en lugar de encolar en Celery.'
+        )
+        parser.add_argument('--processes', type=int, default=None, help='Procesos para el modo --local.')
+
+    def handle(self, *args, **options):
+        queryset = CourseCertificate.objects.filter(is_revoked=False)
+        if options['course_slug']:
+            queryset = queryset.filter(course__slug=options['course_slug'])
+        if options['only_missing']:
+            queryset = queryset.exclude(pdf_status='ready')
+
+        certificate_ids = list(queryset.order_by('pk').values_list('pk', flat=True))
+        if not certificate_ids:
+            self.stdout.write(self.style.WARNING('No hay certificados para regenerar.'))
+            return
+
+        batch_size = max(1, options['batch_size'])
+        batches = [certificate_ids[i:i + batch_size] for i in range(0, len(certificate_ids), batch_size)]
+        regenerate = not options['only_missing']
+
+        # Marcar como pendientes para que las vistas no ofrezcan un PDF desactualizado.
+        CourseCertificate.objects.filter(pk__in=certificate_ids).update(pdf_status='pending', pdf_error='')
+
+        if options['local']:
+            self._run_local(batches, regenerate, options['processes'])
+        else:
+            self._run_celery(batches, regenerate)
+
+    def _run_celery(self, batches, regenerate):
+        from celery import group
+
+        from apps.educational.tasks import regenerate_certificates_batch_task
+
+        result = group(
+            regenerate_certificates_batch_task.s(batch, regenerate=regenerate) for batch in batches
+        ).apply_async()
+        total = sum(len(batch) for batch in batches)
+        self.stdout.write(self.style.SUCCESS(
+            f'Se encolaron {total} certificado(s) en {len(batches)} lote(s). Grupo: {result.id}'
+        ))
+
+    def _run_local(self, batches, regenerate, processes):
+        started = time.monotonic()
+        generated, failed = 0, []
+
+        # Cerrar conexiones antes de crear los procesos hijos.
+        connections.close_all()
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            futures = [executor.submit(_render_chunk, batch, regenerate) for batch in batches]
+            for future in as_completed(futures):
+                summary = future.result()
+                generated += summary['generated']
+                failed.extend(summary['failed'])
+                self.stdout.write(f'🔄 {generated} generado(s), {len(failed)} con error...')
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ {generated} certificado(s) generados en {elapsed:.1f}s '
+            f'({generated / elapsed if elapsed else generated:.1f}/s).'
+        ))
+        if failed:
+            self.stderr.write(self.style.ERROR(f'❌ Fallaron {len(failed)}: {", ".join(map(str, failed))}'))
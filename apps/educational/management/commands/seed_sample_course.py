@@ -9,6 +9,7 @@ from apps.educational.course_models import (
     CourseEnrollment, ModuleAttempt, ModuleAnswer,
     FinalExamQuestion, FinalExamOption, FinalExamAttempt, CourseCertificate
 )
+from apps.educational.attempt_service import AttemptService
 from apps.educational.certificate_service import CertificatePDFService
 
 User = get_user_model()
@@ -72,10 +73,13 @@ class Command(BaseCommand):
 
         # Inscripción
         enrollment, _ = CourseEnrollment.objects.get_or_create(user=student, course=course)
+        attempts = AttemptService()
 
         # Aprobar módulo 1
         if not ModuleAttempt.objects.filter(user=student, module=module1, passed=True).exists():
-            attempt1 = ModuleAttempt.objects.create(user=student, module=module1, attempt_number=1, current_slide=module1.slides_count)
+            attempt1 = attempts.start_module_attempt(student, module1)
+            attempt1.current_slide = module1.slides_count
+            attempt1.save(update_fields=['current_slide'])
             for question in module1.questions.all():
                 ans = ModuleAnswer.objects.create(attempt=attempt1, question=question)
                 ans.selected_options.set(question.correct_options())
@@ -87,7 +91,9 @@ class Command(BaseCommand):
 
         # Aprobar módulo 2 (sin preguntas)
         if not ModuleAttempt.objects.filter(user=student, module=module2, passed=True).exists():
-            attempt2 = ModuleAttempt.objects.create(user=student, module=module2, attempt_number=1, current_slide=module2.slides_count)
+            attempt2 = attempts.start_module_attempt(student, module2)
+            attempt2.current_slide = module2.slides_count
+            attempt2.save(update_fields=['current_slide'])
             attempt2.mark_submitted(score=100, passed=True)
 
         # Actualizar progreso manual (simple)
@@ -101,7 +107,7 @@ class Command(BaseCommand):
 
         # Examen final
         if not FinalExamAttempt.objects.filter(user=student, course=course, passed=True).exists():
-            exam_attempt = FinalExamAttempt.objects.create(user=student, course=course, attempt_number=1)
+            exam_attempt = attempts.start_final_attempt(student, course)
             correct_count = 0
             final_questions = course.final_questions.all()
             for q in final_questions:
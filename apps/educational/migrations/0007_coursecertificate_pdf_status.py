@@ -0,0 +1,35 @@
+# Generated by Django 5.0.6 on 2026-10-19 10:55
+
+from django.db import migrations, models
+
+
+def mark_existing_pdfs_ready(apps, schema_editor):
+    CourseCertificate = apps.get_model('educational', 'CourseCertificate')
+    with_pdf = CourseCertificate.objects.exclude(pdf_file='').exclude(pdf_file__isnull=True)
+    with_pdf.update(pdf_status='ready')
+    # Sin PDF y sin tarea en curso: 'failed' permite que el próximo envío del examen
+    # o `regenerate_certificates` los vuelvan a encolar
+    CourseCertificate.objects.exclude(pk__in=with_pdf.values('pk')).update(
+        pdf_status='failed', pdf_error='Emitido antes de la generación del PDF en segundo plano.',
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('educational', '0006_slide_additional_resources_slide_content_type_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='coursecertificate',
+            name='pdf_error',
+            field=models.TextField(blank=True, verbose_name='Error de generación del PDF'),
+        ),
+        migrations.AddField(
+            model_name='coursecertificate',
+            name='pdf_status',
+            field=models.CharField(choices=[('pending', 'Pendiente'), ('ready', 'Generado'), ('failed', 'Fallido')], db_index=True, default='pending', help_text='El PDF se genera en segundo plano tras emitir el certificado', max_length=10, verbose_name='Estado del PDF'),
+        ),
+        migrations.RunPython(mark_existing_pdfs_ready, migrations.RunPython.noop),
+    ]
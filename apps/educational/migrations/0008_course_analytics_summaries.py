@@ -0,0 +1,83 @@
+# Generated by Django 5.0.6 on 2026-10-19 10:58
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('educational', '0007_coursecertificate_pdf_status'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyPassRate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now, help_text='Fecha y hora en que se creó el registro', verbose_name='Fecha de creación')),
+                ('updated_at', models.DateTimeField(auto_now=True, help_text='Fecha y hora de la última actualización', verbose_name='Fecha de actualización')),
+                ('is_active', models.BooleanField(default=True, help_text='Indica si el registro está activo', verbose_name='Activo')),
+                ('day', models.DateField(verbose_name='Día')),
+                ('attempts_count', models.PositiveIntegerField(default=0, verbose_name='Intentos finalizados')),
+                ('passed_count', models.PositiveIntegerField(default=0, verbose_name='Intentos aprobados')),
+                ('average_score', models.FloatField(default=0, verbose_name='Puntaje promedio')),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_pass_rates', to='educational.course', verbose_name='Curso')),
+                ('module', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='daily_pass_rates', to='educational.module', verbose_name='Módulo')),
+            ],
+            options={
+                'verbose_name': 'Tasa de aprobación diaria',
+                'verbose_name_plural': 'Tasas de aprobación diarias',
+                'ordering': ['course', 'module', 'day'],
+                'unique_together': {('course', 'module', 'day')},
+            },
+        ),
+        migrations.CreateModel(
+            name='OptionStatistic',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now, help_text='Fecha y hora en que se creó el registro', verbose_name='Fecha de creación')),
+                ('updated_at', models.DateTimeField(auto_now=True, help_text='Fecha y hora de la última actualización', verbose_name='Fecha de actualización')),
+                ('is_active', models.BooleanField(default=True, help_text='Indica si el registro está activo', verbose_name='Activo')),
+                ('kind', models.CharField(choices=[('module', 'Cuestionario de módulo'), ('final', 'Examen final')], max_length=10, verbose_name='Tipo de pregunta')),
+                ('option_id', models.PositiveBigIntegerField(verbose_name='ID de la opción')),
+                ('question_id', models.PositiveBigIntegerField(verbose_name='ID de la pregunta')),
+                ('is_correct', models.BooleanField(default=False, verbose_name='Correcta')),
+                ('selected_count', models.PositiveIntegerField(default=0, verbose_name='Veces seleccionada')),
+                ('selection_rate', models.FloatField(default=0, help_text='Selecciones / respuestas a la pregunta (0-1)', verbose_name='Tasa de selección')),
+                ('computed_at', models.DateTimeField(verbose_name='Calculado el')),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='option_statistics', to='educational.course', verbose_name='Curso')),
+            ],
+            options={
+                'verbose_name': 'Estadística de opción',
+                'verbose_name_plural': 'Estadísticas de opciones',
+                'indexes': [models.Index(fields=['kind', 'question_id'], name='educational_kind_4c7091_idx')],
+                'unique_together': {('kind', 'option_id')},
+            },
+        ),
+        migrations.CreateModel(
+            name='QuestionStatistic',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now, help_text='Fecha y hora en que se creó el registro', verbose_name='Fecha de creación')),
+                ('updated_at', models.DateTimeField(auto_now=True, help_text='Fecha y hora de la última actualización', verbose_name='Fecha de actualización')),
+                ('is_active', models.BooleanField(default=True, help_text='Indica si el registro está activo', verbose_name='Activo')),
+                ('kind', models.CharField(choices=[('module', 'Cuestionario de módulo'), ('final', 'Examen final')], max_length=10, verbose_name='Tipo de pregunta')),
+                ('question_id', models.PositiveBigIntegerField(verbose_name='ID de la pregunta')),
+                ('answers_count', models.PositiveIntegerField(default=0, verbose_name='Respuestas')),
+                ('correct_count', models.PositiveIntegerField(default=0, verbose_name='Respuestas correctas')),
+                ('difficulty', models.FloatField(default=0, help_text='Proporción de respuestas correctas (0-1)', verbose_name='Índice de dificultad')),
+                ('discrimination', models.FloatField(blank=True, help_text='Correlación punto-biserial entre acierto y puntaje del intento', null=True, verbose_name='Índice de discriminación')),
+                ('computed_at', models.DateTimeField(verbose_name='Calculado el')),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='question_statistics', to='educational.course', verbose_name='Curso')),
+                ('module', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='question_statistics', to='educational.module', verbose_name='Módulo')),
+            ],
+            options={
+                'verbose_name': 'Estadística de pregunta',
+                'verbose_name_plural': 'Estadísticas de preguntas',
+                'indexes': [models.Index(fields=['course', 'kind'], name='educational_course__7f10a8_idx')],
+                'unique_together': {('kind', 'question_id')},
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.0.6 on 2026-10-19 11:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('educational', '0008_course_analytics_summaries'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='course',
+            name='slug',
+            field=models.SlugField(blank=True, help_text='Se genera a partir del título si se deja vacío', unique=True, verbose_name='Slug'),
+        ),
+        migrations.AlterField(
+            model_name='educationalresource',
+            name='slug',
+            field=models.SlugField(blank=True, help_text='Se genera a partir del título si se deja vacío', unique=True, verbose_name='Slug'),
+        ),
+    ]
@@ -1,5 +1,6 @@
 from django.db import models
 from apps.core.models import BaseModel
+from apps.core.slugs import UniqueSlugMixin
 from apps.accounts.models import User
 
 class Category(BaseModel):
@@ -16,7 +17,7 @@ class Category(BaseModel):
         return self.name
 
 
-class EducationalResource(BaseModel):
+class EducationalResource(UniqueSlugMixin, BaseModel):
     """Modelo para recursos educativos"""
     
     RESOURCE_TYPES = [
@@ -28,7 +29,7 @@ class EducationalResource(BaseModel):
     ]
     
     title = models.CharField(max_length=200, verbose_name='Título')
-    slug = models.SlugField(unique=True, verbose_name='Slug')
+    slug = models.SlugField(unique=True, blank=True, verbose_name='Slug', help_text='Se genera a partir del título si se deja vacío')
     category = models.ForeignKey(Category, on_delete=models.CASCADE, verbose_name='Categoría')
     resource_type = models.CharField(max_length=20, choices=RESOURCE_TYPES, verbose_name='Tipo')
     content = models.TextField(verbose_name='Contenido')
@@ -42,6 +43,8 @@ class EducationalResource(BaseModel):
     is_featured = models.BooleanField(default=False, verbose_name='Destacado')
     views_count = models.IntegerField(default=0, verbose_name='Número de vistas')
     
+    slug_default = 'recurso'
+
     class Meta:
         verbose_name = 'Recurso educativo'
         verbose_name_plural = 'Recursos educativos'
@@ -49,3 +52,16 @@ class EducationalResource(BaseModel):
         
     def __str__(self):
         return self.title
+
+
+# Los modelos del flujo de cursos viven en course_models.py; se importan aquí
+# para que Django los registre junto con el resto de la app (migraciones, admin).
+from .course_models import (  # noqa: E402,F401
+    Course, Module, Slide, ModuleQuizQuestion, ModuleQuizOption,
+    CourseEnrollment, ModuleAttempt, ModuleAnswer,
+    FinalExamQuestion, FinalExamOption, FinalExamAttempt, FinalExamAnswer,
+    SlideView, UserProgress, CourseCertificate,
+)
+from .analytics_models import (  # noqa: E402,F401
+    QuestionStatistic, OptionStatistic, DailyPassRate,
+)
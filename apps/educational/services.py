@@ -4,7 +4,7 @@ import uuid
 
 from apps.educational.course_models import (
     ModuleAttempt, ModuleAnswer, CourseEnrollment,
-    FinalExamAttempt, CourseCertificate, Course
+    FinalExamAttempt, FinalExamAnswer, CourseCertificate, Course
 )
 from .progress_service import ProgressService
 
@@ -62,9 +62,7 @@ class FinalExamService:
 
         course = attempt.course
         questions = course.final_questions.filter(is_active=True)
-        # Validar límite de intentos si aplica
-        if course.max_final_attempts and attempt.attempt_number > course.max_final_attempts:
-            raise ValueError('Se alcanzó el número máximo de intentos del examen final.')
+        # El límite de intentos lo valida AttemptService.start_final_attempt antes de crear el intento
         total = questions.count()
         if total == 0:
             attempt.mark_submitted(score=100, passed=True)
@@ -82,6 +80,11 @@ class FinalExamService:
                     is_correct = selected_ids == correct_ids and len(selected_ids) > 0
                 if is_correct:
                     correct_count += 1
+                # Las respuestas guardadas alimentan el análisis de ítems del examen final
+                answer, _ = FinalExamAnswer.objects.update_or_create(
+                    attempt=attempt, question=question, defaults={'is_correct': is_correct},
+                )
+                answer.selected_options.set(question.final_options.filter(id__in=selected_ids, is_active=True))
                 details.append({
                     'question_id': question.id,
                     'is_correct': is_correct,
@@ -108,25 +111,38 @@ class FinalExamService:
         }
 
     def _issue_certificate(self, user, course: Course, score: int):
-        from .certificate_service import CertificatePDFService
-        
+        """Emite el certificado y delega la generación del PDF a Celery.
+
+        El PDF se encola con `transaction.on_commit` para que el envío del examen
+        responda de inmediato y el worker solo vea certificados ya confirmados.
+        """
         existing = CourseCertificate.objects.filter(user=user, course=course).first()
         if existing:
             # Generar PDF si no existe
-            if not existing.pdf_file:
-                CertificatePDFService().generate_pdf(existing, regenerate=False)
+            if not existing.pdf_file and existing.pdf_status != 'pending':
+                existing.pdf_status = 'pending'
+                existing.save(update_fields=['pdf_status'])
+                self._enqueue_pdf(existing)
             return existing  # Evitar duplicados
-        
+
         code = f"CUR-{course.pk}-{user.pk}-{uuid.uuid4().hex[:8]}".upper()
         certificate = CourseCertificate.objects.create(
             user=user,
             course=course,
             certificate_code=code,
             final_score=score,
+            pdf_status='pending',
             metadata={'course_title': course.title, 'user_email': user.email}
         )
-        
-        # Generar PDF automáticamente
-        CertificatePDFService().generate_pdf(certificate, regenerate=False)
-        
+
+        # Generar PDF en segundo plano
+        self._enqueue_pdf(certificate)
+
         return certificate
+
+    @staticmethod
+    def _enqueue_pdf(certificate: CourseCertificate):
+        from .tasks import generate_certificate_pdf_task
+
+        certificate_id = certificate.pk
+        transaction.on_commit(lambda: generate_certificate_pdf_task.delay(certificate_id))
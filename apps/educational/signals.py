@@ -0,0 +1,21 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .course_models import Course, CourseCertificate
+from .verification_service import CertificateVerificationService
+
+
+@receiver(post_save, sender=CourseCertificate)
+@receiver(post_delete, sender=CourseCertificate)
+def invalidate_certificate_verification(sender, instance, **kwargs):
+    """Invalidar la verificación cacheada al emitir, revocar o eliminar un certificado"""
+    CertificateVerificationService().invalidate(instance.certificate_code)
+
+
+@receiver(post_save, sender=Course)
+def invalidate_course_certificates_verification(sender, instance, created, **kwargs):
+    """El título del curso forma parte de la respuesta firmada"""
+    if created:
+        return
+    codes = instance.certificates.values_list('certificate_code', flat=True)
+    CertificateVerificationService().invalidate(*codes)
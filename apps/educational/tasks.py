@@ -0,0 +1,42 @@
+from celery import shared_task
+
+
+@shared_task(bind=True, max_retries=3, default_retry_delay=30)
+def generate_certificate_pdf_task(self, certificate_id, regenerate=False):
+    """Genera en segundo plano el PDF de un certificado recién emitido."""
+    from .certificate_service import CertificatePDFService
+    from .course_models import CourseCertificate
+
+    certificate = (
+        CourseCertificate.objects.select_related('user', 'course')
+        .filter(pk=certificate_id)
+        .first()
+    )
+    if certificate is None:
+        return None
+
+    try:
+        CertificatePDFService().generate_pdf(certificate, regenerate=regenerate)
+    except Exception as exc:
+        raise self.retry(exc=exc)
+    return certificate.certificate_code
+
+
+@shared_task
+def regenerate_certificates_batch_task(certificate_ids, regenerate=True):
+    """Regenera un lote de certificados dentro de un mismo worker.
+
+    Procesar por lotes permite reutilizar el renderizador ya inicializado del
+    worker en lugar de pagar el arranque de WeasyPrint por cada certificado.
+    """
+    from .certificate_service import CertificatePDFService
+
+    return CertificatePDFService().generate_batch(certificate_ids, regenerate=regenerate)
+
+
+@shared_task
+def rebuild_course_analytics_task():
+    """Tarea nocturna: recalcula las tablas resumen de analítica de cursos."""
+    from .analytics_service import CourseAnalyticsService
+
+    return CourseAnalyticsService().rebuild()
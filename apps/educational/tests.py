@@ -1,3 +1,178 @@
-from django.test import TestCase
+import tempfile
+import threading
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, skipUnlessDBFeature
+from django.urls import reverse
+
+from .analytics_service import CourseAnalyticsService
+from .attempt_service import AttemptLimitReached, AttemptService, NotEnrolled
+from .course_models import (
+    Course, CourseCertificate, CourseEnrollment, FinalExamAnswer, FinalExamAttempt, FinalExamOption, FinalExamQuestion,
+)
+from .course_package import CoursePackageError, CoursePackageImporter
+
+
+def create_course(max_final_attempts=2):
+    User = get_user_model()
+    author = User.objects.create_user(email='autor@example.com', username='autor', password='x')
+    student = User.objects.create_user(email='estudiante@example.com', username='estudiante', password='x')
+    course = Course.objects.create(title='Energía solar', author=author, max_final_attempts=max_final_attempts)
+    CourseEnrollment.objects.create(user=student, course=course)
+    return course, student
+
+
+class FinalAttemptLimitTests(TestCase):
+    def setUp(self):
+        self.course, self.student = create_course(max_final_attempts=2)
+        self.service = AttemptService()
+
+    def finish(self, attempt):
+        attempt.mark_submitted(score=10, passed=False)
+
+    def test_in_progress_attempt_is_reused(self):
+        first = self.service.start_final_attempt(self.student, self.course)
+        self.assertEqual(self.service.start_final_attempt(self.student, self.course).pk, first.pk)
+
+    def test_limit_is_checked_before_creating_the_attempt(self):
+        self.finish(self.service.start_final_attempt(self.student, self.course))
+        self.finish(self.service.start_final_attempt(self.student, self.course))
+        with self.assertRaises(AttemptLimitReached):
+            self.service.start_final_attempt(self.student, self.course)
+        self.assertEqual(FinalExamAttempt.objects.filter(user=self.student).count(), 2)
+
+    def test_attempt_created_while_waiting_for_the_lock_counts(self):
+        self.finish(self.service.start_final_attempt(self.student, self.course))
+        lock = AttemptService._lock_enrollment
+
+        def lock_after_other_request(user, course_id):
+            # Otra petición crea y termina su intento mientras esta espera el bloqueo
+            other = FinalExamAttempt.objects.create(user=user, course_id=course_id, attempt_number=2)
+            self.finish(other)
+            return lock(user, course_id)
+
+        with mock.patch.object(AttemptService, '_lock_enrollment', side_effect=lock_after_other_request):
+            with self.assertRaises(AttemptLimitReached):
+                self.service.start_final_attempt(self.student, self.course)
+        self.assertFalse(FinalExamAttempt.objects.filter(user=self.student, attempt_number=3).exists())
+
+    def test_starting_an_attempt_does_not_enroll(self):
+        outsider = get_user_model().objects.create_user(email='otro@example.com', username='otro', password='x')
+        with self.assertRaises(NotEnrolled):
+            self.service.start_final_attempt(outsider, self.course)
+        self.assertFalse(CourseEnrollment.objects.filter(user=outsider).exists())
+
+
+
+class FinalExamAnalyticsTests(TestCase):
+    def test_submitted_final_exams_feed_item_statistics(self):
+        course, student = create_course(max_final_attempts=0)
+        question = FinalExamQuestion.objects.create(course=course, text='El panel solar convierte...')
+        right = FinalExamOption.objects.create(question=question, text='Luz en electricidad', is_correct=True)
+        FinalExamOption.objects.create(question=question, text='Electricidad en calor', is_correct=False)
+
+        service = AttemptService()
+        attempt = service.start_final_attempt(student, course)
+        result = service.submit_final_attempt(attempt.pk, student, {question.pk: [right.pk]})
+        self.assertTrue(result['passed'])
+
+        answer = FinalExamAnswer.objects.get(attempt=attempt, question=question)
+        self.assertTrue(answer.is_correct)
+        self.assertEqual(list(answer.selected_options.values_list('pk', flat=True)), [right.pk])
+        resubmitted = service.submit_final_attempt(attempt.pk, student, {question.pk: [right.pk]})
+        self.assertEqual(resubmitted['details'][0]['selected'], [right.pk])
+
+        CourseAnalyticsService().rebuild()
+        report = CourseAnalyticsService().course_report(course)
+        final_items = [item for item in report['questions'] if item['kind'] == 'final']
+        self.assertEqual(len(final_items), 1)
+        self.assertEqual(final_items[0]['answers_count'], 1)
+        selected = {option['option_id']: option['selected_count'] for option in final_items[0]['options']}
+        self.assertEqual(selected[right.pk], 1)
+
+@skipUnlessDBFeature('has_select_for_update')
+class ConcurrentFinalAttemptTests(TransactionTestCase):
+    """Requiere una base con bloqueo de filas (PostgreSQL); SQLite no ejecuta esta prueba."""
+
+    def test_concurrent_starts_respect_the_limit(self):
+        course, student = create_course(max_final_attempts=1)
+        barrier = threading.Barrier(5)
+        results, errors = [], []
+
+        def start():
+            try:
+                barrier.wait()
+                attempt = AttemptService().start_final_attempt(student, course)
+                attempt.mark_submitted(score=10, passed=False)
+                results.append(attempt.pk)
+            except AttemptLimitReached:
+                errors.append('limit')
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=start) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(FinalExamAttempt.objects.filter(user=student, course=course).count(), 1)
+        self.assertEqual(len(results) + len(errors), 5)
+
+
+class CertificateVerifyAPITests(TestCase):
+    def setUp(self):
+        cache.clear()
+        course, student = create_course()
+        CourseCertificate.objects.create(user=student, course=course, certificate_code='CUR-TEST', final_score=90)
+        self.url = reverse('api:certificate_verify_api', args=['CUR-TEST'])
+
+    def test_response_must_be_revalidated(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('no-cache', response['Cache-Control'])
+        self.assertNotIn('max-age', response['Cache-Control'])
+
+    def test_matching_etags_return_not_modified(self):
+        etag = self.client.get(self.url)['ETag']
+        for header in (etag, f'W/{etag}', f'"otro", {etag}', '*'):
+            with self.subTest(header=header):
+                response = self.client.get(self.url, HTTP_IF_NONE_MATCH=header)
+                self.assertEqual(response.status_code, 304)
+                self.assertEqual(response['ETag'], etag)
+
+    def test_stale_etag_returns_body(self):
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH='"viejo"')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['data']['code'], 'CUR-TEST')
+
+
+class CoursePackageValidationTests(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.importer = CoursePackageImporter(directory.name)
+
+    def validation_errors(self, module):
+        data = {
+            'format_version': 1,
+            'course': {'slug': 'solar', 'title': 'Solar', 'description': 'Curso'},
+            'modules': [{'order': 1, 'title': 'Introducción', **module}],
+        }
+        with self.assertRaises(CoursePackageError) as context:
+            self.importer.validate(data)
+        return context.exception.errors
+
+    def test_options_must_be_a_list_of_objects(self):
+        errors = self.validation_errors({'questions': [{'text': '¿Qué es?', 'options': ['Sol', {'text': 'Luna', 'is_correct': True}]}]})
+        self.assertIn('modules[0].questions[0].options[0]: debe ser un objeto', errors)
+
+        errors = self.validation_errors({'questions': [{'text': '¿Qué es?', 'options': 'Sol'}]})
+        self.assertIn('modules[0].questions[0].options: debe ser una lista', errors)
+
+    def test_slides_must_be_a_list(self):
+        errors = self.validation_errors({'slides': {'title': 'Portada'}})
+        self.assertEqual(errors, ['modules[0].slides: debe ser una lista'])
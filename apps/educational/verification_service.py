@@ -0,0 +1,75 @@
+import hashlib
+import json
+
+from django.conf import settings
+from django.core import signing
+from django.core.cache import cache
+from django.utils.crypto import constant_time_compare
+
+from apps.educational.course_models import CourseCertificate
+
+# Los códigos inexistentes también se cachean (por menos tiempo) para que los
+# scripts que prueban códigos al azar tampoco lleguen a la base de datos.
+NOT_FOUND_CACHE_TIMEOUT = 60 * 5
+
+
+class CertificateVerificationService:
+    """Servicio de verificación pública de certificados con respuestas cacheadas.
+
+    Cada respuesta se serializa una sola vez, se firma con la SECRET_KEY del
+    proyecto y se guarda en caché junto con su ETag. Las consultas repetidas
+    se responden sin tocar la base de datos hasta que el certificado cambia.
+    """
+
+    cache_prefix = 'educational:cert-verify'
+    signing_salt = 'educational.certificate-verification'
+
+    def cache_key(self, code: str) -> str:
+        return f'{self.cache_prefix}:{code.strip().upper()}'
+
+    def lookup(self, code: str):
+        """Retorna `{'found', 'body', 'etag'}` para el código indicado."""
+        key = self.cache_key(code)
+        entry = cache.get(key)
+        if entry is not None:
+            return entry
+
+        certificate = (
+            CourseCertificate.objects.select_related('user', 'course')
+            .filter(certificate_code=code.strip().upper())
+            .first()
+        )
+        if certificate is None:
+            entry = {'found': False, 'body': None, 'etag': None}
+            cache.set(key, entry, NOT_FOUND_CACHE_TIMEOUT)
+            return entry
+
+        entry = self.build_entry(certificate)
+        cache.set(key, entry, settings.CERTIFICATE_VERIFICATION_CACHE_TIMEOUT)
+        return entry
+
+    def build_entry(self, certificate: CourseCertificate) -> dict:
+        payload = {
+            'code': certificate.certificate_code,
+            'course': certificate.course.title,
+            'holder': certificate.user.full_name.strip() or certificate.user.email,
+            'score': certificate.final_score,
+            'issued_at': certificate.issued_at.date().isoformat(),
+            'revoked': certificate.is_revoked,
+            'valid': certificate.is_valid,
+        }
+        canonical = json.dumps(payload, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+        signature = signing.Signer(salt=self.signing_salt).signature(canonical)
+        body = json.dumps({'data': payload, 'signature': signature}, separators=(',', ':'), ensure_ascii=False)
+        etag = '"%s"' % hashlib.sha1(body.encode('utf-8')).hexdigest()
+        return {'found': True, 'body': body, 'etag': etag}
+
+    def verify_signature(self, payload: dict, signature: str) -> bool:
+        canonical = json.dumps(payload, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+        expected = signing.Signer(salt=self.signing_salt).signature(canonical)
+        return constant_time_compare(expected, signature)
+
+    def invalidate(self, *codes):
+        keys = [self.cache_key(code) for code in codes if code]
+        if keys:
+            cache.delete_many(keys)
@@ -1,5 +1,12 @@
-from django.shortcuts import render
-from django.views.generic import TemplateView
+from django.shortcuts import render, get_object_or_404
+from django.http import HttpResponse, JsonResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.views.generic import TemplateView, View
+
+from .analytics_service import CourseAnalyticsService
+from .course_models import Course
+from .permissions import EditorRequiredMixin
+from .verification_service import CertificateVerificationService
 
 # Create your views here.
 
@@ -14,3 +21,37 @@ class CategoryView(TemplateView):
 class ResourceDetailView(TemplateView):
     """Vista de detalle del recurso"""
     template_name = 'educational/resource_detail.html'
+
+
+class CertificateVerifyAPIView(View):
+    """Verificación pública de certificados en JSON firmado.
+
+    Responde desde caché con ETag; los clientes que envían If-None-Match
+    reciben 304 sin cuerpo. `no-cache` obliga a revalidar en cada consulta para
+    que un certificado revocado deje de verse válido de inmediato.
+    """
+
+    def get(self, request, code):
+        entry = CertificateVerificationService().lookup(code)
+        if not entry['found']:
+            return JsonResponse({'error': 'Certificado no encontrado.', 'code': code}, status=404)
+
+        response = get_conditional_response(request, etag=entry['etag'])
+        if response is None:
+            response = HttpResponse(entry['body'], content_type='application/json')
+        response['ETag'] = entry['etag']
+        patch_cache_control(response, no_cache=True, public=True)
+        return response
+
+
+class CourseAnalyticsAPIView(EditorRequiredMixin, View):
+    """Análisis de ítems y tasas de aprobación de un curso para editores.
+
+    Solo lee las tablas resumen que llena la tarea nocturna; nunca agrega
+    sobre las tablas de intentos en vivo.
+    """
+
+    def get(self, request, slug):
+        course = get_object_or_404(Course, slug=slug)
+        report = CourseAnalyticsService().course_report(course)
+        return JsonResponse({'course': course.slug, **report})
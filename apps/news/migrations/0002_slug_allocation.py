@@ -0,0 +1,18 @@
+# Generated by Django 5.0.6 on 2026-10-19 11:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='newspost',
+            name='slug',
+            field=models.SlugField(blank=True, help_text='Se genera a partir del título si se deja vacío', unique=True, verbose_name='Slug'),
+        ),
+    ]
@@ -1,5 +1,6 @@
 from django.db import models
 from apps.core.models import BaseModel
+from apps.core.slugs import UniqueSlugMixin
 from apps.accounts.models import User
 
 class NewsCategory(BaseModel):
@@ -17,7 +18,7 @@ class NewsCategory(BaseModel):
         return self.name
 
 
-class NewsPost(BaseModel):
+class NewsPost(UniqueSlugMixin, BaseModel):
     """Modelo para publicaciones de noticias"""
     
     STATUS_CHOICES = [
@@ -27,7 +28,7 @@ class NewsPost(BaseModel):
     ]
     
     title = models.CharField(max_length=200, verbose_name='Título')
-    slug = models.SlugField(unique=True, verbose_name='Slug')
+    slug = models.SlugField(unique=True, blank=True, verbose_name='Slug', help_text='Se genera a partir del título si se deja vacío')
     category = models.ForeignKey(NewsCategory, on_delete=models.CASCADE, verbose_name='Categoría')
     author = models.ForeignKey(User, on_delete=models.CASCADE, verbose_name='Autor')
     excerpt = models.TextField(max_length=300, verbose_name='Resumen')
@@ -44,6 +45,8 @@ class NewsPost(BaseModel):
     views_count = models.IntegerField(default=0, verbose_name='Número de vistas')
     tags = models.CharField(max_length=500, blank=True, verbose_name='Etiquetas (separadas por comas)')
     
+    slug_default = 'noticia'
+
     class Meta:
         verbose_name = 'Noticia'
         verbose_name_plural = 'Noticias'
@@ -1,12 +1,13 @@
 from django.contrib import admin
-from .models import LegalFramework, ScrapingSource, RegulatoryCategory, RegulatoryDocument
+from .models import LegalFramework, LegalFrameworkVersion, ScrapingSource, ScrapingRun, ScrapingRunItem, RegulatoryCategory, RegulatoryDocument, RegulatoryTag
 
 @admin.register(LegalFramework)
 class LegalFrameworkAdmin(admin.ModelAdmin):
-    list_display = ['title', 'document_type', 'document_number', 'year', 'issuing_entity', 'is_active', 'last_scraped']
+    list_display = ['title', 'document_type', 'document_number', 'year', 'issuing_entity', 'is_active', 'last_scraped', 'content_changed_at']
     list_filter = ['document_type', 'year', 'issuing_entity', 'is_active', 'created_at']
     search_fields = ['title', 'document_number', 'summary', 'issuing_entity']
-    readonly_fields = ['content_scraped', 'last_scraped', 'created_at', 'updated_at']
+    readonly_fields = ['content_scraped', 'last_scraped', 'content_changed_at', 'created_at', 'updated_at']
+    filter_horizontal = ['tags']
     
     fieldsets = (
         ('Información Básica', {
@@ -16,14 +17,17 @@ class LegalFrameworkAdmin(admin.ModelAdmin):
             'fields': ('summary', 'main_objective', 'benefits_companies', 'benefits_citizens')
         }),
         ('Enlaces y Fuentes', {
-            'fields': ('official_url', 'content_scraped', 'last_scraped')
+            'fields': ('official_url', 'content_scraped', 'last_scraped', 'content_changed_at')
+        }),
+        ('Clasificación', {
+            'fields': ('tags',)
         }),
         ('Estado', {
             'fields': ('is_active', 'created_at', 'updated_at')
         })
     )
     
-    actions = ['activate_items', 'deactivate_items']
+    actions = ['activate_items', 'deactivate_items', 'generate_ai_summaries']
     
     def activate_items(self, request, queryset):
         queryset.update(is_active=True)
@@ -35,12 +39,46 @@ class LegalFrameworkAdmin(admin.ModelAdmin):
         self.message_user(request, f"{queryset.count()} elementos desactivados.")
     deactivate_items.short_description = "Desactivar elementos seleccionados"
 
+    def generate_ai_summaries(self, request, queryset):
+        from .tasks import generate_framework_summary_task
+
+        ids = list(queryset.values_list('pk', flat=True))
+        for framework_id in ids:
+            generate_framework_summary_task.delay(framework_id)
+        self.message_user(request, f"{len(ids)} marcos legales en cola para generar contenido con IA.")
+    generate_ai_summaries.short_description = "Generar resumen y beneficios con IA (solo campos vacíos)"
+
+@admin.register(LegalFrameworkVersion)
+class LegalFrameworkVersionAdmin(admin.ModelAdmin):
+    list_display = ['framework', 'number', 'created_at', 'size', 'added_blocks', 'removed_blocks']
+    list_filter = ['created_at']
+    search_fields = ['framework__title', 'framework__document_number']
+    readonly_fields = ['framework', 'number', 'content_hash', 'size', 'added_blocks', 'removed_blocks', 'created_at']
+    exclude = ['chunk_ids']
+
+    def has_add_permission(self, request):
+        return False
+
 @admin.register(ScrapingSource)
 class ScrapingSourceAdmin(admin.ModelAdmin):
     list_display = ['name', 'base_url', 'is_active', 'created_at']
     list_filter = ['is_active', 'created_at']
     search_fields = ['name', 'base_url']
 
+class ScrapingRunItemInline(admin.TabularInline):
+    model = ScrapingRunItem
+    extra = 0
+    can_delete = False
+    fields = ['framework', 'host', 'status', 'attempts', 'content_changed', 'duration_ms', 'error', 'finished_at']
+    readonly_fields = fields
+
+@admin.register(ScrapingRun)
+class ScrapingRunAdmin(admin.ModelAdmin):
+    list_display = ['pk', 'trigger', 'status', 'total', 'succeeded', 'failed', 'started_at', 'finished_at']
+    list_filter = ['status', 'trigger', 'started_at']
+    readonly_fields = ['trigger', 'requested_by', 'status', 'total', 'succeeded', 'failed', 'started_at', 'finished_at']
+    inlines = [ScrapingRunItemInline]
+
 @admin.register(RegulatoryCategory)
 class RegulatoryCategoryAdmin(admin.ModelAdmin):
     list_display = ['name', 'is_active', 'created_at']
@@ -51,4 +89,12 @@ class RegulatoryCategoryAdmin(admin.ModelAdmin):
 class RegulatoryDocumentAdmin(admin.ModelAdmin):
     list_display = ['title', 'category', 'document_type', 'is_active', 'created_at']
     list_filter = ['category', 'document_type', 'is_active', 'created_at']
+    # Las etiquetas normalizadas se sincronizan desde el campo de texto al guardar
+    exclude = ['normalized_tags']
     search_fields = ['title', 'description']
+
+@admin.register(RegulatoryTag)
+class RegulatoryTagAdmin(admin.ModelAdmin):
+    list_display = ['name', 'slug']
+    search_fields = ['name']
+    prepopulated_fields = {'slug': ('name',)}
@@ -0,0 +1,223 @@
+"""
+Generación de resúmenes, objetivos y beneficios de normas con IA
+
+El texto fuente sale del contenido ya scrapeado cuando existe, y solo se descarga
+la URL oficial para normas nuevas. Cada resultado se guarda en `AISummary` bajo
+una clave derivada del texto, la norma, la versión del prompt y el modelo, así
+que repetir la generación sobre contenido sin cambios no tiene costo.
+
+El proveedor es intercambiable mediante `AI_SUMMARY_CLIENT`: cualquier clase con
+`model_name` y `complete(system_prompt, user_prompt) -> str`. `StubClient`
+responde de forma determinista sin red, útil en desarrollo y pruebas.
+"""
+import hashlib
+import json
+import logging
+import re
+
+from django.conf import settings
+from django.db import IntegrityError
+from django.db.models import F
+from django.utils.module_loading import import_string
+from lxml import html
+
+from .extraction import normalize_text
+from .models import AISummary
+
+logger = logging.getLogger(__name__)
+
+# Cambiar la versión invalida todos los resultados cacheados con el prompt anterior
+PROMPT_VERSION = '2024-06-v1'
+REQUIRED_KEYS = ('summary', 'main_objective', 'benefits_companies', 'benefits_citizens')
+
+SYSTEM_PROMPT = (
+    "Eres un analista legal colombiano. Elaboras resúmenes claros de instrumentos normativos y detallas sus objetivos "
+    "y beneficios para empresas y ciudadanos. Siempre respondes en español neutro, tono profesional y en formato JSON."
+)
+
+USER_PROMPT = (
+    "Responde exclusivamente con un objeto JSON siguiendo exactamente esta estructura: "
+    "{{\"summary\": \"...\", \"main_objective\": \"...\", \"benefits_companies\": \"...\", \"benefits_citizens\": \"...\"}}. "
+    "No agregues texto adicional fuera del JSON. Utiliza el texto oficial para redactar cada campo con máximo 3 párrafos por elemento. "
+    "Texto fuente:\n\n"
+    "Tipo de documento: {document_type}\nNúmero: {document_number}\nAño: {year}\n\n{content_text}"
+)
+
+
+class AIContentError(Exception):
+    """El proveedor falló o devolvió una respuesta inutilizable."""
+
+
+class OpenAIClient:
+    """Cliente de producción sobre la API de OpenAI."""
+
+    def __init__(self):
+        if not settings.OPENAI_API_KEY:
+            raise AIContentError('No hay una API Key configurada para la generación con IA.')
+        from openai import OpenAI
+
+        self.client = OpenAI(api_key=settings.OPENAI_API_KEY)
+        self.model_name = settings.AI_SUMMARY_MODEL
+
+    def complete(self, system_prompt, user_prompt):
+        response = self.client.responses.create(
+            model=self.model_name,
+            temperature=0.2,
+            input=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt},
+            ],
+        )
+        return (response.output_text or '').strip()
+
+
+class StubClient:
+    """Modelo local determinista: arma los campos con las primeras oraciones del texto."""
+
+    model_name = 'stub'
+
+    def complete(self, system_prompt, user_prompt):
+        source = user_prompt.split('\n\n', 2)[-1]
+        sentences = [sentence.strip() for sentence in re.split(r'(?<=[.;:])\s+', source) if len(sentence.strip()) > 20]
+        summary = ' '.join(sentences[:3]) or source[:300]
+        return json.dumps({
+            'summary': summary,
+            'main_objective': sentences[0] if sentences else summary,
+            'benefits_companies': ' '.join(sentences[3:5]) or summary,
+            'benefits_citizens': ' '.join(sentences[5:7]) or summary,
+        }, ensure_ascii=False)
+
+
+def get_client():
+    return import_string(settings.AI_SUMMARY_CLIENT)()
+
+
+def html_to_text(content_html):
+    """Texto plano del HTML scrapeado, recortado al máximo que se envía al modelo."""
+    if not content_html:
+        return ''
+    text = normalize_text(html.fromstring(f'<div>{content_html}</div>').text_content())
+    return text[:settings.AI_SUMMARY_MAX_CHARS]
+
+
+def parse_output(ai_output):
+    """Interpreta la respuesta del modelo, tolerando texto alrededor del JSON."""
+    try:
+        data = json.loads(ai_output)
+    except json.JSONDecodeError:
+        match = re.search(r"\{.*\}", ai_output, re.DOTALL)
+        if not match:
+            logger.error("IA response could not be parsed as JSON: %s", ai_output[:300])
+            raise AIContentError('No fue posible interpretar la respuesta de la IA. Inténtalo de nuevo.')
+        try:
+            data = json.loads(match.group(0))
+        except json.JSONDecodeError:
+            logger.error("Parsed JSON fragment still invalid: %s", match.group(0)[:300])
+            raise AIContentError('No fue posible interpretar la respuesta de la IA. Inténtalo de nuevo.')
+
+    if not isinstance(data, dict) or not set(REQUIRED_KEYS).issubset(data.keys()):
+        raise AIContentError('La respuesta de la IA no contiene todos los campos requeridos.')
+    return {key: data[key] for key in REQUIRED_KEYS}
+
+
+class AISummaryService:
+    """Genera contenido con IA reutilizando resultados previos por clave de contenido."""
+
+    def __init__(self, client=None):
+        self._client = client
+
+    @property
+    def client(self):
+        if self._client is None:
+            self._client = get_client()
+        return self._client
+
+    @property
+    def model_name(self):
+        if self._client is not None:
+            return self._client.model_name
+        if settings.AI_SUMMARY_CLIENT.endswith('StubClient'):
+            return StubClient.model_name
+        return settings.AI_SUMMARY_MODEL
+
+    def cache_key(self, content_text, document_type, document_number, year):
+        source = '\x1f'.join([
+            PROMPT_VERSION, self.model_name, str(document_type), str(document_number), str(year), content_text,
+        ])
+        return hashlib.sha256(source.encode('utf-8')).hexdigest()
+
+    def cached(self, content_text, document_type, document_number, year):
+        """Resultado ya generado para este contenido, o None."""
+        key = self.cache_key(content_text, document_type, document_number, year)
+        entry = AISummary.objects.filter(cache_key=key).only('pk', 'result').first()
+        if entry is None:
+            return None
+        AISummary.objects.filter(pk=entry.pk).update(hits=F('hits') + 1)
+        return entry.result
+
+    def generate(self, content_text, document_type, document_number, year):
+        """Retorna `(resultado, desde_cache)`; solo llama al proveedor si no hay resultado guardado."""
+        if not content_text:
+            raise AIContentError('No se pudo obtener el contenido oficial para generar texto. Verifica la URL.')
+
+        result = self.cached(content_text, document_type, document_number, year)
+        if result is not None:
+            return result, True
+
+        user_prompt = USER_PROMPT.format(
+            document_type=document_type,
+            document_number=document_number,
+            year=year,
+            content_text=content_text,
+        )
+        try:
+            ai_output = self.client.complete(SYSTEM_PROMPT, user_prompt)
+        except AIContentError:
+            raise
+        except Exception as exc:  # noqa: broad-except
+            logger.exception("AI provider error when generating legal summary")
+            raise AIContentError(f'La API de IA devolvió un error: {exc}') from exc
+
+        result = parse_output(ai_output)
+        try:
+            AISummary.objects.create(
+                cache_key=self.cache_key(content_text, document_type, document_number, year),
+                prompt_version=PROMPT_VERSION,
+                model_name=self.model_name,
+                result=result,
+            )
+        except IntegrityError:
+            # Otro worker generó la misma clave al mismo tiempo
+            pass
+        return result, False
+
+    def source_text(self, official_url, document_number, year, framework=None):
+        """Texto de la norma: el contenido guardado si corresponde a la misma URL,
+        o una descarga de la fuente oficial en caso contrario."""
+        if framework is not None and framework.content_scraped and framework.official_url == official_url:
+            return html_to_text(framework.content_scraped)
+
+        from .services import LegalScrapingService
+
+        scraped = LegalScrapingService().scrape_norma_oficial(official_url, number=str(document_number), year=year)
+        return html_to_text(scraped.get('content_scraped') or '')
+
+    def generate_for_framework(self, framework, overwrite=False):
+        """Genera y aplica el contenido de un marco legal. Retorna `(campos, desde_cache)`."""
+        content_text = self.source_text(framework.official_url, framework.document_number, framework.year, framework)
+        result, from_cache = self.generate(
+            content_text, framework.document_type, framework.document_number, framework.year,
+        )
+        return self.apply(framework, result, overwrite=overwrite), from_cache
+
+    def apply(self, framework, result, overwrite=False):
+        """Copia el resultado al marco legal. Sin `overwrite` solo llena campos vacíos."""
+        fields = [
+            key for key in REQUIRED_KEYS
+            if result.get(key) and (overwrite or not getattr(framework, key))
+        ]
+        for key in fields:
+            setattr(framework, key, result[key])
+        if fields:
+            framework.save(update_fields=fields + ['updated_at'])
+        return fields
@@ -1,6 +1,26 @@
 from django.urls import path
 
+from . import views
+
 # API URLs for regulatory app
 urlpatterns = [
-    # API endpoints will be added here
+    path('frameworks/<int:pk>/sections/', views.NormSectionListAPIView.as_view(), name='regulatory_section_list'),
+    path(
+        'frameworks/<int:pk>/sections/<slug:anchor>/',
+        views.NormSectionDetailAPIView.as_view(),
+        name='regulatory_section_detail'
+    ),
+    path('frameworks/<int:pk>/versions/', views.LegalFrameworkVersionListAPIView.as_view(), name='regulatory_version_list'),
+    path(
+        'frameworks/<int:pk>/versions/compare/',
+        views.LegalFrameworkVersionCompareAPIView.as_view(),
+        name='regulatory_version_compare'
+    ),
+    path(
+        'frameworks/<int:pk>/versions/<int:number>/',
+        views.LegalFrameworkVersionDetailAPIView.as_view(),
+        name='regulatory_version_detail'
+    ),
+    path('documents/facets/', views.RegulatoryDocumentFacetAPIView.as_view(), name='regulatory_document_facets'),
+    path('sections/search/', views.NormSectionSearchAPIView.as_view(), name='regulatory_section_search'),
 ]
@@ -5,3 +5,6 @@ class RegulatoryConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.regulatory'
     verbose_name = 'Repositorio Normativo'
+
+    def ready(self):
+        import apps.regulatory.signals
@@ -0,0 +1,38 @@
+"""
+Caché de las páginas públicas del marco regulatorio
+
+Los fragmentos del detalle se identifican con `updated_at` del marco legal y los
+del listado con una versión global que cambia con cualquier edición o scraping.
+Los conteos de facetas del buscador se cachean con esa misma versión, así que
+se invalidan en los mismos eventos y el tráfico público casi no llega a la
+base de datos.
+"""
+import hashlib
+import time
+
+from django.core.cache import cache
+
+FRAMEWORKS_VERSION_KEY = 'regulatory:frameworks-version'
+FRAGMENT_TIMEOUT = 60 * 60 * 24
+FACETS_TIMEOUT = 60 * 60 * 6
+
+
+def frameworks_version():
+    """Identificador del estado actual del listado de marcos legales."""
+    return cache.get_or_set(FRAMEWORKS_VERSION_KEY, lambda: str(time.time_ns()), None)
+
+
+def facet_counts(params, compute):
+    """Conteos de facetas de una búsqueda, cacheados por parámetros y versión del listado.
+
+    Las combinaciones de filtros más consultadas se sirven desde caché y se
+    invalidan junto con el listado.
+    """
+    digest = hashlib.sha1(repr(sorted(params.items())).encode('utf-8')).hexdigest()
+    key = f'regulatory:facet-counts:{frameworks_version()}:{digest}'
+    return cache.get_or_set(key, compute, FACETS_TIMEOUT)
+
+
+def invalidate_frameworks():
+    """Invalida el listado y los conteos de facetas tras guardar, scrapear o eliminar un marco legal."""
+    cache.delete(FRAMEWORKS_VERSION_KEY)
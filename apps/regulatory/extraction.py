@@ -0,0 +1,219 @@
+"""
+Extracción de normas en una sola pasada con lxml
+
+Reemplaza la cadena BeautifulSoup -> decompose -> selectores -> bleach -> ASCII
+por un único recorrido del árbol de lxml: se localiza el contenedor con XPath
+compilado y se serializa aplicando al vuelo la misma política de etiquetas,
+atributos y protocolos que `LegalFramework.clean_content`. El resultado ya está
+sanitizado y no necesita pasar de nuevo por `bleach`.
+"""
+import re
+import unicodedata
+from functools import lru_cache
+from html import escape
+
+from lxml import etree, html
+
+from .models import CONTENT_ALLOWED_ATTRIBUTES, CONTENT_ALLOWED_PROTOCOLS, CONTENT_ALLOWED_TAGS
+
+# Se eliminan junto con su contenido; el resto de etiquetas no permitidas se desenvuelven
+DROPPED_TAGS = frozenset(['script', 'style', 'nav', 'footer', 'header', 'iframe', 'noscript', 'template'])
+VOID_TAGS = frozenset(['br'])
+ALLOWED_TAGS = frozenset(CONTENT_ALLOWED_TAGS)
+ALLOWED_ATTRIBUTES = {tag: frozenset(attrs) for tag, attrs in CONTENT_ALLOWED_ATTRIBUTES.items()}
+ALLOWED_PROTOCOLS = frozenset(CONTENT_ALLOWED_PROTOCOLS)
+
+# Contenedores conocidos del Gestor Normativo de Función Pública, en orden de preferencia
+DEFAULT_CONTAINERS = (
+    'div.descripcion-contenido',
+    'div.contenido, div#contenido, .norma-contenido, .documento, .texto-norma',
+)
+
+TEXT_REPLACEMENTS = {
+    '\u00a0': ' ',        # Non-breaking space
+    '\u2013': '-',        # En dash
+    '\u2014': '-',        # Em dash
+    '\u201c': '"',        # Left double quotation mark
+    '\u201d': '"',        # Right double quotation mark
+    '\u2018': "'",        # Left single quotation mark
+    '\u2019': "'",        # Right single quotation mark
+    '\ufeff': '',         # Zero width no-break space
+}
+TEXT_TABLE = str.maketrans(TEXT_REPLACEMENTS)
+WHITESPACE_RE = re.compile(r'\s+')
+SCHEME_RE = re.compile(r'^([a-zA-Z][a-zA-Z0-9+.-]*):')
+# Caracteres que el navegador ignora dentro de una URL (como hace el sanitizador de bleach)
+URL_IGNORED_RE = re.compile('[\x00-\x20\x7f-\xa0\u1680\u180e\u2000-\u2029\u205f\u3000]+')
+META_CHARSET_RE = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?([\w.:-]+)', re.IGNORECASE)
+HEADER_CHARSET_RE = re.compile(r'charset\s*=\s*["\']?([\w.:-]+)', re.IGNORECASE)
+SIMPLE_SELECTOR_RE = re.compile(r'^([a-zA-Z][a-zA-Z0-9-]*)?((?:[.#][\w-]+)*)$')
+
+
+def normalize_text(text):
+    """Reemplaza caracteres tipográficos problemáticos y colapsa espacios."""
+    if not text:
+        return text
+    text = text.replace('\u00c2\u00a0', ' ').replace('\u00c2\u00ad', '')
+    return WHITESPACE_RE.sub(' ', text.translate(TEXT_TABLE)).strip()
+
+
+@lru_cache(maxsize=64)
+def compile_selector(selector):
+    """Traduce un selector CSS simple (etiqueta, .clase, #id, descendientes y
+    grupos separados por coma) a un `etree.XPath` compilado.
+
+    Lanza ValueError si el selector usa sintaxis no soportada.
+    """
+    groups = []
+    for group in selector.split(','):
+        steps = []
+        for part in group.split():
+            match = SIMPLE_SELECTOR_RE.match(part)
+            if not match:
+                raise ValueError(f'Selector no soportado: {part}')
+            tag, qualifiers = match.group(1) or '*', match.group(2)
+            predicates = []
+            for kind, name in re.findall(r'([.#])([\w-]+)', qualifiers):
+                if kind == '#':
+                    predicates.append(f'@id="{name}"')
+                else:
+                    predicates.append(f'contains(concat(" ", normalize-space(@class), " "), " {name} ")')
+            steps.append(tag + ''.join(f'[{predicate}]' for predicate in predicates))
+        if steps:
+            groups.append('//' + '//'.join(steps))
+    if not groups:
+        raise ValueError('Selector vacío')
+    return etree.XPath(' | '.join(groups))
+
+
+def _allowed_href(value):
+    # El esquema se evalúa sobre el valor tal como lo verá el navegador tras `to_ascii`:
+    # "java\tscript:" o "ｊａｖａｓｃｒｉｐｔ:" terminan siendo "javascript:"
+    match = SCHEME_RE.match(URL_IGNORED_RE.sub('', to_ascii(value)))
+    return match is None or match.group(1).lower() in ALLOWED_PROTOCOLS
+
+
+def _open_tag(element):
+    tag = element.tag
+    allowed = ALLOWED_ATTRIBUTES.get(tag)
+    if not allowed:
+        return f'<{tag}>'
+    parts = [tag]
+    for name, value in element.attrib.items():
+        if name not in allowed:
+            continue
+        if name == 'href' and not _allowed_href(value):
+            continue
+        parts.append(f'{name}="{escape(value, quote=True)}"')
+    return f'<{" ".join(parts)}>'
+
+
+def sanitize_element(container):
+    """Serializa el contenido interno de `container` aplicando la política de sanitización."""
+    out = []
+    append = out.append
+    if container.text:
+        append(escape(container.text, quote=False))
+
+    walker = etree.iterwalk(container, events=('start', 'end'))
+    for event, element in walker:
+        if element is container:
+            continue
+        tag = element.tag
+        if not isinstance(tag, str):
+            # Comentarios e instrucciones de procesamiento: solo se conserva el texto que les sigue
+            if event == 'end' and element.tail:
+                append(escape(element.tail, quote=False))
+            continue
+        tag = tag.lower()
+        if event == 'start':
+            if tag in DROPPED_TAGS:
+                walker.skip_subtree()
+                if element.tail:
+                    append(escape(element.tail, quote=False))
+                continue
+            if tag in ALLOWED_TAGS:
+                append(_open_tag(element))
+            if element.text:
+                append(escape(element.text, quote=False))
+        else:
+            if tag in DROPPED_TAGS:
+                continue
+            if tag in ALLOWED_TAGS and tag not in VOID_TAGS:
+                append(f'</{tag}>')
+            if element.tail:
+                append(escape(element.tail, quote=False))
+    return ''.join(out).strip()
+
+
+def _fallback_text(root, marker):
+    """Ensambla texto plano cuando la página no tiene un contenedor conocido."""
+    sections = []
+    for element in compile_selector('.articulo')(root):
+        text = normalize_text(' '.join(element.itertext()))
+        if len(text) > 50 and marker in text:
+            sections.append(text)
+
+    if not sections:
+        all_text = normalize_text(' '.join(root.itertext()))
+        lowered = all_text.lower()
+        if marker in all_text and ('renovable' in lowered or 'energía' in lowered):
+            for paragraph in root.iter('p'):
+                text = normalize_text(' '.join(paragraph.itertext()))
+                if len(text) > 100 and (marker in text or 'renovable' in text.lower()):
+                    sections.append(text)
+    return escape('\n\n'.join(sections), quote=False) if sections else None
+
+
+def charset_from_content_type(value):
+    """Charset declarado en una cabecera Content-Type, o '' si no trae ninguno."""
+    match = HEADER_CHARSET_RE.search(value or '')
+    return match.group(1) if match else ''
+
+
+def decode_html(body, encoding=''):
+    """Decodifica el HTML con el charset de la respuesta, el de su `<meta>` o UTF-8.
+
+    Los bytes inválidos se reemplazan en lugar de abortar la extracción.
+    """
+    if isinstance(body, str):
+        return body
+    if not encoding:
+        match = META_CHARSET_RE.search(body[:4096])
+        encoding = match.group(1).decode('ascii') if match else 'utf-8'
+    try:
+        return body.decode(encoding, errors='replace')
+    except LookupError:
+        return body.decode('utf-8', errors='replace')
+
+
+def extract_norm_html(body, content_selector='', marker='1715', encoding=''):
+    """Extrae y sanitiza el texto de una norma a partir del HTML crudo (bytes o str).
+
+    `encoding` es el charset de la cabecera Content-Type, si lo hay. Retorna el
+    HTML limpio del contenedor principal, texto plano escapado si solo se
+    encontró contenido disperso, o None si la página no tiene contenido útil.
+    """
+    if not body:
+        return None
+    parser = html.HTMLParser(remove_comments=True)
+    root = html.document_fromstring(decode_html(body, encoding), parser=parser)
+
+    selectors = ((content_selector,) if content_selector else ()) + DEFAULT_CONTAINERS
+    for selector in selectors:
+        try:
+            matches = compile_selector(selector)(root)
+        except (ValueError, etree.XPathError):
+            continue
+        if matches:
+            content = sanitize_element(matches[0])
+            return to_ascii(content) if content else None
+
+    content = _fallback_text(root, marker)
+    return to_ascii(content) if content else None
+
+
+def to_ascii(content):
+    """Restringe el contenido a ASCII como exige la base de datos, transliterando
+    las letras acentuadas (`artículo` -> `articulo`) en lugar de eliminarlas."""
+    return unicodedata.normalize('NFKD', content).encode('ascii', 'ignore').decode('ascii')
@@ -0,0 +1,100 @@
+"""
+Descargas condicionales de páginas oficiales
+
+Por cada URL se guardan el ETag, el Last-Modified y dos hashes: el de la
+respuesta completa (con espacios normalizados) y el del contenido extraído. La
+siguiente descarga envía `If-None-Match` / `If-Modified-Since`; ante un 304 o una
+respuesta idéntica no se vuelve a analizar el HTML. Los hashes nuevos solo se
+confirman cuando el contenido se guardó con éxito, para que un fallo intermedio
+no haga creer que la página ya fue procesada.
+"""
+import hashlib
+import re
+from dataclasses import dataclass
+from typing import Optional
+
+from django.utils import timezone
+
+from .extraction import charset_from_content_type
+from .models import ScrapedPage
+
+WHITESPACE_RE = re.compile(rb'\s+')
+
+
+def content_hash(value):
+    """Hash estable de un texto o bytes con los espacios normalizados."""
+    if isinstance(value, str):
+        value = value.encode('utf-8')
+    return hashlib.sha256(WHITESPACE_RE.sub(b' ', value or b'').strip()).hexdigest()
+
+
+@dataclass
+class FetchResult:
+    page: ScrapedPage
+    modified: bool
+    body: Optional[bytes] = None
+    etag: str = ''
+    last_modified: str = ''
+    body_hash: str = ''
+    encoding: str = ''
+
+    def is_new_content(self, extracted):
+        """Indica si el contenido extraído difiere del último guardado."""
+        return content_hash(extracted) != self.page.content_hash
+
+    def commit(self, extracted=None):
+        """Confirma la descarga. Retorna True si el contenido extraído cambió."""
+        now = timezone.now()
+        page = self.page
+        page.last_checked_at = now
+        changed = False
+        if self.modified:
+            page.etag = self.etag
+            page.last_modified = self.last_modified
+            page.body_hash = self.body_hash
+            if extracted is not None:
+                new_hash = content_hash(extracted)
+                changed = new_hash != page.content_hash
+                if changed:
+                    page.content_hash = new_hash
+                    page.last_changed_at = now
+        page.save()
+        return changed
+
+
+class ConditionalFetcher:
+    """Envuelve una sesión de `requests` con la caché de descargas condicionales."""
+
+    def __init__(self, session):
+        self.session = session
+
+    def fetch(self, url, timeout=15):
+        url_hash = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        page, _ = ScrapedPage.objects.get_or_create(url_hash=url_hash, defaults={'url': url})
+
+        headers = {}
+        if page.etag:
+            headers['If-None-Match'] = page.etag
+        if page.last_modified:
+            headers['If-Modified-Since'] = page.last_modified
+
+        response = self.session.get(url, timeout=timeout, headers=headers)
+        if response.status_code == 304:
+            return FetchResult(page=page, modified=False)
+        response.raise_for_status()
+
+        result = FetchResult(
+            page=page,
+            modified=True,
+            body=response.content,
+            etag=response.headers.get('ETag', ''),
+            last_modified=response.headers.get('Last-Modified', ''),
+            body_hash=content_hash(response.content),
+            encoding=charset_from_content_type(response.headers.get('Content-Type', '')),
+        )
+        if page.body_hash and result.body_hash == page.body_hash:
+            # Mismo cuerpo sin soporte de validadores en el servidor: no hay nada que analizar
+            result.modified = False
+            result.body = None
+            page.etag, page.last_modified = result.etag, result.last_modified
+        return result
@@ -2,14 +2,22 @@
 
 from django import forms
 
-from .models import LegalFramework
+from .models import LegalFramework, RegulatoryTag
 
 
 class LegalFrameworkForm(forms.ModelForm):
     """Formulario para crear y actualizar marcos legales."""
 
+    tag_names = forms.CharField(
+        required=False,
+        label='Etiquetas',
+        help_text='Separadas por comas, por ejemplo: incentivos tributarios, autogeneración',
+    )
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        if self.instance.pk:
+            self.fields['tag_names'].initial = ', '.join(tag.name for tag in self.instance.tags.all())
         base_input = "w-full px-4 py-3 rounded-lg border border-gray-200 focus:outline-none focus:ring-2 focus:ring-solar-yellow focus:border-transparent transition"
         checkbox_input = "h-4 w-4 text-solar-yellow border-gray-300 rounded focus:ring-solar-orange"
 
@@ -38,3 +46,8 @@ class LegalFrameworkForm(forms.ModelForm):
             'benefits_citizens',
             'is_active',
         ]
+
+    def _save_m2m(self):
+        super()._save_m2m()
+        names = [name.strip() for name in self.cleaned_data.get('tag_names', '').split(',') if name.strip()]
+        self.instance.tags.set(RegulatoryTag.from_names(names))
@@ -0,0 +1,99 @@
+"""
+Comando para medir la extracción de normas sobre páginas guardadas
+
+Compara la cadena anterior (BeautifulSoup + bleach + ASCII) con el extractor de
+una sola pasada de `apps.regulatory.extraction` y verifica que ambas produzcan
+el mismo contenido.
+"""
+import re
+import statistics
+import time
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.regulatory.extraction import extract_norm_html, to_ascii
+from apps.regulatory.models import LegalFramework
+
+FIXTURES_PATH = Path(__file__).resolve().parents[2] / 'fixtures' / 'pages'
+ANCHOR_RE = re.compile(r'name="([^"]+)"')
+CONTAINER_RE = re.compile(r'(<div class="descripcion-contenido">)(.*?)(</div>\s*</div>\s*<footer)', re.S)
+
+
+def legacy_extract(body):
+    """Cadena de extracción previa, conservada como referencia del benchmark."""
+    soup = BeautifulSoup(body, 'html.parser')
+    for element in soup(["script", "style", "nav", "footer", "header", "iframe"]):
+        element.decompose()
+    container = soup.select_one('div.descripcion-contenido')
+    if not container:
+        container = soup.select_one('div.contenido, div#contenido, .norma-contenido, .documento, .texto-norma')
+    if not container:
+        return None
+    sanitized = LegalFramework().clean_content(container.decode_contents().strip())
+    return to_ascii(sanitized)
+
+
+def _normalize(content):
+    # html5lib (bleach) inserta <tbody> implícitos que el navegador genera igualmente
+    content = re.sub(r'</?tbody>', '', content or '')
+    return re.sub(r'\s+', ' ', content).replace('> <', '><').strip()
+
+
+class Command(BaseCommand):
+    help = 'Mide la extracción de normas sobre páginas de ejemplo guardadas en fixtures/pages.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='*', help='Archivos HTML a medir (por defecto, fixtures/pages/*.html).')
+        parser.add_argument('--repeat', type=int, default=5, help='Repeticiones por página (default: 5).')
+        parser.add_argument(
+            '--scale',
+            type=int,
+            default=1,
+            help='Replica el articulado N veces para simular normas extensas (default: 1).'
+        )
+        parser.add_argument('--skip-legacy', action='store_true', help='Mide solo el extractor nuevo.')
+
+    def handle(self, *args, **options):
+        paths = [Path(path) for path in options['paths']] or sorted(FIXTURES_PATH.glob('*.html'))
+        if not paths:
+            raise CommandError(f'No hay páginas de ejemplo en {FIXTURES_PATH}')
+
+        for path in paths:
+            body = self._load(path, options['scale'])
+            size_kb = len(body) / 1024
+            current_ms, current = self._measure(extract_norm_html, body, options['repeat'])
+            line = f'{path.name} ({size_kb:,.0f} KB): lxml {current_ms:.1f} ms'
+
+            if not options['skip_legacy']:
+                legacy_ms, legacy = self._measure(legacy_extract, body, options['repeat'])
+                speedup = legacy_ms / current_ms if current_ms else 0
+                same = _normalize(legacy) == _normalize(current)
+                line += f' | anterior {legacy_ms:.1f} ms | x{speedup:.1f} | salida {"idéntica" if same else "DIFERENTE"}'
+            self.stdout.write(line)
+
+    @staticmethod
+    def _load(path, scale):
+        body = path.read_bytes()
+        if scale <= 1:
+            return body
+        text = body.decode('utf-8')
+        match = CONTAINER_RE.search(text)
+        if not match:
+            raise CommandError(f'{path.name}: no se encontró el contenedor descripcion-contenido para escalar.')
+        # Las anclas se renumeran en cada copia: una página real no repite nombres de artículo
+        content = ''.join(
+            ANCHOR_RE.sub(lambda anchor: f'name="{anchor.group(1)}-{copy}"', match.group(2))
+            for copy in range(scale)
+        )
+        return (text[:match.start(2)] + content + text[match.end(2):]).encode('utf-8')
+
+    @staticmethod
+    def _measure(function, body, repeat):
+        timings, result = [], None
+        for _ in range(max(1, repeat)):
+            started = time.perf_counter()
+            result = function(body)
+            timings.append((time.perf_counter() - started) * 1000)
+        return statistics.median(timings), result
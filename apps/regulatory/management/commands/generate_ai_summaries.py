@@ -0,0 +1,53 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from apps.regulatory.ai_content import AIContentError, AISummaryService
+from apps.regulatory.models import LegalFramework
+
+
+class Command(BaseCommand):
+    help = (
+        'Genera con IA el resumen, objetivo y beneficios de los marcos legales. Por defecto solo '
+        'procesa los que tienen campos vacíos y reutiliza resultados previos del mismo contenido.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--id', dest='ids', type=int, action='append', help='Limita la ejecución a estos IDs.')
+        parser.add_argument('--all', action='store_true', help='Incluye marcos legales con todos los campos completos.')
+        parser.add_argument('--overwrite', action='store_true', help='Reemplaza también los campos ya diligenciados.')
+        parser.add_argument('--async', dest='use_async', action='store_true', help='Encola una tarea Celery por marco legal.')
+
+    def handle(self, *args, **options):
+        frameworks = LegalFramework.objects.filter(is_active=True).exclude(official_url='')
+        if options['ids']:
+            frameworks = frameworks.filter(pk__in=options['ids'])
+        elif not options['all'] and not options['overwrite']:
+            frameworks = frameworks.filter(
+                Q(summary='') | Q(main_objective='') | Q(benefits_companies='') | Q(benefits_citizens='')
+            )
+
+        if options['use_async']:
+            from apps.regulatory.tasks import generate_framework_summary_task
+
+            ids = list(frameworks.values_list('pk', flat=True))
+            for framework_id in ids:
+                generate_framework_summary_task.delay(framework_id, overwrite=options['overwrite'])
+            self.stdout.write(self.style.SUCCESS(f'{len(ids)} marcos legales en cola.'))
+            return
+
+        service = AISummaryService()
+        generated = cached = failed = 0
+        for framework in frameworks.iterator(chunk_size=20):
+            try:
+                fields, from_cache = service.generate_for_framework(framework, overwrite=options['overwrite'])
+            except AIContentError as exc:
+                failed += 1
+                self.stderr.write(f'{framework}: {exc}')
+                continue
+            cached += from_cache
+            generated += not from_cache
+            self.stdout.write(f'{framework}: {", ".join(fields) or "sin cambios"}{" (cache)" if from_cache else ""}')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Generados: {generated} | Desde cache: {cached} | Fallidos: {failed}'
+        ))
@@ -1,13 +1,24 @@
+import csv
+import json
+import re
+import time
+from collections import Counter
+from pathlib import Path
+
 from django.core.management.base import BaseCommand, CommandError
 
 from apps.regulatory.models import LegalFramework
-from apps.regulatory.services import update_legal_framework_entry
+from apps.regulatory.scraping import ScrapingOrchestrator
+from apps.regulatory.services import UPSERT_FIELDS, bulk_upsert_legal_frameworks, update_legal_framework_entry
 
 
 class Command(BaseCommand):
     help = (
         'Actualiza marcos legales existentes mediante scraping usando la URL oficial registrada. '
-        'Permite ejecutar un único comando en lugar de mantener comandos por cada ley.'
+        'Permite ejecutar un único comando en lugar de mantener comandos por cada ley. Con --manifest '
+        'carga en bloque un archivo CSV o JSON con columnas document_type, document_number, year y '
+        'official_url (opcionales: title, issuing_entity, summary, main_objective, benefits_companies, '
+        'benefits_citizens, is_active y tags separadas por "|").'
     )
 
     def add_arguments(self, parser):
@@ -32,8 +43,31 @@ class Command(BaseCommand):
             action='store_true',
             help='Actualiza todos los marcos legales con URL oficial configurada.'
         )
+        parser.add_argument(
+            '--manifest',
+            help='Archivo CSV o JSON con los marcos legales a crear o actualizar en bloque.'
+        )
+        parser.add_argument(
+            '--scrape',
+            action='store_true',
+            help='Con --manifest, descarga el texto oficial de los marcos cargados.'
+        )
+        parser.add_argument(
+            '--local',
+            action='store_true',
+            help='Con --scrape, procesa en este equipo con un pool de hilos en lugar de encolar en Celery.'
+        )
+        parser.add_argument('--workers', type=int, default=8, help='Hilos para --scrape --local (default: 8).')
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Con --manifest, solo valida el archivo sin escribir en la base de datos.'
+        )
 
     def handle(self, *args, **options):
+        if options.get('manifest'):
+            return self._load_manifest(options)
+
         document_type = options.get('document_type')
         document_number = options.get('document_number')
         year = options.get('year')
@@ -129,3 +163,121 @@ class Command(BaseCommand):
             )
 
         return [framework]
+
+    # ------------------------------------------------------------------ carga masiva
+
+    def _load_manifest(self, options):
+        entries, errors = self._read_manifest(options['manifest'])
+        for line, message in errors:
+            self.stderr.write(self.style.WARNING(f'⚠️  Fila {line}: {message}'))
+        if not entries:
+            raise CommandError('El manifiesto no contiene filas válidas.')
+
+        self.stdout.write(f'📄 {len(entries)} fila(s) válida(s), {len(errors)} descartada(s).')
+        if options['dry_run']:
+            return
+
+        started = time.monotonic()
+        created_ids, updated_ids = bulk_upsert_legal_frameworks(entries)
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ {len(created_ids)} creado(s), {len(updated_ids)} actualizado(s), '
+            f'{len(entries) - len(created_ids) - len(updated_ids)} sin cambios en {elapsed:.2f}s '
+            f'({len(entries) / max(elapsed, 0.001):.0f} filas/s).'
+        ))
+
+        if options['scrape']:
+            self._scrape(entries, options)
+
+    def _read_manifest(self, path):
+        path = Path(path)
+        if not path.exists():
+            raise CommandError(f'No existe el archivo {path}.')
+
+        if path.suffix.lower() == '.json':
+            try:
+                rows = json.loads(path.read_text(encoding='utf-8'))
+            except json.JSONDecodeError as exc:
+                raise CommandError(f'JSON inválido: {exc}') from exc
+            if not isinstance(rows, list):
+                raise CommandError('El manifiesto JSON debe ser una lista de objetos.')
+            numbered = enumerate(rows, start=1)
+        else:
+            with path.open(encoding='utf-8-sig', newline='') as handle:
+                numbered = list(enumerate(csv.DictReader(handle), start=2))
+
+        valid_types = dict(LegalFramework.DOCUMENT_TYPES)
+        entries, errors, seen = [], [], set()
+        for line, row in numbered:
+            if not isinstance(row, dict):
+                errors.append((line, 'la fila no es un objeto.'))
+                continue
+            row = {key.strip(): value.strip() if isinstance(value, str) else value for key, value in row.items() if key}
+            document_type = (row.get('document_type') or '').lower()
+            document_number = str(row.get('document_number') or '')
+            if document_type not in valid_types:
+                errors.append((line, f'tipo de documento inválido "{document_type}".'))
+                continue
+            if not document_number:
+                errors.append((line, 'falta document_number.'))
+                continue
+            try:
+                year = int(row.get('year'))
+            except (TypeError, ValueError):
+                errors.append((line, f'año inválido "{row.get("year")}".'))
+                continue
+            if not str(row.get('official_url') or '').startswith(('http://', 'https://')):
+                errors.append((line, 'official_url debe ser una URL http(s).'))
+                continue
+            if (document_type, document_number, year) in seen:
+                errors.append((line, 'fila duplicada en el manifiesto.'))
+                continue
+            seen.add((document_type, document_number, year))
+
+            entry = {'document_type': document_type, 'document_number': document_number, 'year': year}
+            for field in UPSERT_FIELDS:
+                if row.get(field) not in (None, ''):
+                    entry[field] = row[field]
+            if isinstance(entry.get('is_active'), str):
+                entry['is_active'] = entry['is_active'].lower() in ('1', 'true', 'si', 'sí', 'yes')
+            tags = row.get('tags') or []
+            entry['tags'] = [tag for tag in (tags.split('|') if isinstance(tags, str) else tags) if tag.strip()]
+            entries.append(entry)
+        return entries, errors
+
+    def _scrape(self, entries, options):
+        lookup = {(entry['document_type'], entry['document_number'], entry['year']) for entry in entries}
+        frameworks = [
+            framework
+            for framework in LegalFramework.objects.filter(
+                is_active=True, year__in={key[2] for key in lookup},
+            ).exclude(official_url='').only('pk', 'document_type', 'document_number', 'year', 'official_url')
+            if (framework.document_type, framework.document_number, framework.year) in lookup
+        ]
+
+        orchestrator = ScrapingOrchestrator()
+        run = orchestrator.start_run(frameworks, trigger='command', dispatch=not options['local'])
+        if not run.total:
+            self.stdout.write(self.style.WARNING('No hay marcos legales con URL oficial para descargar.'))
+            return
+        if not options['local']:
+            self.stdout.write(self.style.SUCCESS(f'Ejecución #{run.pk}: se encolaron {run.total} descarga(s).'))
+            return
+
+        started = time.monotonic()
+        run = orchestrator.run_locally(run, workers=options['workers'])
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ Ejecución #{run.pk}: {run.succeeded} descargado(s), {run.failed} fallido(s) en {elapsed:.1f}s '
+            f'({run.total / max(elapsed, 0.001):.2f} normas/s con {options["workers"]} hilo(s)).'
+        ))
+
+        failures = list(run.items.filter(status='failed').select_related('framework'))
+        if failures:
+            by_host = Counter(item.host for item in failures)
+            by_error = Counter(re.sub(r'https?://\S+', '<url>', item.error)[:80] for item in failures)
+            self.stderr.write(self.style.ERROR('Fallos por host: ' + ', '.join(f'{host} ({n})' for host, n in by_host.most_common())))
+            for error, count in by_error.most_common(5):
+                self.stderr.write(self.style.ERROR(f'  {count} × {error}'))
+            for item in failures:
+                self.stderr.write(f'❌ {item.framework or item.url}: {item.error}')
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from apps.regulatory.models import LegalFramework
+from apps.regulatory.structure import NormStructureService
+
+
+class Command(BaseCommand):
+    help = (
+        'Divide el texto scrapeado de los marcos legales en títulos, capítulos, artículos y '
+        'parágrafos, y reindexa los artículos para la búsqueda.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--id', dest='ids', type=int, action='append', help='Limita la ejecución a estos IDs.')
+
+    def handle(self, *args, **options):
+        frameworks = LegalFramework.objects.exclude(content_scraped='')
+        if options['ids']:
+            frameworks = frameworks.filter(pk__in=options['ids'])
+
+        service = NormStructureService()
+        for framework in frameworks.iterator(chunk_size=20):
+            total = service.rebuild(framework)
+            self.stdout.write(f'{framework}: {total} secciones.')
+        self.stdout.write(self.style.SUCCESS('Secciones reconstruidas.'))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from apps.regulatory.search import rebuild_indexes
+
+
+class Command(BaseCommand):
+    help = (
+        'Reconstruye el índice de búsqueda y las facetas de marcos legales y documentos regulatorios. '
+        'Solo es necesario tras cargas masivas que omiten las señales de guardado.'
+    )
+
+    def handle(self, *args, **options):
+        for kind, total in rebuild_indexes().items():
+            self.stdout.write(self.style.SUCCESS(f'{kind}: {total} documentos indexados.'))
@@ -0,0 +1,46 @@
+"""
+Comando para actualizar en paralelo todos los marcos legales desde sus fuentes oficiales
+"""
+from django.core.management.base import BaseCommand
+
+from apps.regulatory.models import LegalFramework
+from apps.regulatory.scraping import ScrapingOrchestrator
+
+
+class Command(BaseCommand):
+    help = (
+        'Actualiza los marcos legales activos mediante el orquestador de scraping. Por defecto '
+        'encola una tarea por marco legal en Celery; con --local usa un pool de hilos en esta máquina.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--id', dest='ids', type=int, action='append', help='Limita la ejecución a estos IDs.')
+        parser.add_argument(
+            '--local',
+            action='store_true',
+            help='Procesa en este equipo con un pool de hilos en lugar de encolar en Celery.'
+        )
+        parser.add_argument('--workers', type=int, default=8, help='Hilos para el modo --local (default: 8).')
+
+    def handle(self, *args, **options):
+        frameworks = None
+        if options['ids']:
+            frameworks = LegalFramework.objects.filter(pk__in=options['ids'], is_active=True)
+
+        orchestrator = ScrapingOrchestrator()
+        run = orchestrator.start_run(frameworks, trigger='command', dispatch=not options['local'])
+        if not run.total:
+            self.stdout.write(self.style.WARNING('No hay marcos legales para actualizar.'))
+            return
+
+        if not options['local']:
+            self.stdout.write(self.style.SUCCESS(f'Ejecución #{run.pk}: se encolaron {run.total} marco(s) legal(es).'))
+            return
+
+        run = orchestrator.run_locally(run, workers=options['workers'])
+        elapsed = (run.finished_at - run.started_at).total_seconds() if run.finished_at else 0
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ Ejecución #{run.pk}: {run.succeeded} actualizado(s), {run.failed} fallido(s) en {elapsed:.1f}s.'
+        ))
+        for item in run.items.filter(status='failed').select_related('framework'):
+            self.stderr.write(self.style.ERROR(f'❌ {item.framework or item.url}: {item.error}'))
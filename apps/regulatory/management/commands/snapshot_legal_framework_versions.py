@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from apps.regulatory.models import LegalFramework
+from apps.regulatory.versioning import VersionStore
+
+
+class Command(BaseCommand):
+    help = (
+        'Registra el contenido actual de los marcos legales como versión cuando difiere de la '
+        'última guardada. Útil para iniciar el historial de normas ya scrapeadas.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--id', dest='ids', type=int, action='append', help='Limita la ejecución a estos IDs.')
+
+    def handle(self, *args, **options):
+        frameworks = LegalFramework.objects.exclude(content_scraped='')
+        if options['ids']:
+            frameworks = frameworks.filter(pk__in=options['ids'])
+
+        store = VersionStore()
+        created = 0
+        for framework in frameworks.iterator(chunk_size=20):
+            version = store.record(
+                framework, framework.content_scraped,
+                created_at=framework.content_changed_at or framework.last_scraped,
+            )
+            if version is not None:
+                created += 1
+                self.stdout.write(f'{framework}: versión {version.number}')
+        self.stdout.write(self.style.SUCCESS(f'{created} versiones registradas.'))
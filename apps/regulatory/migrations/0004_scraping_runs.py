@@ -0,0 +1,56 @@
+# Generated by Django 5.0.6 on 2026-10-19 11:07
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('regulatory', '0003_legalframework_issuing_entity_alter_legalframework_year'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScrapingRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('trigger', models.CharField(choices=[('schedule', 'Programada'), ('admin', 'Administrador'), ('command', 'Comando')], default='schedule', max_length=20, verbose_name='Origen')),
+                ('status', models.CharField(choices=[('running', 'En ejecución'), ('finished', 'Finalizada'), ('partial', 'Finalizada con errores')], default='running', max_length=20, verbose_name='Estado')),
+                ('total', models.PositiveIntegerField(default=0, verbose_name='Tareas')),
+                ('succeeded', models.PositiveIntegerField(default=0, verbose_name='Exitosas')),
+                ('failed', models.PositiveIntegerField(default=0, verbose_name='Fallidas')),
+                ('started_at', models.DateTimeField(auto_now_add=True, verbose_name='Inicio')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='Fin')),
+                ('requested_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='scraping_runs', to=settings.AUTH_USER_MODEL, verbose_name='Solicitada por')),
+            ],
+            options={
+                'verbose_name': 'Ejecución de scraping',
+                'verbose_name_plural': 'Ejecuciones de scraping',
+                'ordering': ['-started_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ScrapingRunItem',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('url', models.URLField(max_length=500, verbose_name='URL')),
+                ('host', models.CharField(db_index=True, max_length=200, verbose_name='Host')),
+                ('status', models.CharField(choices=[('pending', 'Pendiente'), ('running', 'En curso'), ('success', 'Exitoso'), ('failed', 'Fallido')], default='pending', max_length=20, verbose_name='Estado')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='Intentos')),
+                ('error', models.TextField(blank=True, verbose_name='Error')),
+                ('duration_ms', models.PositiveIntegerField(blank=True, null=True, verbose_name='Duración (ms)')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='Fin')),
+                ('framework', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='scraping_items', to='regulatory.legalframework', verbose_name='Marco legal')),
+                ('run', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='items', to='regulatory.scrapingrun', verbose_name='Ejecución')),
+                ('source', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='scraping_items', to='regulatory.scrapingsource', verbose_name='Fuente')),
+            ],
+            options={
+                'verbose_name': 'Tarea de scraping',
+                'verbose_name_plural': 'Tareas de scraping',
+                'ordering': ['run', 'pk'],
+            },
+        ),
+    ]
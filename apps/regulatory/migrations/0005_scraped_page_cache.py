@@ -0,0 +1,41 @@
+# Generated by Django 5.0.6 on 2026-10-19 11:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('regulatory', '0004_scraping_runs'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScrapedPage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('url', models.URLField(max_length=500, verbose_name='URL')),
+                ('url_hash', models.CharField(max_length=64, unique=True, verbose_name='Hash de la URL')),
+                ('etag', models.CharField(blank=True, max_length=255, verbose_name='ETag')),
+                ('last_modified', models.CharField(blank=True, max_length=64, verbose_name='Last-Modified')),
+                ('body_hash', models.CharField(blank=True, max_length=64, verbose_name='Hash de la respuesta')),
+                ('content_hash', models.CharField(blank=True, max_length=64, verbose_name='Hash del contenido extraído')),
+                ('last_checked_at', models.DateTimeField(blank=True, null=True, verbose_name='Última verificación')),
+                ('last_changed_at', models.DateTimeField(blank=True, null=True, verbose_name='Último cambio')),
+            ],
+            options={
+                'verbose_name': 'Página descargada',
+                'verbose_name_plural': 'Páginas descargadas',
+            },
+        ),
+        migrations.AddField(
+            model_name='legalframework',
+            name='content_changed_at',
+            field=models.DateTimeField(blank=True, help_text='Fecha en que el scraping detectó un cambio real en el texto oficial', null=True, verbose_name='Último cambio de contenido'),
+        ),
+        migrations.AddField(
+            model_name='scrapingrunitem',
+            name='content_changed',
+            field=models.BooleanField(null=True, verbose_name='Contenido modificado'),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.0.6 on 2026-10-19 11:24
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('regulatory', '0005_scraped_page_cache'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NormSection',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('preambulo', 'Encabezado'), ('titulo', 'Título'), ('capitulo', 'Capítulo'), ('articulo', 'Artículo'), ('paragrafo', 'Parágrafo')], max_length=20, verbose_name='Tipo')),
+                ('number', models.CharField(blank=True, max_length=30, verbose_name='Número')),
+                ('heading', models.CharField(blank=True, max_length=500, verbose_name='Encabezado')),
+                ('anchor', models.SlugField(max_length=120, verbose_name='Ancla')),
+                ('position', models.PositiveIntegerField(verbose_name='Posición')),
+                ('content_html', models.TextField(blank=True, verbose_name='Contenido HTML')),
+                ('content_text', models.TextField(blank=True, verbose_name='Contenido en texto plano')),
+                ('framework', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sections', to='regulatory.legalframework', verbose_name='Marco legal')),
+                ('parent', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='children', to='regulatory.normsection', verbose_name='Sección superior')),
+            ],
+            options={
+                'verbose_name': 'Sección de norma',
+                'verbose_name_plural': 'Secciones de normas',
+                'ordering': ['framework', 'position'],
+                'indexes': [models.Index(fields=['framework', 'kind', 'position'], name='regulatory__framewo_21f79c_idx')],
+                'unique_together': {('framework', 'anchor')},
+            },
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.0.6 on 2026-10-19 11:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('regulatory', '0006_norm_sections'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AISummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('cache_key', models.CharField(max_length=64, unique=True, verbose_name='Clave de caché')),
+                ('prompt_version', models.CharField(max_length=40, verbose_name='Versión del prompt')),
+                ('model_name', models.CharField(max_length=100, verbose_name='Modelo')),
+                ('result', models.JSONField(verbose_name='Resultado')),
+                ('hits', models.PositiveIntegerField(default=0, verbose_name='Reutilizaciones')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Generado el')),
+            ],
+            options={
+                'verbose_name': 'Resumen generado con IA',
+                'verbose_name_plural': 'Resúmenes generados con IA',
+            },
+        ),
+    ]
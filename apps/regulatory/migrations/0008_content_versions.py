@@ -0,0 +1,48 @@
+# Generated by Django 5.0.6 on 2026-10-19 11:29
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('regulatory', '0007_ai_summaries'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ContentChunk',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('hash', models.CharField(max_length=64, unique=True, verbose_name='Hash')),
+                ('content', models.TextField(verbose_name='Contenido')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Creado el')),
+            ],
+            options={
+                'verbose_name': 'Bloque de contenido',
+                'verbose_name_plural': 'Bloques de contenido',
+            },
+        ),
+        migrations.CreateModel(
+            name='LegalFrameworkVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('number', models.PositiveIntegerField(verbose_name='Versión')),
+                ('content_hash', models.CharField(max_length=64, verbose_name='Hash del contenido')),
+                ('chunk_ids', models.JSONField(default=list, verbose_name='Bloques')),
+                ('size', models.PositiveIntegerField(default=0, verbose_name='Tamaño (caracteres)')),
+                ('added_blocks', models.PositiveIntegerField(default=0, verbose_name='Bloques agregados')),
+                ('removed_blocks', models.PositiveIntegerField(default=0, verbose_name='Bloques eliminados')),
+                ('created_at', models.DateTimeField(verbose_name='Fecha de la versión')),
+                ('framework', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='versions', to='regulatory.legalframework', verbose_name='Marco legal')),
+            ],
+            options={
+                'verbose_name': 'Versión de marco legal',
+                'verbose_name_plural': 'Versiones de marcos legales',
+                'ordering': ['framework', '-number'],
+                'indexes': [models.Index(fields=['framework', 'created_at'], name='regulatory__framewo_6a8b1d_idx')],
+                'unique_together': {('framework', 'number')},
+            },
+        ),
+    ]
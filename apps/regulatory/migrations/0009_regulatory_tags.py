@@ -0,0 +1,36 @@
+# Generated by Django 5.0.6 on 2026-10-19 11:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('regulatory', '0008_content_versions'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RegulatoryTag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, verbose_name='Nombre')),
+                ('slug', models.SlugField(max_length=120, unique=True, verbose_name='Slug')),
+            ],
+            options={
+                'verbose_name': 'Etiqueta regulatoria',
+                'verbose_name_plural': 'Etiquetas regulatorias',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.AddField(
+            model_name='legalframework',
+            name='tags',
+            field=models.ManyToManyField(blank=True, related_name='frameworks', to='regulatory.regulatorytag', verbose_name='Etiquetas'),
+        ),
+        migrations.AddField(
+            model_name='regulatorydocument',
+            name='normalized_tags',
+            field=models.ManyToManyField(blank=True, help_text='Se sincronizan automáticamente desde el campo de etiquetas', related_name='documents', to='regulatory.regulatorytag', verbose_name='Etiquetas normalizadas'),
+        ),
+    ]
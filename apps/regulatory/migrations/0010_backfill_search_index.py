@@ -0,0 +1,36 @@
+from django.db import migrations
+
+from apps.regulatory.search import legal_framework_index, regulatory_document_index
+from apps.regulatory.structure import norm_section_index
+
+
+def index_rows(queryset, index, apps):
+    rows = queryset.values('pk', *index.fields).iterator(chunk_size=500)
+    index.rebuild(((row.pop('pk'), row) for row in rows), apps=apps)
+
+
+def backfill_search_index(apps, schema_editor):
+    LegalFramework = apps.get_model('regulatory', 'LegalFramework')
+    RegulatoryDocument = apps.get_model('regulatory', 'RegulatoryDocument')
+    NormSection = apps.get_model('regulatory', 'NormSection')
+    index_rows(LegalFramework.objects.filter(is_active=True), legal_framework_index, apps)
+    index_rows(RegulatoryDocument.objects.filter(is_active=True), regulatory_document_index, apps)
+    index_rows(NormSection.objects.filter(kind='articulo', framework__is_active=True), norm_section_index, apps)
+
+
+def clear_search_index(apps, schema_editor):
+    SearchDocument = apps.get_model('core', 'SearchDocument')
+    kinds = [legal_framework_index.kind, regulatory_document_index.kind, norm_section_index.kind]
+    SearchDocument.objects.filter(kind__in=kinds).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('regulatory', '0009_regulatory_tags'),
+        ('core', '0001_search_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_search_index, clear_search_index),
+    ]
@@ -0,0 +1,51 @@
+from django.db import migrations
+from django.utils.text import slugify
+
+from apps.regulatory.search import legal_framework_facets, regulatory_document_facets
+
+
+def sync_document_tags(RegulatoryTag, document):
+    """Versión histórica de `sync_document_tags`: etiquetas normalizadas desde el campo de texto."""
+    by_slug = {}
+    for name in (document.tags or '').split(','):
+        name = ' '.join(name.split())[:100]
+        slug = slugify(name)[:120]
+        if slug and slug not in by_slug:
+            by_slug[slug] = name
+    RegulatoryTag.objects.bulk_create(
+        [RegulatoryTag(name=name, slug=slug) for slug, name in by_slug.items()], ignore_conflicts=True,
+    )
+    document.normalized_tags.set(RegulatoryTag.objects.filter(slug__in=by_slug))
+
+
+def backfill_facet_index(apps, schema_editor):
+    LegalFramework = apps.get_model('regulatory', 'LegalFramework')
+    RegulatoryDocument = apps.get_model('regulatory', 'RegulatoryDocument')
+    RegulatoryTag = apps.get_model('regulatory', 'RegulatoryTag')
+
+    legal_framework_facets.rebuild(
+        LegalFramework.objects.filter(is_active=True).prefetch_related('tags').iterator(chunk_size=500), apps=apps,
+    )
+    documents = RegulatoryDocument.objects.filter(is_active=True).select_related('category')
+    for document in documents.iterator(chunk_size=500):
+        sync_document_tags(RegulatoryTag, document)
+    regulatory_document_facets.rebuild(
+        documents.prefetch_related('normalized_tags').iterator(chunk_size=500), apps=apps,
+    )
+
+
+def clear_facet_index(apps, schema_editor):
+    FacetEntry = apps.get_model('core', 'FacetEntry')
+    FacetEntry.objects.filter(kind__in=[legal_framework_facets.kind, regulatory_document_facets.kind]).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('regulatory', '0010_backfill_search_index'),
+        ('core', '0002_facet_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_facet_index, clear_facet_index),
+    ]
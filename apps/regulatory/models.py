@@ -1,8 +1,25 @@
+from django.conf import settings
 from django.db import models
 from django.urls import reverse
 from apps.core.models import BaseModel
 import bleach
 
+# Política de sanitización del contenido scrapeado (compartida con apps.regulatory.extraction)
+CONTENT_ALLOWED_TAGS = [
+    'p', 'br', 'strong', 'b', 'em', 'i', 'u',
+    'ul', 'ol', 'li', 'blockquote',
+    'h1', 'h2', 'h3', 'h4',
+    'a',
+    'table', 'thead', 'tbody', 'tr', 'td', 'th'
+]
+CONTENT_ALLOWED_ATTRIBUTES = {
+    'a': ['href', 'title', 'target', 'rel'],
+    'td': ['colspan', 'rowspan'],
+    'th': ['colspan', 'rowspan']
+}
+CONTENT_ALLOWED_PROTOCOLS = ['http', 'https', 'mailto']
+
+
 class LegalFramework(BaseModel):
     """Modelo para almacenar marcos legales y normativas"""
     
@@ -85,12 +102,26 @@ class LegalFramework(BaseModel):
         blank=True,
         verbose_name='Última actualización de scraping'
     )
+
+    content_changed_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Último cambio de contenido',
+        help_text='Fecha en que el scraping detectó un cambio real en el texto oficial'
+    )
     
     is_active = models.BooleanField(
         default=True,
         verbose_name='Activo',
         help_text='Si está activo para mostrar en el sitio'
     )
+
+    tags = models.ManyToManyField(
+        'RegulatoryTag',
+        blank=True,
+        related_name='frameworks',
+        verbose_name='Etiquetas'
+    )
     
     class Meta:
         verbose_name = 'Marco Legal'
@@ -105,25 +136,12 @@ class LegalFramework(BaseModel):
     
     def clean_content(self, content):
         """Limpia y sanitiza el contenido scrapeado, preservando formato básico"""
-        allowed_tags = [
-            'p', 'br', 'strong', 'b', 'em', 'i', 'u',
-            'ul', 'ol', 'li', 'blockquote',
-            'h1', 'h2', 'h3', 'h4',
-            'a',
-            'table', 'thead', 'tbody', 'tr', 'td', 'th'
-        ]
-        allowed_attrs = {
-            'a': ['href', 'title', 'target', 'rel'],
-            'td': ['colspan', 'rowspan'],
-            'th': ['colspan', 'rowspan']
-        }
-        allowed_protocols = ['http', 'https', 'mailto']
         # Nota: no se permiten estilos inline por seguridad
         return bleach.clean(
             content or '',
-            tags=allowed_tags,
-            attributes=allowed_attrs,
-            protocols=allowed_protocols,
+            tags=CONTENT_ALLOWED_TAGS,
+            attributes=CONTENT_ALLOWED_ATTRIBUTES,
+            protocols=CONTENT_ALLOWED_PROTOCOLS,
             strip=True
         )
 
@@ -165,6 +183,229 @@ class ScrapingSource(BaseModel):
         return self.name
 
 
+class NormSection(models.Model):
+    """Título, capítulo, artículo o parágrafo del texto oficial de un marco legal"""
+
+    KINDS = [
+        ('preambulo', 'Encabezado'),
+        ('titulo', 'Título'),
+        ('capitulo', 'Capítulo'),
+        ('articulo', 'Artículo'),
+        ('paragrafo', 'Parágrafo'),
+    ]
+
+    framework = models.ForeignKey(
+        LegalFramework,
+        on_delete=models.CASCADE,
+        related_name='sections',
+        verbose_name='Marco legal'
+    )
+    parent = models.ForeignKey(
+        'self',
+        null=True,
+        blank=True,
+        on_delete=models.CASCADE,
+        related_name='children',
+        verbose_name='Sección superior'
+    )
+    kind = models.CharField(max_length=20, choices=KINDS, verbose_name='Tipo')
+    number = models.CharField(max_length=30, blank=True, verbose_name='Número')
+    heading = models.CharField(max_length=500, blank=True, verbose_name='Encabezado')
+    anchor = models.SlugField(max_length=120, verbose_name='Ancla')
+    position = models.PositiveIntegerField(verbose_name='Posición')
+    content_html = models.TextField(blank=True, verbose_name='Contenido HTML')
+    content_text = models.TextField(blank=True, verbose_name='Contenido en texto plano')
+
+    class Meta:
+        verbose_name = 'Sección de norma'
+        verbose_name_plural = 'Secciones de normas'
+        ordering = ['framework', 'position']
+        unique_together = ('framework', 'anchor')
+        indexes = [models.Index(fields=['framework', 'kind', 'position'])]
+
+    def __str__(self):
+        return f"{self.framework} - {self.heading or self.anchor}"
+
+
+class ContentChunk(models.Model):
+    """Bloque de contenido de una norma, almacenado una sola vez por su hash"""
+
+    hash = models.CharField(max_length=64, unique=True, verbose_name='Hash')
+    content = models.TextField(verbose_name='Contenido')
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='Creado el')
+
+    class Meta:
+        verbose_name = 'Bloque de contenido'
+        verbose_name_plural = 'Bloques de contenido'
+
+    def __str__(self):
+        return self.hash[:12]
+
+
+class LegalFrameworkVersion(models.Model):
+    """Versión del texto oficial de un marco legal
+
+    El contenido se reconstruye concatenando los bloques de `chunk_ids`; los
+    bloques que no cambian entre versiones se comparten, así que cada versión
+    solo agrega a la base de datos los bloques nuevos.
+    """
+
+    framework = models.ForeignKey(
+        LegalFramework,
+        on_delete=models.CASCADE,
+        related_name='versions',
+        verbose_name='Marco legal'
+    )
+    number = models.PositiveIntegerField(verbose_name='Versión')
+    content_hash = models.CharField(max_length=64, verbose_name='Hash del contenido')
+    chunk_ids = models.JSONField(default=list, verbose_name='Bloques')
+    size = models.PositiveIntegerField(default=0, verbose_name='Tamaño (caracteres)')
+    added_blocks = models.PositiveIntegerField(default=0, verbose_name='Bloques agregados')
+    removed_blocks = models.PositiveIntegerField(default=0, verbose_name='Bloques eliminados')
+    created_at = models.DateTimeField(verbose_name='Fecha de la versión')
+
+    class Meta:
+        verbose_name = 'Versión de marco legal'
+        verbose_name_plural = 'Versiones de marcos legales'
+        ordering = ['framework', '-number']
+        unique_together = ('framework', 'number')
+        indexes = [models.Index(fields=['framework', 'created_at'])]
+
+    def __str__(self):
+        return f"{self.framework} v{self.number}"
+
+
+class AISummary(models.Model):
+    """Resultado cacheado de la generación de contenido con IA
+
+    La clave combina el texto fuente, la identificación de la norma, la versión
+    del prompt y el modelo, de modo que regenerar sobre el mismo contenido no
+    vuelve a llamar al proveedor.
+    """
+
+    cache_key = models.CharField(max_length=64, unique=True, verbose_name='Clave de caché')
+    prompt_version = models.CharField(max_length=40, verbose_name='Versión del prompt')
+    model_name = models.CharField(max_length=100, verbose_name='Modelo')
+    result = models.JSONField(verbose_name='Resultado')
+    hits = models.PositiveIntegerField(default=0, verbose_name='Reutilizaciones')
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='Generado el')
+
+    class Meta:
+        verbose_name = 'Resumen generado con IA'
+        verbose_name_plural = 'Resúmenes generados con IA'
+
+    def __str__(self):
+        return f"{self.model_name} ({self.prompt_version}) {self.cache_key[:12]}"
+
+
+class ScrapedPage(models.Model):
+    """Caché de descargas condicionales por URL (ETag, Last-Modified y hashes de contenido)"""
+
+    url = models.URLField(max_length=500, verbose_name='URL')
+    url_hash = models.CharField(max_length=64, unique=True, verbose_name='Hash de la URL')
+    etag = models.CharField(max_length=255, blank=True, verbose_name='ETag')
+    last_modified = models.CharField(max_length=64, blank=True, verbose_name='Last-Modified')
+    body_hash = models.CharField(max_length=64, blank=True, verbose_name='Hash de la respuesta')
+    content_hash = models.CharField(max_length=64, blank=True, verbose_name='Hash del contenido extraído')
+    last_checked_at = models.DateTimeField(null=True, blank=True, verbose_name='Última verificación')
+    last_changed_at = models.DateTimeField(null=True, blank=True, verbose_name='Último cambio')
+
+    class Meta:
+        verbose_name = 'Página descargada'
+        verbose_name_plural = 'Páginas descargadas'
+
+    def __str__(self):
+        return self.url
+
+
+class ScrapingRun(models.Model):
+    """Ejecución del orquestador de scraping sobre un conjunto de marcos legales"""
+
+    TRIGGERS = [
+        ('schedule', 'Programada'),
+        ('admin', 'Administrador'),
+        ('command', 'Comando'),
+    ]
+
+    STATUSES = [
+        ('running', 'En ejecución'),
+        ('finished', 'Finalizada'),
+        ('partial', 'Finalizada con errores'),
+    ]
+
+    trigger = models.CharField(max_length=20, choices=TRIGGERS, default='schedule', verbose_name='Origen')
+    requested_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name='scraping_runs',
+        verbose_name='Solicitada por'
+    )
+    status = models.CharField(max_length=20, choices=STATUSES, default='running', verbose_name='Estado')
+    total = models.PositiveIntegerField(default=0, verbose_name='Tareas')
+    succeeded = models.PositiveIntegerField(default=0, verbose_name='Exitosas')
+    failed = models.PositiveIntegerField(default=0, verbose_name='Fallidas')
+    started_at = models.DateTimeField(auto_now_add=True, verbose_name='Inicio')
+    finished_at = models.DateTimeField(null=True, blank=True, verbose_name='Fin')
+
+    class Meta:
+        verbose_name = 'Ejecución de scraping'
+        verbose_name_plural = 'Ejecuciones de scraping'
+        ordering = ['-started_at']
+
+    def __str__(self):
+        return f"Scraping #{self.pk} ({self.get_status_display()})"
+
+    @property
+    def completed(self):
+        return self.succeeded + self.failed
+
+
+class ScrapingRunItem(models.Model):
+    """Resultado del scraping de un marco legal dentro de una ejecución"""
+
+    STATUSES = [
+        ('pending', 'Pendiente'),
+        ('running', 'En curso'),
+        ('success', 'Exitoso'),
+        ('failed', 'Fallido'),
+    ]
+
+    run = models.ForeignKey(ScrapingRun, on_delete=models.CASCADE, related_name='items', verbose_name='Ejecución')
+    framework = models.ForeignKey(
+        LegalFramework,
+        null=True,
+        on_delete=models.SET_NULL,
+        related_name='scraping_items',
+        verbose_name='Marco legal'
+    )
+    source = models.ForeignKey(
+        ScrapingSource,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name='scraping_items',
+        verbose_name='Fuente'
+    )
+    url = models.URLField(max_length=500, verbose_name='URL')
+    host = models.CharField(max_length=200, db_index=True, verbose_name='Host')
+    status = models.CharField(max_length=20, choices=STATUSES, default='pending', verbose_name='Estado')
+    attempts = models.PositiveSmallIntegerField(default=0, verbose_name='Intentos')
+    content_changed = models.BooleanField(null=True, verbose_name='Contenido modificado')
+    error = models.TextField(blank=True, verbose_name='Error')
+    duration_ms = models.PositiveIntegerField(null=True, blank=True, verbose_name='Duración (ms)')
+    finished_at = models.DateTimeField(null=True, blank=True, verbose_name='Fin')
+
+    class Meta:
+        verbose_name = 'Tarea de scraping'
+        verbose_name_plural = 'Tareas de scraping'
+        ordering = ['run', 'pk']
+
+    def __str__(self):
+        return f"{self.url} ({self.get_status_display()})"
+
+
 class RegulatoryCategory(BaseModel):
     """Categorías para normativas"""
     name = models.CharField(max_length=100, verbose_name='Nombre')
@@ -179,6 +420,40 @@ class RegulatoryCategory(BaseModel):
         return self.name
 
 
+class RegulatoryTag(models.Model):
+    """Etiqueta normalizada compartida por marcos legales y documentos regulatorios"""
+    name = models.CharField(max_length=100, verbose_name='Nombre')
+    slug = models.SlugField(max_length=120, unique=True, verbose_name='Slug')
+
+    class Meta:
+        verbose_name = 'Etiqueta regulatoria'
+        verbose_name_plural = 'Etiquetas regulatorias'
+        ordering = ['name']
+
+    def __str__(self):
+        return self.name
+
+    @classmethod
+    def from_names(cls, names):
+        """Retorna las etiquetas para una lista de nombres, creando las que falten."""
+        from django.utils.text import slugify
+
+        by_slug = {}
+        for name in names:
+            name = ' '.join(name.split())[:100]
+            slug = slugify(name)[:120]
+            if slug and slug not in by_slug:
+                by_slug[slug] = name
+        if not by_slug:
+            return []
+        existing = {tag.slug: tag for tag in cls.objects.filter(slug__in=by_slug)}
+        missing = [cls(name=name, slug=slug) for slug, name in by_slug.items() if slug not in existing]
+        if missing:
+            cls.objects.bulk_create(missing, ignore_conflicts=True)
+            existing = {tag.slug: tag for tag in cls.objects.filter(slug__in=by_slug)}
+        return list(existing.values())
+
+
 class RegulatoryDocument(BaseModel):
     """Modelo para documentos regulatorios"""
     
@@ -212,6 +487,13 @@ class RegulatoryDocument(BaseModel):
     )
     external_url = models.URLField(blank=True, verbose_name='URL externa')
     tags = models.CharField(max_length=500, blank=True, verbose_name='Etiquetas (separadas por comas)')
+    normalized_tags = models.ManyToManyField(
+        RegulatoryTag,
+        blank=True,
+        related_name='documents',
+        verbose_name='Etiquetas normalizadas',
+        help_text='Se sincronizan automáticamente desde el campo de etiquetas'
+    )
     
     class Meta:
         verbose_name = 'Documento regulatorio'
@@ -220,3 +502,6 @@ class RegulatoryDocument(BaseModel):
         
     def __str__(self):
         return f"{self.document_number} - {self.title}"
+
+    def tag_names(self):
+        return [tag.strip() for tag in (self.tags or '').split(',') if tag.strip()]
@@ -0,0 +1,234 @@
+"""
+Orquestador de scraping de marcos legales
+
+Cada marco legal activo se convierte en una tarea Celery independiente, de modo
+que la actualización se reparte entre los workers disponibles. Para no saturar
+los portales oficiales se limita el número de descargas simultáneas por host
+con un semáforo en la caché compartida; las tareas que no obtienen turno se
+reprograman sin consumir intentos. Cada ejecución queda registrada en
+`ScrapingRun` / `ScrapingRunItem`.
+
+El semáforo usa la caché de Django si es compartida (`CACHE_URL`). Si no lo es,
+usa el Redis del broker de Celery (`REDIS_URL`), que ven todos los workers; si
+tampoco está disponible el límite queda por proceso y se registra una
+advertencia, pero el scraping sigue funcionando.
+"""
+import logging
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from apps.core.cache import shared_cache
+
+from .models import LegalFramework, ScrapingRun, ScrapingRunItem, ScrapingSource
+from .services import LegalScrapingService, update_legal_framework_entry
+
+logger = logging.getLogger(__name__)
+
+
+class ScrapingFailed(Exception):
+    """La fuente oficial no devolvió contenido utilizable."""
+
+
+class HostSlots:
+    """Semáforo por host sobre la caché compartida (ver `apps.core.cache.shared_cache`).
+
+    Cada turno tomado renueva la expiración del contador, de modo que no caduca
+    mientras haya descargas en curso, pero un worker que muere con un turno
+    tomado no bloquea el host indefinidamente.
+    """
+
+    def __init__(self, limit=None, ttl=None, cache=None):
+        self.limit = limit or getattr(settings, 'SCRAPING_PER_HOST_CONCURRENCY', 2)
+        self.ttl = ttl or getattr(settings, 'SCRAPING_HOST_SLOT_TTL', 120)
+        self._cache = cache
+
+    @property
+    def cache(self):
+        if self._cache is None:
+            self._cache = shared_cache()
+        return self._cache
+
+    @staticmethod
+    def _key(host):
+        return f'regulatory:scraping-host:{host}'
+
+    def acquire(self, host):
+        key = self._key(host)
+        self.cache.add(key, 0, self.ttl)
+        try:
+            current = self.cache.incr(key)
+        except ValueError:
+            self.cache.set(key, 1, self.ttl)
+            current = 1
+        else:
+            self.cache.touch(key, self.ttl)
+        if current > self.limit:
+            self.release(host)
+            return False
+        return True
+
+    def release(self, host):
+        try:
+            self.cache.decr(self._key(host))
+        except ValueError:
+            pass
+
+
+class ScrapingOrchestrator:
+    """Crea ejecuciones de scraping y procesa cada una de sus tareas."""
+
+    def __init__(self, scraper=None, slots=None):
+        self.scraper = scraper or LegalScrapingService()
+        self.slots = slots or HostSlots()
+        self.max_attempts = getattr(settings, 'SCRAPING_MAX_ATTEMPTS', 4)
+
+    # ------------------------------------------------------------------ planificación
+
+    def start_run(self, frameworks=None, trigger='schedule', requested_by=None, dispatch=True):
+        """Registra una ejecución con una tarea por marco legal y las encola.
+
+        Sin `frameworks` se procesan todos los marcos activos. Los marcos cuya URL
+        pertenece a una `ScrapingSource` inactiva se omiten; las fuentes activas
+        aportan su selector de contenido.
+        """
+        if frameworks is None:
+            frameworks = LegalFramework.objects.filter(is_active=True).exclude(official_url='')
+
+        sources = list(ScrapingSource.objects.all())
+        items = []
+        for framework in frameworks:
+            source = self._match_source(sources, framework.official_url)
+            if source is not None and not source.is_active:
+                continue
+            items.append(ScrapingRunItem(
+                framework=framework,
+                source=source,
+                url=framework.official_url,
+                host=urlsplit(framework.official_url).hostname or '',
+            ))
+
+        with transaction.atomic():
+            run = ScrapingRun.objects.create(trigger=trigger, requested_by=requested_by, total=len(items))
+            for item in items:
+                item.run = run
+            ScrapingRunItem.objects.bulk_create(items)
+            if not items:
+                self._finish(run)
+            elif dispatch:
+                item_ids = list(run.items.values_list('pk', flat=True))
+                transaction.on_commit(lambda: self._dispatch(item_ids))
+        return run
+
+    @staticmethod
+    def _dispatch(item_ids):
+        from .tasks import scrape_legal_framework_task
+
+        for item_id in item_ids:
+            scrape_legal_framework_task.delay(item_id)
+
+    @staticmethod
+    def _match_source(sources, url):
+        matches = [source for source in sources if url.startswith(source.base_url)]
+        return max(matches, key=lambda source: len(source.base_url), default=None)
+
+    # ------------------------------------------------------------------ ejecución
+
+    def process(self, item):
+        """Descarga y guarda un marco legal. Lanza `ScrapingFailed` si debe reintentarse."""
+        framework = item.framework
+        if framework is None:
+            raise ScrapingFailed('El marco legal fue eliminado.')
+
+        started = time.monotonic()
+        item.status = 'running'
+        item.attempts += 1
+        item.save(update_fields=['status', 'attempts'])
+        scraped = self.scraper.scrape_norma_oficial(
+            item.url,
+            number=framework.document_number,
+            year=framework.year,
+            content_selector=item.source.selector_content if item.source else '',
+            use_fallback=False,
+            conditional=True,
+        )
+        if not scraped.get('success'):
+            raise ScrapingFailed(f'No se obtuvo contenido de {item.url}')
+
+        update_legal_framework_entry(
+            document_type=framework.document_type,
+            document_number=framework.document_number,
+            year=framework.year,
+            official_url=item.url,
+            scraped_data=scraped,
+        )
+        self.record(item, 'success', duration=time.monotonic() - started, changed=not scraped.get('unchanged'))
+
+    def record(self, item, status, error='', duration=None, changed=None):
+        """Cierra la tarea y actualiza los contadores de la ejecución."""
+        ScrapingRunItem.objects.filter(pk=item.pk).update(
+            status=status,
+            error=error,
+            content_changed=changed,
+            duration_ms=int(duration * 1000) if duration is not None else None,
+            finished_at=timezone.now(),
+        )
+        counter = 'succeeded' if status == 'success' else 'failed'
+        ScrapingRun.objects.filter(pk=item.run_id).update(**{counter: F(counter) + 1})
+        run = ScrapingRun.objects.get(pk=item.run_id)
+        if run.completed >= run.total:
+            self._finish(run)
+
+    def run_locally(self, run, workers=8):
+        """Procesa una ejecución en este proceso con un pool de hilos.
+
+        Pensado para entornos sin workers de Celery; respeta el mismo límite por
+        host y los mismos reintentos que las tareas encoladas.
+        """
+        items = list(run.items.select_related('framework', 'source').filter(status='pending'))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(self._process_locally, items))
+        run.refresh_from_db()
+        return run
+
+    def _process_locally(self, item):
+        try:
+            while True:
+                while not self.slots.acquire(item.host):
+                    time.sleep(0.5)
+                try:
+                    self.process(item)
+                    return
+                except ScrapingFailed as exc:
+                    if item.attempts >= self.max_attempts:
+                        self.record(item, 'failed', error=str(exc))
+                        return
+                except Exception as exc:
+                    logger.exception('Error inesperado al scrapear %s', item.url)
+                    self.record(item, 'failed', error=str(exc) or exc.__class__.__name__)
+                    return
+                finally:
+                    self.slots.release(item.host)
+                time.sleep(self.backoff(item.attempts))
+        finally:
+            connection.close()
+
+    @staticmethod
+    def _finish(run):
+        status = 'partial' if run.failed else 'finished'
+        ScrapingRun.objects.filter(pk=run.pk, finished_at__isnull=True).update(
+            status=status, finished_at=timezone.now(),
+        )
+        logger.info('Scraping #%s finalizado: %s exitosos, %s fallidos', run.pk, run.succeeded, run.failed)
+
+    @staticmethod
+    def backoff(attempts):
+        """Espera exponencial con jitter: 30s, 60s, 120s... hasta 15 minutos."""
+        base = getattr(settings, 'SCRAPING_RETRY_BACKOFF', 30)
+        return min(base * 2 ** (attempts - 1), 15 * 60) + random.uniform(0, base)
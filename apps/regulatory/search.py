@@ -0,0 +1,111 @@
+"""
+Índices de búsqueda y facetas del repositorio normativo
+
+Los pesos por campo replican la relevancia histórica de la búsqueda avanzada:
+título 5, resumen 3, objetivo 2 y beneficios 1. Las facetas (tipo, entidad,
+año y etiqueta) cubren tanto marcos legales como documentos regulatorios.
+"""
+from apps.core.facets import FacetIndex
+from apps.core.search import SearchIndex
+
+from .models import LegalFramework, NormSection, RegulatoryDocument, RegulatoryTag
+
+legal_framework_index = SearchIndex('regulatory.legalframework', {
+    'title': 5,
+    'summary': 3,
+    'main_objective': 2,
+    'benefits_companies': 1,
+    'benefits_citizens': 1,
+})
+
+regulatory_document_index = SearchIndex('regulatory.regulatorydocument', {
+    'title': 5,
+    'summary': 3,
+    'tags': 2,
+    'full_text': 1,
+})
+
+INDEXES = {
+    LegalFramework: legal_framework_index,
+    RegulatoryDocument: regulatory_document_index,
+}
+
+
+def _tag_values(tags):
+    return [(tag.slug, tag.name) for tag in tags.all()]
+
+
+legal_framework_facets = FacetIndex('regulatory.legalframework', {
+    'type': lambda obj: [(obj.document_type, obj.get_document_type_display())],
+    'entity': lambda obj: [(obj.issuing_entity, obj.issuing_entity)] if obj.issuing_entity else [],
+    'year': lambda obj: [(obj.year, obj.year)],
+    'tag': lambda obj: _tag_values(obj.tags),
+})
+
+regulatory_document_facets = FacetIndex('regulatory.regulatorydocument', {
+    'type': lambda obj: [(obj.document_type, obj.get_document_type_display())],
+    'entity': lambda obj: [(obj.issuing_entity, obj.issuing_entity)] if obj.issuing_entity else [],
+    'year': lambda obj: [(obj.publication_date.year, obj.publication_date.year)] if obj.publication_date else [],
+    'category': lambda obj: [(obj.category_id, obj.category.name)],
+    'tag': lambda obj: _tag_values(obj.normalized_tags),
+})
+
+FACET_INDEXES = {
+    LegalFramework: legal_framework_facets,
+    RegulatoryDocument: regulatory_document_facets,
+}
+
+
+def index_values(instance, index):
+    return {field: getattr(instance, field) for field in index.fields}
+
+
+def index_instance(instance):
+    """Indexa el objeto o lo retira del índice si ya no debe ser visible."""
+    index = INDEXES[type(instance)]
+    if getattr(instance, 'is_active', True):
+        index.index(instance.pk, index_values(instance, index))
+    else:
+        index.remove(instance.pk)
+    index_facets(instance)
+
+
+def index_facets(instance):
+    facets = FACET_INDEXES[type(instance)]
+    if getattr(instance, 'is_active', True):
+        facets.index(instance)
+    else:
+        facets.remove(instance.pk)
+
+
+def sync_document_tags(document):
+    """Sincroniza las etiquetas normalizadas con el campo de texto separado por comas."""
+    document.normalized_tags.set(RegulatoryTag.from_names(document.tag_names()))
+
+
+def rebuild_indexes():
+    """Reconstruye todos los índices del repositorio normativo. Retorna {tipo: documentos}."""
+    counts = {}
+    for model, index in INDEXES.items():
+        queryset = model.objects.all()
+        if hasattr(model, 'is_active'):
+            queryset = queryset.filter(is_active=True)
+        rows = queryset.values('pk', *index.fields).iterator(chunk_size=500)
+        counts[index.kind] = index.rebuild((row.pop('pk'), row) for row in rows)
+
+    counts['facets.regulatory.legalframework'] = legal_framework_facets.rebuild(
+        LegalFramework.objects.filter(is_active=True).prefetch_related('tags').iterator(chunk_size=500)
+    )
+    documents = RegulatoryDocument.objects.filter(is_active=True).select_related('category')
+    for document in documents.iterator(chunk_size=500):
+        sync_document_tags(document)
+    counts['facets.regulatory.regulatorydocument'] = regulatory_document_facets.rebuild(
+        documents.prefetch_related('normalized_tags').iterator(chunk_size=500)
+    )
+
+    from .structure import norm_section_index
+
+    articles = NormSection.objects.filter(kind='articulo', framework__is_active=True)
+    rows = articles.values('pk', *norm_section_index.fields).iterator(chunk_size=500)
+    counts[norm_section_index.kind] = norm_section_index.rebuild((row.pop('pk'), row) for row in rows)
+    return counts
@@ -6,9 +6,14 @@ from bs4 import BeautifulSoup
 import re
 import logging
 from datetime import datetime
+from django.db import transaction
 from django.utils import timezone
+from django.utils.text import slugify
 from django.conf import settings
 
+from .caching import invalidate_frameworks
+from .extraction import charset_from_content_type, extract_norm_html, to_ascii
+
 logger = logging.getLogger(__name__)
 
 class LegalScrapingService:
@@ -60,8 +65,26 @@ class LegalScrapingService:
             
         return data
 
-    def scrape_norma_oficial(self, official_url: str, number: str, year: int):
-        """Scrapea una norma específica desde Función Pública usando su URL oficial."""
+    def scrape_norma_oficial(
+        self,
+        official_url: str,
+        number: str,
+        year: int,
+        content_selector: str = '',
+        use_fallback: bool = True,
+        conditional: bool = False,
+    ):
+        """Scrapea una norma específica desde Función Pública usando su URL oficial.
+
+        `content_selector` permite que una `ScrapingSource` indique el contenedor del
+        texto. Con `use_fallback=False` un fallo se reporta con `success=False` en lugar
+        de sustituir el contenido por el texto de respaldo, para que el orquestador
+        pueda reintentar. Con `conditional=True` la descarga usa la caché de
+        `ScrapedPage`; si la página no cambió se retorna `unchanged=True` sin analizarla.
+        """
+        if conditional:
+            return self._scrape_conditional(official_url, number, year, content_selector)
+
         data = {
             'title': f'Ley {number} de {year}',
             'summary': self._get_default_summary(),
@@ -74,76 +97,71 @@ class LegalScrapingService:
         }
 
         try:
-            content = self._scrape_funcion_publica_url(official_url)
+            content = self._scrape_funcion_publica_url(official_url, content_selector=content_selector, marker=str(number))
             if content:
                 data['content_scraped'] = content
                 data['success'] = True
+                data['sanitized'] = True
         except Exception as e:
             logger.error(f"Error scraping {official_url}: {str(e)}")
 
-        if not data['success']:
+        if not data['success'] and use_fallback:
             data['content_scraped'] = self._get_fallback_content()
             data['success'] = True
 
         return data
     
-    def _scrape_funcion_publica_url(self, url):
+    def _scrape_conditional(self, official_url, number, year, content_selector):
+        from .fetch_cache import ConditionalFetcher
+
+        data = {
+            'title': f'Ley {number} de {year}',
+            'official_url': official_url,
+            'content_scraped': '',
+            'success': False,
+            'unchanged': False,
+            'fetch': None,
+        }
+        try:
+            fetch = ConditionalFetcher(self.session).fetch(official_url)
+        except Exception as e:
+            logger.error(f"Error scraping {official_url}: {str(e)}")
+            return data
+
+        data['fetch'] = fetch
+        if not fetch.modified:
+            data.update(success=True, unchanged=True)
+            return data
+
+        content = self._extract_funcion_publica_html(fetch.body, content_selector, marker=str(number), encoding=fetch.encoding)
+        if content:
+            data.update(
+                success=True,
+                sanitized=True,
+                content_scraped=content,
+                unchanged=not fetch.is_new_content(content),
+            )
+        return data
+
+    def _scrape_funcion_publica_url(self, url, content_selector='', marker='1715'):
         """Scraping específico para el portal de Función Pública, preservando HTML cuando sea posible"""
         try:
             response = self.session.get(url, timeout=15)
             response.raise_for_status()
-            response.encoding = 'utf-8'  # Forzar encoding UTF-8
-
-            soup = BeautifulSoup(response.content, 'html.parser')
-
-            # Remover elementos no deseados globales
-            for element in soup(["script", "style", "nav", "footer", "header", "iframe"]):
-                element.decompose()
-
-            # 1) Intentar extraer HTML del contenedor principal conocido
-            container = soup.select_one('div.descripcion-contenido')
-            if not container:
-                container = soup.select_one('div.contenido, div#contenido, .norma-contenido, .documento, .texto-norma')
-            if container:
-                # HTML interno del contenedor (preserva títulos, negrillas, listas, etc.)
-                html = container.decode_contents().strip()
-                return html if html else None
-
-            # 2) Fallback a ensamblar texto (menos preferido)
-            content_sections = []
-
-            main_content = soup.find('div', class_='contenido') or soup.find('div', {'id': 'contenido'})
-            if main_content:
-                text = main_content.get_text("\n", strip=True)
-                text = self._clean_text(text)
-                content_sections.append(text)
-
-            for selector in ['.norma-contenido', '.documento', '.texto-norma', '.articulo']:
-                elements = soup.select(selector)
-                for element in elements:
-                    text = element.get_text("\n", strip=True)
-                    text = self._clean_text(text)
-                    if len(text) > 50 and '1715' in text:
-                        content_sections.append(text)
-
-            if not content_sections:
-                all_text = soup.get_text()
-                all_text = self._clean_text(all_text)
-                if '1715' in all_text and ('renovable' in all_text.lower() or 'energía' in all_text.lower()):
-                    paragraphs = soup.find_all('p')
-                    for p in paragraphs:
-                        text = p.get_text(" ", strip=True)
-                        text = self._clean_text(text)
-                        if len(text) > 100 and ('1715' in text or 'renovable' in text.lower()):
-                            content_sections.append(text)
-
-            final_content = '\n\n'.join(content_sections) if content_sections else None
-            return final_content
-
+            encoding = charset_from_content_type(response.headers.get('Content-Type', ''))
+            return self._extract_funcion_publica_html(response.content, content_selector, marker, encoding=encoding)
         except Exception as e:
             logger.error(f"Error en scraping específico de Función Pública {url}: {str(e)}")
             return None
-    
+
+    def _extract_funcion_publica_html(self, body, content_selector='', marker='1715', encoding=''):
+        """Extrae y sanitiza el contenido de la norma de una página de Función Pública ya descargada"""
+        try:
+            return extract_norm_html(body, content_selector=content_selector, marker=marker, encoding=encoding)
+        except Exception as e:
+            logger.error(f"Error extrayendo contenido de Función Pública: {str(e)}")
+            return None
+
     def _clean_text(self, text):
         """Limpia el texto de caracteres problemáticos y normaliza encoding"""
         if not text:
@@ -373,7 +391,7 @@ def _sanitize_scraped_content(instance, raw_content):
         sanitized_html = raw_content
 
     try:
-        return sanitized_html.encode('ascii', 'ignore').decode('ascii')
+        return to_ascii(sanitized_html)
     except Exception:
         import re as _re
         return _re.sub(r'[^\x00-\x7F<>/="\-\w\s]+', ' ', sanitized_html)
@@ -454,13 +472,31 @@ def update_legal_framework_entry(
             year=lookup['year']
         )
 
-    safe_content = _sanitize_scraped_content(legal_framework, scraped.get('content_scraped'))
+    now = timezone.now()
+    fetch = scraped.get('fetch')
+    if scraped.get('unchanged') and not created:
+        # Página sin cambios: no se sanitiza ni se reescribe el contenido
+        # `update` no dispara señales: se actualiza `updated_at` para renovar la caché del detalle
+        LegalFramework.objects.filter(pk=legal_framework.pk).update(last_scraped=now, updated_at=now)
+        invalidate_frameworks()
+        if fetch is not None:
+            fetch.commit(scraped.get('content_scraped') or None)
+        logger.info('Sin cambios en %s', official_url_to_use)
+        return legal_framework, created
+
+    if scraped.get('sanitized'):
+        # El extractor de lxml ya aplicó la política de sanitización en su única pasada
+        safe_content = scraped.get('content_scraped') or ''
+    else:
+        safe_content = _sanitize_scraped_content(legal_framework, scraped.get('content_scraped'))
 
     fields_to_update = {
         'content_scraped': safe_content,
-        'last_scraped': timezone.now(),
+        'last_scraped': now,
         'official_url': official_url_to_use,
     }
+    if safe_content != legal_framework.content_scraped:
+        fields_to_update['content_changed_at'] = now
 
     if defaults:
         for field in ('title', 'summary', 'main_objective', 'benefits_companies', 'benefits_citizens'):
@@ -471,10 +507,26 @@ def update_legal_framework_entry(
             if override_defaults or not current_value:
                 fields_to_update[field] = new_value
 
+    previous_content = legal_framework.content_scraped
+    previous_at = legal_framework.content_changed_at or legal_framework.last_scraped
     for field, value in fields_to_update.items():
         setattr(legal_framework, field, value)
 
-    legal_framework.save(update_fields=list(fields_to_update.keys()))
+    legal_framework.save(update_fields=list(fields_to_update.keys()) + ['updated_at'])
+    if fetch is not None:
+        fetch.commit(scraped.get('content_scraped'))
+
+    if 'content_changed_at' in fields_to_update:
+        from .structure import NormStructureService
+        from .versioning import VersionStore
+        try:
+            VersionStore().record_change(legal_framework, previous_content, previous_at)
+        except Exception:
+            logger.exception('No fue posible registrar la versión de %s', legal_framework)
+        try:
+            NormStructureService().rebuild(legal_framework)
+        except Exception:
+            logger.exception('No fue posible estructurar el texto de %s', legal_framework)
 
     action = 'creado' if created else 'actualizado'
     logger.info(
@@ -488,6 +540,112 @@ def update_legal_framework_entry(
     return legal_framework, created
 
 
+UPSERT_FIELDS = ('title', 'issuing_entity', 'official_url', 'summary', 'main_objective',
+                 'benefits_companies', 'benefits_citizens', 'is_active')
+
+
+def bulk_upsert_legal_frameworks(entries):
+    """Crea o actualiza en bloque marcos legales identificados por tipo, número y año.
+
+    Cada entrada es un diccionario con `document_type`, `document_number`, `year`
+    y opcionalmente los campos de `UPSERT_FIELDS` y `tags` (lista de nombres). Los
+    campos vacíos no sobrescriben valores existentes. Como `bulk_create` y
+    `bulk_update` no emiten señales, al final se reindexan la búsqueda y las
+    facetas de los registros afectados.
+
+    Retorna `(ids_creados, ids_actualizados)`.
+    """
+    from apps.regulatory.models import LegalFramework, RegulatoryTag
+
+    from .search import legal_framework_facets, legal_framework_index, index_values
+
+    by_key = {}
+    for entry in entries:
+        key = (entry['document_type'], str(entry['document_number']), int(entry['year']))
+        by_key[key] = entry
+
+    existing = {}
+    years = {key[2] for key in by_key}
+    numbers = {key[1] for key in by_key}
+    for framework in LegalFramework.objects.filter(year__in=years, document_number__in=numbers).defer('content_scraped'):
+        key = (framework.document_type, framework.document_number, framework.year)
+        if key in by_key:
+            existing[key] = framework
+
+    to_create, to_update, changed_fields = [], [], set()
+    for key, entry in by_key.items():
+        values = {field: entry[field] for field in UPSERT_FIELDS if entry.get(field) not in (None, '')}
+        framework = existing.get(key)
+        if framework is None:
+            document_type, document_number, year = key
+            values.setdefault('title', f"{dict(LegalFramework.DOCUMENT_TYPES).get(document_type, document_type.title())} {document_number} de {year}")
+            to_create.append(LegalFramework(
+                document_type=document_type, document_number=document_number, year=year, **values,
+            ))
+            continue
+        dirty = [field for field, value in values.items() if getattr(framework, field) != value]
+        if dirty:
+            for field in dirty:
+                setattr(framework, field, values[field])
+            changed_fields.update(dirty)
+            to_update.append(framework)
+
+    now = timezone.now()
+    with transaction.atomic():
+        LegalFramework.objects.bulk_create(to_create, batch_size=500)
+        if to_update:
+            for framework in to_update:
+                framework.updated_at = now
+            LegalFramework.objects.bulk_update(to_update, sorted(changed_fields) + ['updated_at'], batch_size=500)
+
+        # Los ids de los nuevos registros no siempre vuelven desde bulk_create
+        ids = {}
+        for framework in LegalFramework.objects.filter(year__in=years, document_number__in=numbers).only(
+            'pk', 'document_type', 'document_number', 'year',
+        ):
+            key = (framework.document_type, framework.document_number, framework.year)
+            if key in by_key:
+                ids[key] = framework.pk
+        created_ids = [ids[(obj.document_type, obj.document_number, obj.year)] for obj in to_create]
+        updated_ids = [framework.pk for framework in to_update]
+
+        tagged = {
+            ids[key]: {slugify(' '.join(name.split()))[:120]: name for name in entry['tags']}
+            for key, entry in by_key.items() if entry.get('tags')
+        }
+        Through = LegalFramework.tags.through
+        current = {}
+        for framework_id, slug in Through.objects.filter(legalframework_id__in=tagged).values_list(
+            'legalframework_id', 'regulatorytag__slug',
+        ):
+            current.setdefault(framework_id, set()).add(slug)
+        tagged = {framework_id: names for framework_id, names in tagged.items() if set(names) != current.get(framework_id)}
+        if tagged:
+            tags = {tag.slug: tag for tag in RegulatoryTag.from_names(
+                {name for names in tagged.values() for name in names.values()}
+            )}
+            Through.objects.filter(legalframework_id__in=tagged).delete()
+            Through.objects.bulk_create([
+                Through(legalframework_id=framework_id, regulatorytag_id=tags[slug].pk)
+                for framework_id, names in tagged.items()
+                for slug in names
+                if slug in tags
+            ], batch_size=1000)
+
+    affected = set(created_ids) | set(updated_ids) | set(tagged)
+    if affected:
+        frameworks = list(LegalFramework.objects.filter(pk__in=affected).prefetch_related('tags'))
+        active = [framework for framework in frameworks if framework.is_active]
+        legal_framework_index.remove_many(framework.pk for framework in frameworks if not framework.is_active)
+        legal_framework_index.index_many(
+            (framework.pk, index_values(framework, legal_framework_index)) for framework in active
+        )
+        legal_framework_facets.remove_many(framework.pk for framework in frameworks if not framework.is_active)
+        legal_framework_facets.index_many(active)
+        invalidate_frameworks()
+    return created_ids, updated_ids
+
+
 def update_ley_1715_data():
     """Función para actualizar la información de la Ley 1715"""
     service = LegalScrapingService()
@@ -0,0 +1,59 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from .caching import invalidate_frameworks
+from .models import LegalFramework, RegulatoryDocument
+from .search import FACET_INDEXES, INDEXES, index_facets, index_instance, sync_document_tags
+
+
+@receiver(post_save, sender=LegalFramework)
+@receiver(post_save, sender=RegulatoryDocument)
+def reindex_regulatory_text(sender, instance, **kwargs):
+    """Mantener el índice de búsqueda al día con cada edición o scraping"""
+    if sender is RegulatoryDocument:
+        sync_document_tags(instance)
+    index_instance(instance)
+
+
+@receiver(post_delete, sender=LegalFramework)
+@receiver(post_delete, sender=RegulatoryDocument)
+def remove_regulatory_text(sender, instance, **kwargs):
+    """Retirar del índice los documentos eliminados"""
+    INDEXES[sender].remove(instance.pk)
+    FACET_INDEXES[sender].remove(instance.pk)
+
+
+@receiver(pre_delete, sender=LegalFramework)
+def remove_framework_sections(sender, instance, **kwargs):
+    """Las secciones se borran en cascada; su índice de búsqueda no"""
+    from .structure import NormStructureService
+
+    NormStructureService.remove(list(instance.sections.values_list('pk', flat=True)))
+
+
+@receiver(post_save, sender=LegalFramework)
+@receiver(post_delete, sender=LegalFramework)
+@receiver(post_save, sender=RegulatoryDocument)
+@receiver(post_delete, sender=RegulatoryDocument)
+def invalidate_framework_pages(sender, instance, **kwargs):
+    """El listado y los conteos de facetas cambian con cualquier documento"""
+    invalidate_frameworks()
+
+
+@receiver(m2m_changed, sender=LegalFramework.tags.through)
+def refresh_framework_tag_facets(sender, instance, action, reverse, pk_set, **kwargs):
+    """Las etiquetas se asignan después de guardar el marco legal"""
+    if reverse and action == 'pre_clear':
+        # Tras vaciar la relación ya no se sabe qué marcos legales la tenían
+        instance._cleared_framework_ids = list(instance.frameworks.values_list('pk', flat=True))
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if reverse:
+        ids = pk_set if action != 'post_clear' else getattr(instance, '_cleared_framework_ids', [])
+        frameworks = LegalFramework.objects.filter(pk__in=ids).prefetch_related('tags')
+    else:
+        frameworks = [instance]
+    for framework in frameworks:
+        index_facets(framework)
+    invalidate_frameworks()
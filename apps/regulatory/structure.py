@@ -0,0 +1,229 @@
+"""
+Índice estructurado del texto oficial de las normas
+
+Divide el HTML sanitizado de `LegalFramework.content_scraped` en títulos,
+capítulos, artículos y parágrafos (`NormSection`). Cada sección tiene un ancla
+estable derivada de su numeración (`articulo-11`, `capitulo-ii`,
+`articulo-11-paragrafo-1`), de modo que los enlaces sobreviven a un nuevo
+scraping. Los artículos se indexan por separado para que la búsqueda lleve
+directamente al artículo relevante.
+"""
+import re
+from dataclasses import dataclass, field
+from html import escape
+from typing import List, Optional
+
+from django.db import transaction
+from django.utils import timezone
+from lxml import etree, html
+
+from apps.core.search import SearchIndex
+
+from .extraction import normalize_text
+from .models import LegalFramework, NormSection
+
+# El contenido scrapeado se guarda en ASCII, por eso las tildes son opcionales
+HEADING_RE = re.compile(
+    r'^(?P<kind>T[IÍ]?TULO|CAP[IÍ]?TULO|ART[IÍ]?CULO|PAR[AÁ]?GRAFO)\b\.?\s*'
+    r'(?P<number>\d+(?:[A-Z]\b)?|[IVXLCDM]+\b|[UÚ]?NICO\b|TRANSITORIO\b)?'
+    r'(?:\s*[oº°](?![a-z]))?\.?\s*(?P<rest>.*)$',
+    re.S,
+)
+KIND_BY_PREFIX = {'T': 'titulo', 'C': 'capitulo', 'A': 'articulo', 'P': 'paragrafo'}
+LEVELS = {'preambulo': 0, 'titulo': 0, 'capitulo': 1, 'articulo': 2, 'paragrafo': 3}
+TOC_KINDS = ('preambulo', 'titulo', 'capitulo', 'articulo')
+KIND_LABELS = dict(NormSection.KINDS)
+
+norm_section_index = SearchIndex('regulatory.normsection', {
+    'heading': 3,
+    'content_text': 1,
+})
+
+
+@dataclass
+class ParsedSection:
+    kind: str
+    number: str
+    heading: str
+    anchor: str
+    parent: Optional['ParsedSection'] = None
+    blocks: List[str] = field(default_factory=list)
+    texts: List[str] = field(default_factory=list)
+
+    def add(self, markup, text):
+        self.blocks.append(markup)
+        if text:
+            self.texts.append(text)
+
+
+def _slug(value):
+    value = normalize_text(value or '').lower()
+    if value in ('nico', 'unico', 'único'):
+        return 'unico'
+    return re.sub(r'[^a-z0-9]+', '-', value).strip('-')
+
+
+def _bold_text(element):
+    for bold in element.iter('b', 'strong'):
+        text = normalize_text(' '.join(bold.itertext()))
+        if text:
+            return text
+    return ''
+
+
+def _heading(kind, number, bold):
+    """Encabezado legible: la etiqueta con tildes más el epígrafe en negrilla, si existe."""
+    label = KIND_LABELS[kind]
+    heading = f'{label} {number}'.strip()
+    match = HEADING_RE.match(bold) if bold else None
+    title = match.group('rest').strip(' .') if match else ''
+    return f'{heading}. {title}' if title else heading
+
+
+class NormStructureParser:
+    """Convierte el HTML de una norma en una lista ordenada de `ParsedSection`."""
+
+    def parse(self, content):
+        if not content or '<' not in content:
+            return []
+        root = html.fragment_fromstring(content, create_parent='div')
+
+        self.sections = []
+        self.anchors = set()
+        self.current = {}
+        preamble = ParsedSection('preambulo', '', 'Encabezado', 'preambulo')
+        target = preamble
+        pending_chapter = None
+
+        if root.text and root.text.strip():
+            target.add(escape(root.text), normalize_text(root.text))
+
+        for element in root:
+            text = normalize_text(' '.join(element.itertext()))
+            markup = etree.tostring(element, method='html', encoding='unicode', with_tail=False)
+            match = HEADING_RE.match(text) if isinstance(element.tag, str) else None
+
+            if match and (match.group('number') or match.group('kind')[0] == 'P'):
+                kind = KIND_BY_PREFIX[match.group('kind')[0]]
+                if kind == 'paragrafo' and 'articulo' not in self.current:
+                    target.add(markup, text)
+                else:
+                    number = match.group('number') or ''
+                    target = self._open(kind, number, _heading(kind, number, _bold_text(element)))
+                    target.add(markup, text)
+                    pending_chapter = target if kind in ('titulo', 'capitulo') and not match.group('rest') else None
+            elif pending_chapter is not None and text and len(text) < 200 and text.upper() == text:
+                # Nombre del título o capítulo en el párrafo siguiente al número
+                pending_chapter.heading = f'{pending_chapter.heading}. {text.strip(" .")}'[:500]
+                target.add(markup, '')
+                pending_chapter = None
+            else:
+                target.add(markup, text)
+                pending_chapter = None
+
+            if element.tail and element.tail.strip():
+                target.add(escape(element.tail), normalize_text(element.tail))
+
+        if preamble.texts:
+            self.sections.insert(0, preamble)
+        return self.sections
+
+    def _open(self, kind, number, heading):
+        level = LEVELS[kind]
+        for other, other_level in LEVELS.items():
+            if other_level >= level:
+                self.current.pop(other, None)
+
+        parent = None
+        for other in ('articulo', 'capitulo', 'titulo'):
+            if LEVELS[other] < level and other in self.current:
+                parent = self.current[other]
+                break
+
+        if kind == 'paragrafo':
+            siblings = sum(1 for section in self.sections if section.parent is parent and section.kind == kind)
+            base = f'{parent.anchor}-paragrafo-{_slug(number) or siblings + 1}'
+        elif kind == 'capitulo' and 'titulo' in self.current:
+            base = f'{self.current["titulo"].anchor}-capitulo-{_slug(number)}'
+        else:
+            base = f'{kind}-{_slug(number)}'
+
+        anchor, suffix = base[:120], 2
+        while anchor in self.anchors:
+            anchor = f'{base[:115]}-{suffix}'
+            suffix += 1
+        self.anchors.add(anchor)
+
+        section = ParsedSection(kind, number, heading[:500], anchor, parent=parent)
+        self.current[kind] = section
+        self.sections.append(section)
+        return section
+
+
+class NormStructureService:
+    """Reconstruye las secciones de un marco legal y su índice de búsqueda."""
+
+    def rebuild(self, framework):
+        """Reemplaza las secciones del marco legal. Retorna cuántas se crearon."""
+        parsed = NormStructureParser().parse(framework.content_scraped)
+
+        content = self._nested_content(parsed)
+
+        with transaction.atomic():
+            old_ids = list(framework.sections.values_list('pk', flat=True))
+            framework.sections.all().delete()
+            norm_section_index.remove_many(old_ids)
+
+            saved = {}
+            for level in sorted(set(LEVELS.values())):
+                rows = [
+                    NormSection(
+                        framework=framework,
+                        parent_id=saved[id(section.parent)] if section.parent else None,
+                        kind=section.kind,
+                        number=section.number,
+                        heading=section.heading,
+                        anchor=section.anchor,
+                        position=position,
+                        content_html=content[id(section)][0],
+                        content_text=content[id(section)][1],
+                    )
+                    for position, section in enumerate(parsed)
+                    if LEVELS[section.kind] == level
+                ]
+                if not rows:
+                    continue
+                NormSection.objects.bulk_create(rows, batch_size=500)
+                ids = dict(
+                    framework.sections.filter(anchor__in=[row.anchor for row in rows]).values_list('anchor', 'pk')
+                )
+                for section in parsed:
+                    if section.anchor in ids:
+                        saved[id(section)] = ids[section.anchor]
+
+            articles = framework.sections.filter(kind='articulo').values('pk', 'heading', 'content_text')
+            norm_section_index.index_many(
+                (row.pop('pk'), row) for row in articles.iterator(chunk_size=500)
+            )
+            # Las secciones forman parte del detalle cacheado por `updated_at`
+            LegalFramework.objects.filter(pk=framework.pk).update(updated_at=timezone.now())
+        return len(parsed)
+
+    @staticmethod
+    def _nested_content(parsed):
+        """HTML y texto de cada sección; un artículo incluye el de sus parágrafos."""
+        result = {}
+        for index, section in enumerate(parsed):
+            blocks, texts = list(section.blocks), list(section.texts)
+            if section.kind == 'articulo':
+                for child in parsed[index + 1:]:
+                    if LEVELS[child.kind] <= LEVELS['articulo']:
+                        break
+                    blocks.extend(child.blocks)
+                    texts.extend(child.texts)
+            result[id(section)] = ('\n'.join(blocks), ' '.join(texts))
+        return result
+
+    @staticmethod
+    def remove(section_ids):
+        norm_section_index.remove_many(section_ids)
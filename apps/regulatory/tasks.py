@@ -1,4 +1,10 @@
+import logging
+import random
+
 from celery import shared_task
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
 
 
 @shared_task
@@ -13,3 +19,90 @@ def update_ley_2099_task():
     """Tarea Celery para actualizar la Ley 2099 desde la fuente oficial."""
     from .services import update_ley_2099_data
     update_ley_2099_data()
+
+
+@shared_task
+def run_scraping_orchestrator_task(trigger='schedule'):
+    """Tarea programada: encola el scraping de todos los marcos legales activos."""
+    from .scraping import ScrapingOrchestrator
+
+    run = ScrapingOrchestrator().start_run(trigger=trigger)
+    return run.pk
+
+
+@shared_task(bind=True, max_retries=None, acks_late=True)
+def scrape_legal_framework_task(self, item_id):
+    """Scrapea un marco legal de una ejecución respetando el límite por host.
+
+    Los intentos se cuentan en `ScrapingRunItem.attempts`, no en los reintentos de
+    Celery, para que esperar turno por un host ocupado no agote los intentos.
+    """
+    from .models import ScrapingRunItem
+    from .scraping import ScrapingFailed, ScrapingOrchestrator
+
+    item = (
+        ScrapingRunItem.objects.select_related('framework', 'source')
+        .filter(pk=item_id, status__in=['pending', 'running'])
+        .first()
+    )
+    if item is None:
+        return None
+
+    orchestrator = ScrapingOrchestrator()
+    if not orchestrator.slots.acquire(item.host):
+        raise self.retry(countdown=random.uniform(2, 10))
+
+    try:
+        orchestrator.process(item)
+    except ScrapingFailed as exc:
+        if item.attempts < orchestrator.max_attempts:
+            raise self.retry(exc=exc, countdown=orchestrator.backoff(item.attempts))
+        orchestrator.record(item, 'failed', error=str(exc))
+    except Exception as exc:
+        # Cualquier otro error (datos inválidos, base de datos, parser) cierra la tarea
+        # para que la ejecución pueda terminar en lugar de quedar 'running'
+        logger.exception('Error inesperado al scrapear %s', item.url)
+        orchestrator.record(item, 'failed', error=str(exc) or exc.__class__.__name__)
+    finally:
+        orchestrator.slots.release(item.host)
+    return item_id
+
+
+@shared_task(bind=True, max_retries=3, rate_limit=settings.AI_SUMMARY_RATE_LIMIT)
+def generate_ai_content_task(self, official_url, document_number, document_type, year, framework_id=None):
+    """Genera resumen, objetivo y beneficios con IA para el formulario de administración.
+
+    Retorna `{'result': {...}}` o `{'error': '...'}`; los errores transitorios del
+    proveedor se reintentan con backoff exponencial.
+    """
+    from .ai_content import AIContentError, AISummaryService
+    from .models import LegalFramework
+
+    framework = LegalFramework.objects.filter(pk=framework_id).first() if framework_id else None
+    service = AISummaryService()
+    try:
+        content_text = service.source_text(official_url, document_number, year, framework)
+        result, from_cache = service.generate(content_text, document_type, document_number, year)
+    except AIContentError as exc:
+        if exc.__cause__ is not None and self.request.retries < self.max_retries:
+            raise self.retry(exc=exc, countdown=30 * 2 ** self.request.retries)
+        return {'error': str(exc)}
+    return {'result': result, 'cached': from_cache}
+
+
+@shared_task(bind=True, max_retries=3, rate_limit=settings.AI_SUMMARY_RATE_LIMIT)
+def generate_framework_summary_task(self, framework_id, overwrite=False):
+    """Genera y guarda el contenido con IA de un marco legal (carga masiva)."""
+    from .ai_content import AIContentError, AISummaryService
+    from .models import LegalFramework
+
+    framework = LegalFramework.objects.filter(pk=framework_id).first()
+    if framework is None:
+        return None
+    try:
+        fields, _ = AISummaryService().generate_for_framework(framework, overwrite=overwrite)
+    except AIContentError as exc:
+        if exc.__cause__ is not None and self.request.retries < self.max_retries:
+            raise self.retry(exc=exc, countdown=30 * 2 ** self.request.retries)
+        return {'error': str(exc)}
+    return {'updated': fields}
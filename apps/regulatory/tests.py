@@ -1,3 +1,144 @@
-from django.test import TestCase
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+
+from .extraction import extract_norm_html
+from .models import LegalFramework, ScrapingRun
+from .scraping import HostSlots, ScrapingOrchestrator
+from .tasks import scrape_legal_framework_task
+from .versioning import VersionStore
+
+
+class ExtractNormHtmlHrefTests(SimpleTestCase):
+    """Los enlaces con esquemas peligrosos no deben sobrevivir a la extracción."""
+
+    def extract_link(self, href):
+        body = f'<html><body><div class="contenido"><p><a href="{href}">Artículo 1</a></p></div></body></html>'
+        return extract_norm_html(body)
+
+    def assertHrefDropped(self, href):
+        content = self.extract_link(href)
+        self.assertIn('<a>', content)
+        self.assertNotIn('href', content)
+
+    def test_allowed_link_is_kept(self):
+        self.assertIn('href="https://www.funcionpublica.gov.co/norma"', self.extract_link('https://www.funcionpublica.gov.co/norma'))
+
+    def test_relative_link_is_kept(self):
+        self.assertIn('href="/norma/1715"', self.extract_link('/norma/1715'))
+
+    def test_javascript_scheme_is_dropped(self):
+        self.assertHrefDropped('javascript:alert(1)')
+        self.assertHrefDropped(' JavaScript:alert(1)')
+
+    def test_tab_in_scheme_is_dropped(self):
+        self.assertHrefDropped('java\tscript:alert(1)')
+        self.assertHrefDropped('java&#9;script:alert(1)')
+
+    def test_newline_in_scheme_is_dropped(self):
+        self.assertHrefDropped('java\nscript:alert(1)')
+        self.assertHrefDropped('java&#10;script:alert(1)')
+        self.assertHrefDropped('java&#13;script:alert(1)')
+
+    def test_entity_encoded_scheme_is_dropped(self):
+        self.assertHrefDropped('&#106;avascript:alert(1)')
+        self.assertHrefDropped('&#x6A;&#x61;vascript&#58;alert(1)')
+        self.assertHrefDropped('\x01javascript:alert(1)')
+
+    def test_scheme_rebuilt_by_ascii_transliteration_is_dropped(self):
+        # to_ascii convierte los caracteres de ancho completo y elimina el guion suave
+        self.assertHrefDropped('ｊａｖａｓｃｒｉｐｔ：alert(1)')
+        self.assertHrefDropped('java&#173;script:alert(1)')
+
+    def test_unknown_named_entity_stays_escaped(self):
+        content = self.extract_link('javascript&colon;alert(1)')
+        self.assertNotIn('href="javascript:', content)
+
+
+class ExtractNormHtmlEncodingTests(SimpleTestCase):
+    """Las páginas que no vienen en UTF-8 deben extraerse sin fallar."""
+
+    def page(self, head=''):
+        return f'<html><head>{head}</head><body><div class="contenido"><p>Artículo 1. Definición</p></div></body></html>'
+
+    def test_meta_charset_is_respected(self):
+        body = self.page('<meta charset="iso-8859-1">').encode('latin-1')
+        self.assertIn('Articulo 1. Definicion', extract_norm_html(body))
+
+    def test_header_charset_is_respected(self):
+        body = self.page().encode('latin-1')
+        self.assertIn('Articulo 1. Definicion', extract_norm_html(body, encoding='ISO-8859-1'))
+
+    def test_invalid_bytes_do_not_abort_extraction(self):
+        self.assertIn('Artculo 1. Definicin', extract_norm_html(self.page().encode('latin-1')))
+
+
+class HostSlotsTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_limit_per_host(self):
+        slots = HostSlots(limit=2, ttl=60, cache=cache)
+        self.assertTrue(slots.acquire('www.funcionpublica.gov.co'))
+        self.assertTrue(slots.acquire('www.funcionpublica.gov.co'))
+        self.assertFalse(slots.acquire('www.funcionpublica.gov.co'))
+        self.assertTrue(slots.acquire('www.minenergia.gov.co'))
+        slots.release('www.funcionpublica.gov.co')
+        self.assertTrue(slots.acquire('www.funcionpublica.gov.co'))
+
+    def test_each_acquire_renews_the_counter_ttl(self):
+        slots = HostSlots(limit=2, ttl=60, cache=cache)
+        slots.acquire('www.funcionpublica.gov.co')
+        with mock.patch.object(cache, 'touch', wraps=cache.touch) as touch:
+            slots.acquire('www.funcionpublica.gov.co')
+        touch.assert_called_once_with('regulatory:scraping-host:www.funcionpublica.gov.co', 60)
+
+
+class ScrapeTaskErrorTests(TestCase):
+    def setUp(self):
+        self.framework = LegalFramework.objects.create(
+            title='Ley 1715 de 2014', document_type='ley', document_number='1715', year=2014,
+            official_url='https://www.funcionpublica.gov.co/eva/gestornormativo/norma.php?i=57353',
+        )
+        self.run = ScrapingOrchestrator().start_run([self.framework], trigger='command', dispatch=False)
+        self.item = self.run.items.get()
+
+    def test_unexpected_error_fails_the_item_and_finishes_the_run(self):
+        with mock.patch.object(ScrapingOrchestrator, 'process', side_effect=KeyError('contenido')):
+            scrape_legal_framework_task.apply(args=[self.item.pk])
+
+        self.item.refresh_from_db()
+        self.assertEqual(self.item.status, 'failed')
+        self.assertIn('contenido', self.item.error)
+        run = ScrapingRun.objects.get(pk=self.run.pk)
+        self.assertEqual(run.status, 'partial')
+        self.assertIsNotNone(run.finished_at)
+
+
+class VersionCompareAPITests(TestCase):
+    def setUp(self):
+        self.framework = LegalFramework.objects.create(
+            title='Ley 2099 de 2021', document_type='ley', document_number='2099', year=2021,
+        )
+        store = VersionStore()
+        store.record(self.framework, '<p>Artículo 1. Texto original.</p>')
+        store.record(self.framework, '<p>Artículo 1. Texto modificado.</p>')
+        self.url = reverse('api:regulatory_version_compare', args=[self.framework.pk])
+
+    def test_known_versions_are_compared(self):
+        response = self.client.get(self.url, {'from': 1, 'to': 2})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['from']['number'], 1)
+        self.assertEqual(response.json()['to']['number'], 2)
+
+    def test_unknown_from_version_is_not_found(self):
+        self.assertEqual(self.client.get(self.url, {'from': 9, 'to': 2}).status_code, 404)
+
+    def test_unknown_to_version_is_not_found(self):
+        self.assertEqual(self.client.get(self.url, {'from': 1, 'to': 9}).status_code, 404)
+
+    def test_non_numeric_version_is_rejected(self):
+        self.assertEqual(self.client.get(self.url, {'from': 'uno', 'to': 2}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {'from': 1, 'to': 'ultima'}).status_code, 400)
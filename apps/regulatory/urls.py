@@ -30,8 +30,10 @@ urlpatterns = [
     path('admin/frameworks/nuevo/', views.LegalFrameworkCreateView.as_view(), name='admin_framework_create'),
     path('admin/frameworks/<int:pk>/editar/', views.LegalFrameworkUpdateView.as_view(), name='admin_framework_update'),
     path('admin/frameworks/<int:pk>/scrape/', views.LegalFrameworkScrapeView.as_view(), name='admin_framework_scrape'),
+    path('admin/frameworks/scrape/', views.LegalFrameworkScrapeAllView.as_view(), name='admin_framework_scrape_all'),
     path('admin/frameworks/<int:pk>/eliminar/', views.LegalFrameworkDeleteView.as_view(), name='admin_framework_delete'),
     path('admin/frameworks/generar-contenido/', views.LegalFrameworkGenerateContentView.as_view(), name='admin_framework_generate_ai'),
+    path('admin/frameworks/generar-contenido/<str:task_id>/', views.LegalFrameworkGenerateContentStatusView.as_view(), name='admin_framework_generate_ai_status'),
     
     # Actualización AJAX de la Ley 1715
     path('api/update-ley-1715/', views.update_ley_1715_view, name='update_ley_1715'),
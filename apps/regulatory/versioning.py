@@ -0,0 +1,150 @@
+"""
+Historial de versiones del texto oficial de las normas
+
+El HTML de cada versión se divide en bloques (párrafos, filas, encabezados) que
+se guardan una sola vez en `ContentChunk`, direccionados por su hash. Una
+versión es la lista ordenada de ids de sus bloques, de modo que el espacio
+ocupado crece con lo que cambia entre scrapings y no con su número.
+
+Comparar dos versiones es comparar dos listas de enteros; solo se cargan de la
+base de datos los bloques que difieren.
+"""
+import hashlib
+import re
+from difflib import SequenceMatcher
+
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+from lxml import html
+
+from .extraction import normalize_text
+from .models import ContentChunk, LegalFrameworkVersion
+
+# Los bloques terminan después de cada etiqueta de cierre de bloque o salto de línea
+BLOCK_END_RE = re.compile(r'(?<=</p>)|(?<=</li>)|(?<=</tr>)|(?<=</h[1-4]>)|(?<=</blockquote>)|(?<=<br>)|(?<=\n)')
+MAX_CHUNK_CHARS = 4000
+DIFF_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def _hash(value):
+    return hashlib.sha256(value.encode('utf-8')).hexdigest()
+
+
+def split_blocks(content):
+    """Divide el contenido en bloques cuya concatenación reproduce el original."""
+    blocks = []
+    for block in BLOCK_END_RE.split(content or ''):
+        while len(block) > MAX_CHUNK_CHARS:
+            cut = block.rfind(' ', 0, MAX_CHUNK_CHARS)
+            cut = cut + 1 if cut > 0 else MAX_CHUNK_CHARS
+            blocks.append(block[:cut])
+            block = block[cut:]
+        if block:
+            blocks.append(block)
+    return blocks
+
+
+def block_text(block):
+    """Texto plano de un bloque para mostrar cambios a los editores."""
+    if '<' not in block:
+        return normalize_text(block)
+    try:
+        return normalize_text(html.fragment_fromstring(block, create_parent='div').text_content())
+    except Exception:  # noqa: broad-except  (fragmentos sin etiquetas balanceadas)
+        return normalize_text(re.sub(r'<[^>]+>', ' ', block))
+
+
+class VersionStore:
+    """Registra, reconstruye y compara versiones del contenido de un marco legal."""
+
+    def store_chunks(self, blocks):
+        """Guarda los bloques que aún no existen y retorna sus ids en orden."""
+        hashes = [_hash(block) for block in blocks]
+        unique = dict(zip(hashes, blocks))
+        ids = dict(ContentChunk.objects.filter(hash__in=unique).values_list('hash', 'pk'))
+        missing = [ContentChunk(hash=value, content=unique[value]) for value in unique if value not in ids]
+        if missing:
+            ContentChunk.objects.bulk_create(missing, batch_size=500, ignore_conflicts=True)
+            ids.update(
+                ContentChunk.objects.filter(hash__in=[chunk.hash for chunk in missing]).values_list('hash', 'pk')
+            )
+        return [ids[value] for value in hashes]
+
+    def record(self, framework, content, created_at=None):
+        """Registra `content` como nueva versión si difiere de la última. Retorna la versión o None."""
+        content = content or ''
+        content_hash = _hash(content)
+        with transaction.atomic():
+            latest = (
+                LegalFrameworkVersion.objects.select_for_update()
+                .filter(framework=framework)
+                .only('pk', 'number', 'content_hash', 'chunk_ids')
+                .first()
+            )
+            if latest is not None and latest.content_hash == content_hash:
+                return None
+
+            chunk_ids = self.store_chunks(split_blocks(content))
+            added = removed = 0
+            if latest is not None:
+                for tag, i1, i2, j1, j2 in SequenceMatcher(None, latest.chunk_ids, chunk_ids, autojunk=False).get_opcodes():
+                    if tag != 'equal':
+                        removed += i2 - i1
+                        added += j2 - j1
+            else:
+                added = len(chunk_ids)
+
+            return LegalFrameworkVersion.objects.create(
+                framework=framework,
+                number=(latest.number if latest else 0) + 1,
+                content_hash=content_hash,
+                chunk_ids=chunk_ids,
+                size=len(content),
+                added_blocks=added,
+                removed_blocks=removed,
+                created_at=created_at or timezone.now(),
+            )
+
+    def record_change(self, framework, previous_content, previous_at=None):
+        """Registra el contenido actual del marco legal; si aún no tiene historial,
+        guarda antes el contenido anterior como versión inicial."""
+        if previous_content and not framework.versions.exists():
+            self.record(framework, previous_content, created_at=previous_at)
+        return self.record(framework, framework.content_scraped)
+
+    def content(self, version):
+        """HTML completo de una versión."""
+        chunks = ContentChunk.objects.in_bulk(set(version.chunk_ids))
+        return ''.join(chunks[pk].content for pk in version.chunk_ids)
+
+    def diff(self, old, new):
+        """Cambios entre dos versiones: lista de `{op, before, after}` en texto plano.
+
+        Las versiones no cambian una vez creadas, así que el resultado se cachea.
+        """
+        key = f'regulatory:version-diff:{old.pk}:{new.pk}'
+        changes = cache.get(key)
+        if changes is not None:
+            return changes
+
+        opcodes = [
+            opcode for opcode in SequenceMatcher(None, old.chunk_ids, new.chunk_ids, autojunk=False).get_opcodes()
+            if opcode[0] != 'equal'
+        ]
+        needed = set()
+        for _, i1, i2, j1, j2 in opcodes:
+            needed.update(old.chunk_ids[i1:i2])
+            needed.update(new.chunk_ids[j1:j2])
+        chunks = dict(ContentChunk.objects.filter(pk__in=needed).values_list('pk', 'content'))
+
+        changes = []
+        for tag, i1, i2, j1, j2 in opcodes:
+            before = ' '.join(filter(None, (block_text(chunks[pk]) for pk in old.chunk_ids[i1:i2])))
+            after = ' '.join(filter(None, (block_text(chunks[pk]) for pk in new.chunk_ids[j1:j2])))
+            if before == after:
+                # Solo cambió el marcado
+                continue
+            changes.append({'op': tag, 'position': j1, 'before': before, 'after': after})
+        cache.set(key, changes, DIFF_CACHE_TIMEOUT)
+        return changes
@@ -1,20 +1,32 @@
 import json
+from datetime import datetime, time
 
-from bs4 import BeautifulSoup
-from django.conf import settings
+from celery.result import AsyncResult
 from django.shortcuts import render, get_object_or_404, redirect
 from django.views.generic import ListView, DetailView, TemplateView, CreateView, UpdateView, View
 from django.utils.decorators import method_decorator
 from django.views.decorators.cache import cache_page
 from django.contrib import messages
 from django.http import JsonResponse
-from openai import OpenAI
 
-from .models import LegalFramework, RegulatoryCategory, RegulatoryDocument
-from .services import update_ley_1715_data, update_ley_2099_data, update_legal_framework_entry, LegalScrapingService
+from .models import LegalFramework, LegalFrameworkVersion, NormSection, RegulatoryCategory, RegulatoryDocument
+from .services import update_ley_1715_data, update_ley_2099_data
 from .forms import LegalFrameworkForm
+from .ai_content import AISummaryService, html_to_text
+from .caching import FRAGMENT_TIMEOUT, facet_counts, frameworks_version
+from .scraping import ScrapingOrchestrator
+from .search import (
+    legal_framework_facets, legal_framework_index, regulatory_document_facets, regulatory_document_index,
+)
+from .structure import TOC_KINDS, norm_section_index
+from .tasks import generate_ai_content_task
+from .versioning import VersionStore
+from apps.core.search import RankedResults
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
-from django.urls import reverse_lazy
+from django.urls import reverse, reverse_lazy
+from django.utils import timezone
+from django.utils.cache import patch_cache_control
+from django.utils.dateparse import parse_date
 import logging
 
 logger = logging.getLogger(__name__)
@@ -27,7 +39,16 @@ class LegalFrameworkListView(ListView):
     paginate_by = 12
     
     def get_queryset(self):
-        return LegalFramework.objects.filter(is_active=True).select_related()
+        # El listado no muestra el texto oficial; se evita cargarlo
+        return LegalFramework.objects.filter(is_active=True).defer('content_scraped')
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context.update({
+            'list_version': frameworks_version(),
+            'fragment_timeout': FRAGMENT_TIMEOUT,
+        })
+        return context
 
 
 class LegalFrameworkDetailView(DetailView):
@@ -42,11 +63,12 @@ class LegalFrameworkDetailView(DetailView):
         year = self.kwargs['year']
         document_type = self.kwargs.get('document_type')
 
+        # El texto completo solo se carga si la norma aún no tiene secciones
         queryset = LegalFramework.objects.filter(
             document_number=document_number,
             year=year,
             is_active=True,
-        )
+        ).defer('content_scraped')
         if document_type:
             queryset = queryset.filter(document_type=document_type)
         return get_object_or_404(queryset)
@@ -59,6 +81,11 @@ class LegalFrameworkDetailView(DetailView):
             'meta_description': framework.summary[:150] if framework.summary else '',
             'show_update_button': self.request.user.is_staff,
             'pdf_url': self._build_pdf_url(framework.official_url),
+            # Consulta perezosa: no se ejecuta si el fragmento del detalle está en caché
+            'sections': framework.sections.filter(kind__in=TOC_KINDS).only(
+                'kind', 'heading', 'anchor', 'framework_id',
+            ),
+            'fragment_timeout': FRAGMENT_TIMEOUT,
         })
         return context
 
@@ -143,70 +170,277 @@ class DocumentDetailView(TemplateView):
     template_name = 'regulatory/document_detail.html'
 
 class LegalFrameworkSearchView(ListView):
-    """Búsqueda avanzada de marcos legales."""
+    """Búsqueda avanzada de marcos legales con facetas."""
 
     template_name = 'regulatory/search.html'
     context_object_name = 'results'
     paginate_by = 12
 
-    def get_queryset(self):
-        from django.db.models import Q, Value, IntegerField, Case, When
+    def selected_facets(self):
+        return {
+            'type': (self.request.GET.get('type') or '').strip(),
+            'entity': (self.request.GET.get('entity') or '').strip(),
+            'year': (self.request.GET.get('year') or '').strip(),
+            'tag': [tag for tag in self.request.GET.getlist('tag') if tag],
+        }
 
-        qs = LegalFramework.objects.filter(is_active=True)
+    def get_queryset(self):
+        qs = LegalFramework.objects.filter(is_active=True).defer('content_scraped')
 
         q = (self.request.GET.get('q') or '').strip()
-        year = (self.request.GET.get('year') or '').strip()
-        entity = (self.request.GET.get('entity') or '').strip()
         ordering = (self.request.GET.get('ordering') or 'relevance').strip() or 'relevance'
+        selected = self.selected_facets()
+        filtered = any(selected.values())
 
-        if year:
-            qs = qs.filter(year=year)
-
-        if entity:
-            qs = qs.filter(issuing_entity__iexact=entity)
+        # Los filtros se resuelven sobre el índice de facetas y el texto sobre el
+        # índice invertido; solo se cargan los objetos de la página solicitada.
+        qs = legal_framework_facets.filter(qs, selected)
 
-        if q:
-            search_filter = (
-                Q(title__icontains=q) |
-                Q(summary__icontains=q) |
-                Q(main_objective__icontains=q) |
-                Q(benefits_companies__icontains=q) |
-                Q(benefits_citizens__icontains=q)
-            )
-            qs = qs.filter(search_filter)
-
-            relevance = (
-                Case(When(title__icontains=q, then=Value(5)), default=Value(0), output_field=IntegerField()) +
-                Case(When(summary__icontains=q, then=Value(3)), default=Value(0), output_field=IntegerField()) +
-                Case(When(main_objective__icontains=q, then=Value(2)), default=Value(0), output_field=IntegerField()) +
-                Case(When(benefits_companies__icontains=q, then=Value(1)), default=Value(0), output_field=IntegerField()) +
-                Case(When(benefits_citizens__icontains=q, then=Value(1)), default=Value(0), output_field=IntegerField())
+        if not q:
+            self.facet_counts = facet_counts(
+                {**selected, 'tag': tuple(selected['tag'])},
+                lambda: legal_framework_facets.counts(qs.values('pk')),
             )
-            qs = qs.annotate(relevance=relevance)
-        else:
-            qs = qs.annotate(relevance=Value(0, output_field=IntegerField()))
+            return qs.order_by('-year', 'document_type', 'document_number')
+
+        object_ids = list(qs.values_list('pk', flat=True)) if filtered else None
+        ranked = legal_framework_index.search(q, object_ids=object_ids)
+        self.facet_counts = legal_framework_facets.counts([pk for pk, _ in ranked])
 
         if ordering == 'date':
-            qs = qs.order_by('-year', 'document_type', 'document_number')
-        else:
-            qs = qs.order_by('-relevance', '-year', 'document_type', 'document_number')
+            scores = dict(ranked)
+            ordered_ids = qs.filter(pk__in=scores).order_by(
+                '-year', 'document_type', 'document_number'
+            ).values_list('pk', flat=True)
+            ranked = [(pk, scores[pk]) for pk in ordered_ids]
 
-        return qs
+        return RankedResults(qs, ranked)
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        qs_base = LegalFramework.objects.filter(is_active=True)
+        selected = self.selected_facets()
+        params = self.request.GET.copy()
+        params.pop('page', None)
         context.update({
             'q': (self.request.GET.get('q') or '').strip(),
-            'selected_year': (self.request.GET.get('year') or '').strip(),
-            'selected_entity': (self.request.GET.get('entity') or '').strip(),
+            'selected_type': selected['type'],
+            'selected_year': selected['year'],
+            'selected_entity': selected['entity'],
+            'selected_tags': selected['tag'],
             'selected_ordering': (self.request.GET.get('ordering') or 'relevance').strip() or 'relevance',
-            'available_years': qs_base.order_by('-year').values_list('year', flat=True).distinct(),
-            'available_entities': qs_base.exclude(issuing_entity='').order_by('issuing_entity').values_list('issuing_entity', flat=True).distinct(),
+            'facets': {
+                **self.facet_counts,
+                'year': sorted(self.facet_counts['year'], key=lambda option: option['value'], reverse=True),
+            },
+            'querystring': params.urlencode(),
         })
         return context
 
 
+class RegulatoryDocumentFacetAPIView(View):
+    """Búsqueda de documentos regulatorios con conteos por tipo, entidad, año, categoría y etiqueta."""
+
+    limit = 20
+
+    def get(self, request):
+        q = (request.GET.get('q') or '').strip()
+        selected = {facet: request.GET.getlist(facet) for facet in regulatory_document_facets.facets}
+        qs = regulatory_document_facets.filter(RegulatoryDocument.objects.filter(is_active=True), selected)
+
+        if q:
+            filtered = any(selected.values())
+            ranked = regulatory_document_index.search(
+                q, object_ids=list(qs.values_list('pk', flat=True)) if filtered else None,
+            )
+            ids = [pk for pk, _ in ranked]
+            counts = regulatory_document_facets.counts(ids)
+            documents = qs.in_bulk(ids[:self.limit])
+            page = [documents[pk] for pk in ids[:self.limit] if pk in documents]
+            total = len(ids)
+        else:
+            counts = regulatory_document_facets.counts(qs.values('pk'))
+            page = list(qs.only('pk', 'title', 'document_number', 'document_type', 'publication_date')[:self.limit])
+            total = qs.count()
+
+        return JsonResponse({
+            'q': q,
+            'total': total,
+            'facets': counts,
+            'results': [
+                {
+                    'id': document.pk,
+                    'title': document.title,
+                    'document_number': document.document_number,
+                    'type': document.get_document_type_display(),
+                    'publication_date': document.publication_date,
+                    'url': reverse('regulatory:document_detail', args=[document.pk]),
+                }
+                for document in page
+            ],
+        })
+
+
+# API de secciones y versiones de las normas
+@method_decorator(cache_page(60 * 5), name='dispatch')
+class NormSectionListAPIView(View):
+    """Tabla de contenido de una norma: títulos, capítulos y artículos sin su texto."""
+
+    def get(self, request, pk):
+        framework = get_object_or_404(LegalFramework.objects.only('pk'), pk=pk, is_active=True)
+        sections = framework.sections.filter(kind__in=TOC_KINDS).values(
+            'kind', 'number', 'heading', 'anchor', 'parent__anchor',
+        )
+        data = [
+            {
+                'kind': section['kind'],
+                'number': section['number'],
+                'heading': section['heading'],
+                'anchor': section['anchor'],
+                'parent': section['parent__anchor'],
+                'url': reverse('api:regulatory_section_detail', args=[pk, section['anchor']]),
+            }
+            for section in sections
+        ]
+        response = JsonResponse({'framework': pk, 'sections': data})
+        patch_cache_control(response, public=True, max_age=300)
+        return response
+
+
+@method_decorator(cache_page(60 * 5), name='dispatch')
+class NormSectionDetailAPIView(View):
+    """Texto de una sección (artículo con sus parágrafos, capítulo, etc.) por su ancla."""
+
+    def get(self, request, pk, anchor):
+        section = get_object_or_404(
+            NormSection.objects.select_related('parent'),
+            framework_id=pk,
+            framework__is_active=True,
+            anchor=anchor,
+        )
+        response = JsonResponse({
+            'framework': pk,
+            'kind': section.kind,
+            'number': section.number,
+            'heading': section.heading,
+            'anchor': section.anchor,
+            'parent': section.parent.anchor if section.parent else None,
+            'html': section.content_html,
+        })
+        patch_cache_control(response, public=True, max_age=300)
+        return response
+
+
+class NormSectionSearchAPIView(View):
+    """Búsqueda por artículo: retorna los artículos más relevantes con su ancla."""
+
+    limit = 20
+
+    def get(self, request):
+        q = (request.GET.get('q') or '').strip()
+        ranked = norm_section_index.search(q)[:self.limit] if q else []
+        sections = NormSection.objects.filter(
+            pk__in=[pk for pk, _ in ranked], framework__is_active=True,
+        ).select_related('framework').only(
+            'pk', 'heading', 'anchor', 'content_text',
+            'framework__document_type', 'framework__document_number', 'framework__year', 'framework__title',
+        ).in_bulk()
+
+        results = []
+        for pk, score in ranked:
+            section = sections.get(pk)
+            if section is None:
+                continue
+            framework = section.framework
+            detail_url = reverse('regulatory:legal_framework_detail', args=[
+                framework.document_type, framework.document_number, framework.year,
+            ])
+            results.append({
+                'framework': framework.title,
+                'heading': section.heading,
+                'anchor': section.anchor,
+                'snippet': section.content_text[:240],
+                'score': round(score, 4),
+                'url': f'{detail_url}#{section.anchor}',
+            })
+        return JsonResponse({'q': q, 'results': results})
+
+
+@method_decorator(cache_page(60 * 5), name='dispatch')
+class LegalFrameworkVersionListAPIView(View):
+    """Historial de versiones del texto oficial de una norma, sin su contenido."""
+
+    def get(self, request, pk):
+        framework = get_object_or_404(LegalFramework.objects.only('pk'), pk=pk, is_active=True)
+        versions = framework.versions.values(
+            'number', 'created_at', 'size', 'added_blocks', 'removed_blocks',
+        )
+        data = [
+            {
+                **version,
+                'url': reverse('api:regulatory_version_detail', args=[pk, version['number']]),
+            }
+            for version in versions
+        ]
+        return JsonResponse({'framework': pk, 'versions': data})
+
+
+class LegalFrameworkVersionDetailAPIView(View):
+    """HTML completo de una versión reconstruido a partir de sus bloques."""
+
+    def get(self, request, pk, number):
+        version = get_object_or_404(
+            LegalFrameworkVersion, framework_id=pk, framework__is_active=True, number=number,
+        )
+        response = JsonResponse({
+            'framework': pk,
+            'number': version.number,
+            'created_at': version.created_at,
+            'html': VersionStore().content(version),
+        })
+        # Una versión no cambia una vez creada
+        patch_cache_control(response, public=True, max_age=60 * 60 * 24)
+        return response
+
+
+class LegalFrameworkVersionCompareAPIView(View):
+    """Cambios entre dos versiones.
+
+    Acepta `from` y `to` (números de versión) o `since` (fecha AAAA-MM-DD), que
+    compara la versión vigente en esa fecha con la más reciente.
+    """
+
+    def get(self, request, pk):
+        framework = get_object_or_404(LegalFramework.objects.only('pk'), pk=pk, is_active=True)
+        versions = framework.versions.only('pk', 'number', 'chunk_ids', 'created_at')
+        numbers = {name: request.GET.get(name, '').strip() for name in ('from', 'to')}
+        if any(value and not value.isdigit() for value in numbers.values()):
+            return JsonResponse({'error': 'Los números de versión "from" y "to" deben ser enteros.'}, status=400)
+
+        new = versions.filter(number=numbers['to']).first() if numbers['to'] else versions.first()
+        if new is None:
+            return JsonResponse({'error': 'La versión solicitada no existe.'}, status=404)
+
+        since = parse_date(request.GET.get('since') or '')
+        if numbers['from']:
+            old = versions.filter(number=numbers['from']).first()
+            if old is None:
+                return JsonResponse({'error': f'La versión {numbers["from"]} no existe.'}, status=404)
+        elif since is not None:
+            # Versión vigente al final de ese día; si no hay ninguna anterior, todo el historial es nuevo
+            moment = timezone.make_aware(datetime.combine(since, time.max))
+            old = versions.filter(created_at__lte=moment).order_by('-number').first() or versions.order_by('number').first()
+        else:
+            return JsonResponse({'error': 'Indica las versiones con "from" y "to", o una fecha con "since".'}, status=400)
+
+        changes = VersionStore().diff(old, new) if old.pk != new.pk else []
+        return JsonResponse({
+            'framework': pk,
+            'from': {'number': old.number, 'created_at': old.created_at},
+            'to': {'number': new.number, 'created_at': new.created_at},
+            'changes': changes,
+        })
+
+
 class AdminRoleRequiredMixin(LoginRequiredMixin, UserPassesTestMixin):
     """Restringe el acceso a usuarios con rol administrativo."""
 
@@ -257,32 +491,24 @@ class LegalFrameworkUpdateView(AdminRoleRequiredMixin, UpdateView):
 
 
 class LegalFrameworkScrapeView(AdminRoleRequiredMixin, View):
-    """Ejecuta el scraping y actualización para un marco legal específico."""
+    """Programa el scraping y actualización de un marco legal específico."""
 
     def post(self, request, pk):
         framework = get_object_or_404(LegalFramework, pk=pk)
+        run = ScrapingOrchestrator().start_run([framework], trigger='admin', requested_by=request.user)
+        if run.total:
+            messages.success(request, f'Se programó la actualización de {framework.title}. El contenido se actualizará en unos minutos.')
+        else:
+            messages.warning(request, 'La fuente oficial de este marco legal está desactivada.')
+        return redirect('regulatory:admin_framework_list')
 
-        try:
-            update_legal_framework_entry(
-                document_type=framework.document_type,
-                document_number=framework.document_number,
-                year=framework.year,
-                official_url=framework.official_url,
-                defaults={
-                    'title': framework.title,
-                    'summary': framework.summary,
-                    'main_objective': framework.main_objective,
-                    'benefits_companies': framework.benefits_companies,
-                    'benefits_citizens': framework.benefits_citizens,
-                    'official_url': framework.official_url,
-                },
-            )
-            messages.success(request, f'Se actualizó el contenido oficial de {framework.title}.')
-        except ValueError as exc:
-            messages.warning(request, str(exc))
-        except Exception as exc:
-            messages.error(request, f'No fue posible completar el scraping: {exc}')
 
+class LegalFrameworkScrapeAllView(AdminRoleRequiredMixin, View):
+    """Programa el scraping de todos los marcos legales activos."""
+
+    def post(self, request):
+        run = ScrapingOrchestrator().start_run(trigger='admin', requested_by=request.user)
+        messages.success(request, f'Se programó la actualización de {run.total} marcos legales.')
         return redirect('regulatory:admin_framework_list')
 
 
@@ -331,72 +557,36 @@ class LegalFrameworkGenerateContentView(AdminRoleRequiredMixin, View):
         except (TypeError, ValueError):
             return JsonResponse({'error': 'El año debe ser un número válido.'}, status=400)
 
-        scraper = LegalScrapingService()
-        scraped = scraper.scrape_norma_oficial(official_url, number=str(document_number), year=year_int)
-        content_html = scraped.get('content_scraped') or ''
-
-        if not content_html:
-            return JsonResponse({'error': 'No se pudo obtener el contenido oficial para generar texto. Verifica la URL.'}, status=400)
-
-        soup = BeautifulSoup(content_html, 'html.parser')
-        content_text = soup.get_text(separator=' ', strip=True)
-        content_text = content_text[:6000]
-
-        if not settings.OPENAI_API_KEY:
-            return JsonResponse({'error': 'No hay una API Key configurada para la generación con IA.'}, status=500)
-
-        client = OpenAI(api_key=settings.OPENAI_API_KEY)
-
-        system_prompt = (
-            "Eres un analista legal colombiano. Elaboras resúmenes claros de instrumentos normativos y detallas sus objetivos "
-            "y beneficios para empresas y ciudadanos. Siempre respondes en español neutro, tono profesional y en formato JSON." 
-        )
-
-        user_prompt = (
-            "Responde exclusivamente con un objeto JSON siguiendo exactamente esta estructura: "
-            "{\"summary\": \"...\", \"main_objective\": \"...\", \"benefits_companies\": \"...\", \"benefits_citizens\": \"...\"}. "
-            "No agregues texto adicional fuera del JSON. Utiliza el texto oficial para redactar cada campo con máximo 3 párrafos por elemento. "
-            "Texto fuente:\n\n"
-            f"Tipo de documento: {document_type}\nNúmero: {document_number}\nAño: {year_int}\n\n{content_text}"
+        # Con el contenido ya scrapeado y un resultado previo, la respuesta es inmediata
+        service = AISummaryService()
+        if framework is not None and framework.content_scraped and framework.official_url == official_url:
+            content_text = html_to_text(framework.content_scraped)
+            result = service.cached(content_text, document_type, document_number, year_int)
+            if result is not None:
+                return JsonResponse(result)
+
+        task = generate_ai_content_task.delay(
+            official_url, str(document_number), document_type, year_int,
+            framework_id=framework.pk if framework else None,
         )
-
-        try:
-            response = client.responses.create(
-                model='gpt-4.1-2025-04-14',
-                temperature=0.2,
-                input=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt},
-                ],
-            )
-            ai_output = (response.output_text or '').strip()
-        except Exception as exc:  # noqa: broad-except
-            logger.exception("OpenAI API error when generating legal summary")
-            return JsonResponse({'error': f'La API de IA devolvió un error: {exc}'}, status=502)
-
-        try:
-            data = json.loads(ai_output)
-        except json.JSONDecodeError:
-            import re
-
-            match = re.search(r"\{.*\}", ai_output, re.DOTALL)
-            if match:
-                try:
-                    data = json.loads(match.group(0))
-                except json.JSONDecodeError:
-                    logger.error("Parsed JSON fragment still invalid: %s", match.group(0)[:300])
-                    return JsonResponse({'error': 'No fue posible interpretar la respuesta de la IA. Inténtalo de nuevo.'}, status=500)
-            else:
-                logger.error("IA response could not be parsed as JSON: %s", ai_output[:300])
-                return JsonResponse({'error': 'No fue posible interpretar la respuesta de la IA. Inténtalo de nuevo.'}, status=500)
-
-        required_keys = {'summary', 'main_objective', 'benefits_companies', 'benefits_citizens'}
-        if not required_keys.issubset(data.keys()):
-            return JsonResponse({'error': 'La respuesta de la IA no contiene todos los campos requeridos.'}, status=500)
-
         return JsonResponse({
-            'summary': data['summary'],
-            'main_objective': data['main_objective'],
-            'benefits_companies': data['benefits_companies'],
-            'benefits_citizens': data['benefits_citizens'],
-        })
+            'task_id': task.id,
+            'status_url': reverse('regulatory:admin_framework_generate_ai_status', args=[task.id]),
+        }, status=202)
+
+
+class LegalFrameworkGenerateContentStatusView(AdminRoleRequiredMixin, View):
+    """Estado de una generación con IA encolada."""
+
+    def get(self, request, task_id):
+        task = AsyncResult(task_id)
+        if not task.ready():
+            return JsonResponse({'status': 'pending'}, status=202)
+        if task.failed():
+            logger.error("AI content task %s failed: %s", task_id, task.result)
+            return JsonResponse({'error': 'La API de IA devolvió un error. Inténtalo de nuevo.'}, status=502)
+
+        outcome = task.result or {}
+        if outcome.get('error'):
+            return JsonResponse({'error': outcome['error']}, status=400)
+        return JsonResponse(outcome['result'])
@@ -1,7 +1,7 @@
 from django.contrib import admin
 from django.db.models.functions import Now
 
-from .models import BlogPost, BlogCategory, BlogImage, BlogComment, BlogReaction, BlogReport
+from .models import BlogPost, BlogCategory, BlogImage, BlogComment, BlogReaction, BlogRelatedPost, BlogReport
 
 
 class BlogImageInline(admin.TabularInline):
@@ -12,12 +12,12 @@ class BlogImageInline(admin.TabularInline):
 
 @admin.register(BlogPost)
 class BlogPostAdmin(admin.ModelAdmin):
-    list_display = ('title', 'category', 'is_active', 'created_at')
+    list_display = ('title', 'category', 'comment_count', 'reaction_count', 'is_active', 'created_at')
     list_filter = ('category', 'is_active', 'created_at')
     search_fields = ('title', 'content')
     prepopulated_fields = {'slug': ('title',)}
     inlines = [BlogImageInline]
-    readonly_fields = ('created_at', 'updated_at')
+    readonly_fields = ('comment_count', 'reaction_count', 'created_at', 'updated_at')
 
 
 @admin.register(BlogCategory)
@@ -30,10 +30,10 @@ class BlogCategoryAdmin(admin.ModelAdmin):
 
 @admin.register(BlogImage)
 class BlogImageAdmin(admin.ModelAdmin):
-    list_display = ('post', 'caption', 'created_at')
+    list_display = ('post', 'caption', 'width', 'height', 'processed_at', 'created_at')
     list_filter = ('created_at',)
     search_fields = ('caption', 'post__title')
-    readonly_fields = ('created_at', 'updated_at')
+    readonly_fields = ('width', 'height', 'processed_at', 'created_at', 'updated_at')
 
 
 @admin.register(BlogComment)
@@ -56,6 +56,14 @@ class BlogReactionAdmin(admin.ModelAdmin):
     readonly_fields = ('created_at', 'updated_at')
 
 
+@admin.register(BlogRelatedPost)
+class BlogRelatedPostAdmin(admin.ModelAdmin):
+    list_display = ('post', 'rank', 'related', 'score', 'created_at')
+    list_select_related = ('post', 'related')
+    search_fields = ('post__title', 'related__title')
+    readonly_fields = ('post', 'related', 'score', 'rank', 'created_at', 'updated_at')
+
+
 @admin.register(BlogReport)
 class BlogReportAdmin(admin.ModelAdmin):
     list_display = ('target_type', 'post', 'comment', 'reporter', 'status', 'created_at', 'processed_at')
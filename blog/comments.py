@@ -0,0 +1,63 @@
+"""
+Carga de hilos de comentarios en un número fijo de consultas
+
+Cada comentario guarda su ruta materializada (`path`): los ids de sus ancestros
+en base 36 con ancho fijo. Una página de hilos son dos consultas, sin importar
+la profundidad ni la cantidad de respuestas. La primera trae los comentarios
+raíz paginados por cursor y la segunda trae todas sus respuestas activas por
+prefijo de ruta, ya ordenadas para armar el árbol en memoria.
+"""
+from functools import reduce
+from operator import or_
+
+from django.db.models import Q
+
+from apps.core.pagination import KeysetPaginator
+
+from .models import BlogComment
+
+
+class CommentTree:
+    """Hilos activos de una publicación, paginados por comentario raíz."""
+
+    ordering = ('created_at', 'id')
+
+    def __init__(self, post, per_page=20):
+        self.post = post
+        self.per_page = per_page
+
+    def page(self, cursor=None):
+        """Retorna la página de comentarios raíz con sus respuestas en `tree_children`.
+
+        Lanza `InvalidCursor` si el cursor no corresponde a este listado.
+        """
+        roots = BlogComment.objects.filter(post=self.post, parent__isnull=True, is_active=True).select_related('author')
+        page = KeysetPaginator(roots, self.ordering, self.per_page).page(cursor)
+        self.attach_replies(page.object_list)
+        return page
+
+    def attach_replies(self, roots):
+        nodes = {}
+        for root in roots:
+            root.tree_children = []
+            if root.path:
+                nodes[root.path] = root
+        if not nodes:
+            return roots
+
+        separator = BlogComment.PATH_SEPARATOR
+        prefixes = reduce(or_, (Q(path__startswith=path + separator) for path in nodes))
+        replies = (
+            BlogComment.objects.filter(prefixes, post=self.post, is_active=True)
+            .select_related('author')
+            .order_by('path')
+        )
+        for reply in replies:
+            parent = nodes.get(reply.path.rpartition(separator)[0])
+            if parent is None:
+                # Su ancestro está oculto: el subárbol completo se oculta con él
+                continue
+            reply.tree_children = []
+            parent.tree_children.append(reply)
+            nodes[reply.path] = reply
+        return roots
@@ -0,0 +1,103 @@
+"""
+Procesamiento de las imágenes subidas al blog
+
+Las fotos llegan tal cual salen del teléfono: varios megabytes, rotadas por
+EXIF y con metadatos como la ubicación. Cada imagen se procesa una vez en
+segundo plano. El original se reemplaza por una copia sin metadatos y con un
+ancho máximo, y se generan variantes WebP y JPEG/PNG por ancho para `srcset`.
+"""
+import io
+import posixpath
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.utils import timezone
+from PIL import Image, ImageOps
+
+VARIANT_WIDTHS = (320, 640, 1280)
+MAX_WIDTH = 2560
+JPEG_QUALITY = 82
+WEBP_QUALITY = 78
+
+
+class ImageProcessingError(Exception):
+    """La imagen no se pudo leer o procesar."""
+
+
+def _encode(picture, fmt):
+    buffer = io.BytesIO()
+    if fmt == 'JPEG':
+        picture.convert('RGB').save(buffer, 'JPEG', quality=JPEG_QUALITY, optimize=True, progressive=True)
+    elif fmt == 'WEBP':
+        picture.save(buffer, 'WEBP', quality=WEBP_QUALITY, method=6)
+    else:
+        picture.save(buffer, 'PNG', optimize=True)
+    return buffer.getvalue()
+
+
+def _resize(picture, width):
+    if picture.width <= width:
+        return picture
+    height = round(picture.height * width / picture.width)
+    return picture.resize((width, height), Image.Resampling.LANCZOS)
+
+
+def variants_dir(blog_image):
+    return f'blog/variants/{blog_image.pk}'
+
+
+def delete_variants(blog_image):
+    for variant in blog_image.variants or []:
+        default_storage.delete(variant['name'])
+
+
+def process_image(blog_image):
+    """Limpia el original, genera las variantes y registra dimensiones de `blog_image`.
+
+    Escribe con `update()` para no volver a disparar el procesamiento desde las
+    señales de guardado.
+    """
+    try:
+        with blog_image.image.open('rb') as handle:
+            picture = Image.open(handle)
+            picture.load()
+    except (OSError, ValueError, Image.DecompressionBombError) as exc:
+        raise ImageProcessingError(f'No se pudo leer la imagen: {exc}') from exc
+
+    # Aplicar la rotación EXIF antes de descartar los metadatos
+    picture = ImageOps.exif_transpose(picture)
+    has_alpha = picture.mode in ('RGBA', 'LA') or (picture.mode == 'P' and 'transparency' in picture.info)
+    picture = picture.convert('RGBA' if has_alpha else 'RGB')
+    picture = _resize(picture, MAX_WIDTH)
+    fallback_format, fallback_ext = ('PNG', 'png') if has_alpha else ('JPEG', 'jpg')
+
+    # Las imágenes nuevas se escriben con pixeles solamente: sin EXIF, ICC ni XMP
+    old_name = blog_image.image.name
+    stem = posixpath.splitext(posixpath.basename(old_name))[0]
+    original_name = default_storage.save(
+        f'blog/{stem}.{fallback_ext}', ContentFile(_encode(picture, fallback_format)),
+    )
+
+    delete_variants(blog_image)
+    variants = []
+    widths = sorted({min(width, picture.width) for width in VARIANT_WIDTHS})
+    for width in widths:
+        resized = _resize(picture, width)
+        for fmt, ext, kind in (('WEBP', 'webp', 'webp'), (fallback_format, fallback_ext, 'fallback')):
+            name = default_storage.save(f'{variants_dir(blog_image)}/{width}.{ext}', ContentFile(_encode(resized, fmt)))
+            variants.append({'format': kind, 'width': resized.width, 'height': resized.height, 'name': name})
+
+    type(blog_image).objects.filter(pk=blog_image.pk).update(
+        image=original_name,
+        width=picture.width,
+        height=picture.height,
+        variants=variants,
+        processed_at=timezone.now(),
+    )
+    if old_name != original_name:
+        default_storage.delete(old_name)
+
+    blog_image.image.name = original_name
+    blog_image.width, blog_image.height = picture.width, picture.height
+    blog_image.variants = variants
+    return blog_image
@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+
+from blog.images import ImageProcessingError, process_image
+from blog.models import BlogImage
+from blog.tasks import process_blog_image_task
+
+
+class Command(BaseCommand):
+    help = (
+        'Genera las variantes responsivas (WebP y JPEG/PNG) de las imágenes del blog y elimina sus metadatos. '
+        'Por defecto procesa solo las imágenes pendientes.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help='Reprocesa también las imágenes ya procesadas.')
+        parser.add_argument('--async', dest='use_async', action='store_true', help='Encola las imágenes en Celery.')
+
+    def handle(self, *args, **options):
+        images = BlogImage.objects.exclude(image='')
+        if not options['all']:
+            images = images.filter(processed_at__isnull=True)
+
+        processed = 0
+        for image in images.order_by('id').iterator(chunk_size=50):
+            if options['use_async']:
+                process_blog_image_task.delay(image.pk)
+                processed += 1
+                continue
+            try:
+                process_image(image)
+            except ImageProcessingError as exc:
+                self.stderr.write(self.style.WARNING(f'⚠️  Imagen #{image.pk}: {exc}'))
+                continue
+            processed += 1
+            self.stdout.write(f'🖼️  Imagen #{image.pk}: {image.width}x{image.height}, {len(image.variants)} variantes')
+
+        verb = 'encoladas' if options['use_async'] else 'procesadas'
+        self.stdout.write(self.style.SUCCESS(f'✅ {processed} imagen(es) {verb}.'))
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from blog.related import TOP_N, rebuild_related
+
+
+class Command(BaseCommand):
+    help = (
+        'Recalcula las publicaciones relacionadas del blog (similitud TF-IDF dentro de cada categoría). '
+        'Se ejecuta cada noche desde Celery; úsalo tras cargas masivas o para poblar la tabla la primera vez.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top', type=int, default=TOP_N, help=f'Vecinos por publicación (por defecto {TOP_N}).')
+
+    def handle(self, *args, **options):
+        for category, total in rebuild_related(options['top']).items():
+            self.stdout.write(f'  {category}: {total} relaciones')
+        self.stdout.write(self.style.SUCCESS('✅ Publicaciones relacionadas actualizadas.'))
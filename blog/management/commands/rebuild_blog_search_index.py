@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from blog.search import rebuild_index
+
+
+class Command(BaseCommand):
+    help = (
+        'Reconstruye el índice de búsqueda de las publicaciones del blog. '
+        'Solo es necesario la primera vez o tras cargas masivas que omiten las señales de guardado.'
+    )
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.SUCCESS(f'blog.blogpost: {rebuild_index()} publicaciones indexadas.'))
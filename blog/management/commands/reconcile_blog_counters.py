@@ -0,0 +1,56 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+
+from blog.models import BlogComment, BlogPost, BlogReaction
+from blog.reactions import ReactionService
+
+
+def count_subquery(model, **filters):
+    rows = (
+        model.objects.filter(post=OuterRef('pk'), **filters)
+        .order_by().values('post').annotate(total=Count('id')).values('total')
+    )
+    return Coalesce(Subquery(rows), 0)
+
+
+class Command(BaseCommand):
+    help = (
+        'Recalcula los contadores de comentarios y reacciones de las publicaciones del blog. '
+        'Las señales los mantienen al día; solo es necesario tras cambios con update() o cargas directas.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Solo muestra las publicaciones con diferencias.')
+
+    def handle(self, *args, **options):
+        # Aplicar primero las reacciones pendientes en caché para no contarlas dos veces
+        if not options['dry_run']:
+            ReactionService().flush()
+        real = {
+            'real_comments': count_subquery(BlogComment, is_active=True),
+            'real_reactions': count_subquery(BlogReaction),
+        }
+        drifted = BlogPost.objects.annotate(**real).filter(
+            ~Q(comment_count=F('real_comments')) | ~Q(reaction_count=F('real_reactions'))
+        )
+
+        fixed = 0
+        for post in drifted.only('pk', 'title', 'comment_count', 'reaction_count').iterator():
+            fixed += 1
+            self.stdout.write(
+                f'🔄 {post}: comentarios {post.comment_count} → {post.real_comments}, '
+                f'reacciones {post.reaction_count} → {post.real_reactions}'
+            )
+
+        if not fixed:
+            self.stdout.write(self.style.SUCCESS('✅ Todos los contadores están al día.'))
+            return
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING(f'{fixed} publicación(es) con diferencias (sin cambios).'))
+            return
+
+        BlogPost.objects.filter(pk__in=drifted.values('pk')).update(
+            comment_count=real['real_comments'], reaction_count=real['real_reactions'],
+        )
+        self.stdout.write(self.style.SUCCESS(f'✅ Se corrigieron {fixed} publicación(es).'))
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from blog.spam import MIN_EXAMPLES, SpamFilter
+
+
+class Command(BaseCommand):
+    help = (
+        'Entrena el filtro de spam de comentarios anónimos con los reportes ya moderados. '
+        'Se ejecuta cada noche desde Celery; úsalo para entrenarlo sin esperar.'
+    )
+
+    def handle(self, *args, **options):
+        result = SpamFilter().train()
+        if result is None:
+            self.stdout.write(self.style.WARNING(
+                f'Faltan ejemplos: se necesitan al menos {MIN_EXAMPLES} comentarios spam y {MIN_EXAMPLES} legítimos. '
+                'Mientras tanto solo se aplican los límites y las reglas.'
+            ))
+            return
+        spam, ham = result
+        self.stdout.write(self.style.SUCCESS(f'Filtro entrenado con {spam} comentarios spam y {ham} legítimos.'))
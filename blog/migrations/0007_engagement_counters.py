@@ -0,0 +1,50 @@
+# Generated by Django 5.0.6 on 2026-10-19 11:37
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_subquery(model, **filters):
+    rows = (
+        model.objects.filter(post=OuterRef('pk'), **filters)
+        .order_by().values('post').annotate(total=Count('id')).values('total')
+    )
+    return Coalesce(Subquery(rows), 0)
+
+
+def backfill_counters(apps, schema_editor):
+    BlogPost = apps.get_model('blog', 'BlogPost')
+    BlogComment = apps.get_model('blog', 'BlogComment')
+    BlogReaction = apps.get_model('blog', 'BlogReaction')
+    BlogPost.objects.update(
+        comment_count=count_subquery(BlogComment, is_active=True),
+        reaction_count=count_subquery(BlogReaction),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0006_auto_add_default_categories'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blogpost',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Comentarios activos'),
+        ),
+        migrations.AddField(
+            model_name='blogpost',
+            name='reaction_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Reacciones'),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='blogpost',
+            index=models.Index(fields=['is_active', '-comment_count', '-reaction_count', '-created_at'], name='blog_post_popular_idx'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.0.6 on 2026-10-19 11:38
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0007_engagement_counters'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='blogpost',
+            name='blog_post_popular_idx',
+        ),
+        migrations.AddIndex(
+            model_name='blogpost',
+            index=models.Index(fields=['is_active', '-created_at', '-id'], name='blog_post_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='blogpost',
+            index=models.Index(fields=['is_active', '-comment_count', '-reaction_count', '-created_at', '-id'], name='blog_post_popular_idx'),
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 5.0.6 on 2026-10-19 11:39
+
+from django.conf import settings
+from django.db import migrations, models
+
+DIGITS = '0123456789abcdefghijklmnopqrstuvwxyz'
+
+
+def segment(pk):
+    value = ''
+    while pk:
+        pk, remainder = divmod(pk, 36)
+        value = DIGITS[remainder] + value
+    return value.rjust(7, '0')
+
+
+def backfill_paths(apps, schema_editor):
+    BlogComment = apps.get_model('blog', 'BlogComment')
+    # Igual que BlogComment.save(): al llegar al largo máximo la respuesta se cuelga del ancestro más profundo posible
+    max_parent_length = 255 - 7 - 1
+    paths = {}
+    parents = {}
+    batch = []
+    # Los padres siempre tienen un id menor que sus respuestas
+    for pk, parent_id in BlogComment.objects.order_by('id').values_list('id', 'parent_id').iterator():
+        while parent_id in paths and len(paths[parent_id]) > max_parent_length:
+            parent_id = parents[parent_id]
+        parent_path = paths.get(parent_id)
+        paths[pk] = f'{parent_path}/{segment(pk)}' if parent_path else segment(pk)
+        parents[pk] = parent_id
+        batch.append(BlogComment(pk=pk, path=paths[pk], parent_id=parent_id))
+        if len(batch) >= 1000:
+            BlogComment.objects.bulk_update(batch, ['path', 'parent'])
+            batch = []
+    BlogComment.objects.bulk_update(batch, ['path', 'parent'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0008_feed_keyset_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blogcomment',
+            name='path',
+            field=models.CharField(blank=True, default='', editable=False, max_length=255, verbose_name='Ruta en el hilo'),
+        ),
+        migrations.RunPython(backfill_paths, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='blogcomment',
+            index=models.Index(fields=['post', 'path'], name='blog_comment_path_idx'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.0.6 on 2026-10-19 11:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0009_comment_paths'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blogimage',
+            name='height',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True, verbose_name='Alto'),
+        ),
+        migrations.AddField(
+            model_name='blogimage',
+            name='processed_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='Fecha de procesamiento'),
+        ),
+        migrations.AddField(
+            model_name='blogimage',
+            name='variants',
+            field=models.JSONField(blank=True, default=list, editable=False, verbose_name='Variantes generadas'),
+        ),
+        migrations.AddField(
+            model_name='blogimage',
+            name='width',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True, verbose_name='Ancho'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.6 on 2026-10-19 11:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0010_image_variants'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='blogpost',
+            name='slug',
+            field=models.SlugField(blank=True, help_text='Se genera a partir del título si se deja vacío', max_length=220, unique=True, verbose_name='Slug'),
+        ),
+    ]
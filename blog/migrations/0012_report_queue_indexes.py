@@ -0,0 +1,23 @@
+# Generated by Django 5.0.6 on 2026-10-19 11:47
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0011_slug_allocation'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='blogreport',
+            index=models.Index(fields=['status', 'created_at', 'id'], name='blog_report_queue_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='blogreport',
+            index=models.Index(fields=['status', 'post', 'comment'], name='blog_report_target_idx'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.0.6 on 2026-10-19 11:51
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0012_report_queue_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BlogRelatedPost',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now, help_text='Fecha y hora en que se creó el registro', verbose_name='Fecha de creación')),
+                ('updated_at', models.DateTimeField(auto_now=True, help_text='Fecha y hora de la última actualización', verbose_name='Fecha de actualización')),
+                ('is_active', models.BooleanField(default=True, help_text='Indica si el registro está activo', verbose_name='Activo')),
+                ('score', models.FloatField(verbose_name='Similitud')),
+                ('rank', models.PositiveSmallIntegerField(verbose_name='Posición')),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='related_links', to='blog.blogpost', verbose_name='Publicación')),
+                ('related', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='blog.blogpost', verbose_name='Publicación relacionada')),
+            ],
+            options={
+                'verbose_name': 'Publicación relacionada',
+                'verbose_name_plural': 'Publicaciones relacionadas',
+                'ordering': ['post', 'rank'],
+                'indexes': [models.Index(fields=['post', 'rank'], name='blog_related_rank_idx')],
+                'unique_together': {('post', 'related')},
+            },
+        ),
+    ]
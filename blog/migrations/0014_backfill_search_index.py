@@ -0,0 +1,26 @@
+from django.db import migrations
+
+from blog.search import blog_post_index
+
+
+def backfill_search_index(apps, schema_editor):
+    BlogPost = apps.get_model('blog', 'BlogPost')
+    rows = BlogPost.objects.filter(is_active=True).values('pk', *blog_post_index.fields).iterator(chunk_size=500)
+    blog_post_index.rebuild(((row.pop('pk'), row) for row in rows), apps=apps)
+
+
+def clear_search_index(apps, schema_editor):
+    SearchDocument = apps.get_model('core', 'SearchDocument')
+    SearchDocument.objects.filter(kind=blog_post_index.kind).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0013_related_posts'),
+        ('core', '0001_search_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_search_index, clear_search_index),
+    ]
@@ -6,6 +6,7 @@ from django.db import models
 from django.urls import reverse
 
 from apps.core.models import BaseModel
+from apps.core.slugs import UniqueSlugMixin
 
 
 class BlogCategory(BaseModel):
@@ -22,17 +23,28 @@ class BlogCategory(BaseModel):
         return self.name
 
 
-class BlogPost(BaseModel):
+class BlogPost(UniqueSlugMixin, BaseModel):
     category = models.ForeignKey(BlogCategory, on_delete=models.PROTECT, related_name='posts', verbose_name='Categoría')
     author = models.ForeignKey(settings.AUTH_USER_MODEL, null=True, blank=True, on_delete=models.SET_NULL, related_name='blog_posts', verbose_name='Autor')
     title = models.CharField(max_length=200, verbose_name='Título')
-    slug = models.SlugField(max_length=220, unique=True, verbose_name='Slug')
+    slug = models.SlugField(max_length=220, unique=True, blank=True, verbose_name='Slug', help_text='Se genera a partir del título si se deja vacío')
     content = models.TextField(verbose_name='Contenido del caso', default='')
+    comment_count = models.PositiveIntegerField(default=0, editable=False, verbose_name='Comentarios activos')
+    reaction_count = models.PositiveIntegerField(default=0, editable=False, verbose_name='Reacciones')
+
+    slug_default = 'publicacion'
 
     class Meta:
         verbose_name = 'Publicación del blog'
         verbose_name_plural = 'Publicaciones del blog'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['is_active', '-created_at', '-id'], name='blog_post_recent_idx'),
+            models.Index(
+                fields=['is_active', '-comment_count', '-reaction_count', '-created_at', '-id'],
+                name='blog_post_popular_idx',
+            ),
+        ]
 
     def __str__(self):
         return self.title
@@ -45,6 +57,10 @@ class BlogImage(BaseModel):
     post = models.ForeignKey(BlogPost, on_delete=models.CASCADE, related_name='images', verbose_name='Publicación')
     image = models.ImageField(upload_to='blog/', verbose_name='Imagen')
     caption = models.CharField(max_length=200, blank=True, verbose_name='Descripción de la imagen')
+    width = models.PositiveIntegerField(null=True, blank=True, editable=False, verbose_name='Ancho')
+    height = models.PositiveIntegerField(null=True, blank=True, editable=False, verbose_name='Alto')
+    variants = models.JSONField(default=list, blank=True, editable=False, verbose_name='Variantes generadas')
+    processed_at = models.DateTimeField(null=True, blank=True, editable=False, verbose_name='Fecha de procesamiento')
 
     class Meta:
         verbose_name = 'Imagen de publicación'
@@ -54,6 +70,23 @@ class BlogImage(BaseModel):
     def __str__(self):
         return f"Imagen de {self.post.title}"
 
+    def _srcset(self, fmt):
+        from django.core.files.storage import default_storage
+
+        return ', '.join(
+            f"{default_storage.url(variant['name'])} {variant['width']}w"
+            for variant in self.variants if variant['format'] == fmt
+        )
+
+    @property
+    def webp_srcset(self):
+        return self._srcset('webp')
+
+    @property
+    def fallback_srcset(self):
+        """Variantes JPEG (o PNG si la imagen tiene transparencia) para navegadores sin WebP"""
+        return self._srcset('fallback')
+
 
 class BlogComment(BaseModel):
     post = models.ForeignKey(BlogPost, on_delete=models.CASCADE, related_name='comments', verbose_name='Publicación')
@@ -62,15 +95,43 @@ class BlogComment(BaseModel):
     name = models.CharField(max_length=120, blank=True, verbose_name='Nombre')
     email = models.EmailField(blank=True, verbose_name='Correo electrónico')
     content = models.TextField(verbose_name='Comentario')
+    path = models.CharField(max_length=255, blank=True, default='', editable=False, verbose_name='Ruta en el hilo')
+
+    PATH_STEP = 7
+    PATH_SEPARATOR = '/'
 
     class Meta:
         verbose_name = 'Comentario'
         verbose_name_plural = 'Comentarios'
         ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['post', 'path'], name='blog_comment_path_idx'),
+        ]
 
     def __str__(self):
         return f"Comentario en {self.post.title}"
 
+    @classmethod
+    def path_segment(cls, pk):
+        """Id en base 36 con ancho fijo, para que ordenar por ruta recorra el hilo en orden"""
+        digits = '0123456789abcdefghijklmnopqrstuvwxyz'
+        segment = ''
+        while pk:
+            pk, remainder = divmod(pk, 36)
+            segment = digits[remainder] + segment
+        return segment.rjust(cls.PATH_STEP, '0')
+
+    def save(self, *args, **kwargs):
+        # Al llegar al largo máximo de la ruta, la respuesta se cuelga del ancestro más profundo posible
+        max_parent_length = self._meta.get_field('path').max_length - self.PATH_STEP - 1
+        while self.parent_id and self.parent and len(self.parent.path) > max_parent_length:
+            self.parent = self.parent.parent
+        super().save(*args, **kwargs)
+        if not self.path:
+            prefix = f"{self.parent.path}{self.PATH_SEPARATOR}" if self.parent_id and self.parent.path else ''
+            self.path = prefix + self.path_segment(self.pk)
+            type(self).objects.filter(pk=self.pk).update(path=self.path)
+
     @property
     def display_name(self):
         if self.author:
@@ -78,12 +139,34 @@ class BlogComment(BaseModel):
         return self.name or 'Anónimo'
 
     def active_replies(self):
+        if hasattr(self, 'tree_children'):
+            return self.tree_children
         cache = getattr(self, '_prefetched_objects_cache', {})
         if 'replies' in cache:
             return [reply for reply in cache['replies'] if reply.is_active]
         return list(self.replies.filter(is_active=True).select_related('author'))
 
 
+class BlogRelatedPost(BaseModel):
+    """Vecinos más similares de una publicación dentro de su categoría, precalculados cada noche"""
+    post = models.ForeignKey(BlogPost, on_delete=models.CASCADE, related_name='related_links', verbose_name='Publicación')
+    related = models.ForeignKey(BlogPost, on_delete=models.CASCADE, related_name='+', verbose_name='Publicación relacionada')
+    score = models.FloatField(verbose_name='Similitud')
+    rank = models.PositiveSmallIntegerField(verbose_name='Posición')
+
+    class Meta:
+        verbose_name = 'Publicación relacionada'
+        verbose_name_plural = 'Publicaciones relacionadas'
+        ordering = ['post', 'rank']
+        unique_together = ('post', 'related')
+        indexes = [
+            models.Index(fields=['post', 'rank'], name='blog_related_rank_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.post} -> {self.related}"
+
+
 class BlogReaction(BaseModel):
     REACTION_TYPES = [
         ('like', 'Me gusta'),
@@ -128,6 +211,10 @@ class BlogReport(BaseModel):
         verbose_name = 'Reporte'
         verbose_name_plural = 'Reportes'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at', 'id'], name='blog_report_queue_idx'),
+            models.Index(fields=['status', 'post', 'comment'], name='blog_report_target_idx'),
+        ]
 
     def __str__(self):
         target = self.comment or self.post
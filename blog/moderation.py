@@ -0,0 +1,147 @@
+"""
+Cola de moderación de reportes del blog
+
+Los reportes se agrupan por contenido reportado (publicación o comentario), así
+que cada contenido se atiende una sola vez aunque tenga decenas de reportes
+duplicados. La cola se pagina por cursor sobre los grupos y cada acción masiva
+es un único UPDATE, sin importar cuántos reportes o contenidos afecte.
+"""
+from django.db.models import Count, F, Max, Min, OuterRef, Q, Subquery, Value, Window
+from django.db.models.functions import Coalesce, Now, RowNumber
+
+from apps.core.pagination import KeysetPaginator
+
+from .models import BlogComment, BlogPost, BlogReport
+from .search import blog_post_index
+
+OPEN_STATUSES = ('pending', 'in_review')
+
+
+def parse_targets(values):
+    """Convierte valores "post:12" / "comment:45" del formulario en (ids de publicaciones, ids de comentarios)."""
+    post_ids, comment_ids = set(), set()
+    for value in values:
+        kind, _, pk = str(value).partition(':')
+        if not pk.isdigit():
+            continue
+        if kind == 'post':
+            post_ids.add(int(pk))
+        elif kind == 'comment':
+            comment_ids.add(int(pk))
+    return post_ids, comment_ids
+
+
+def targets_filter(post_ids, comment_ids):
+    return Q(comment_id__in=comment_ids) | Q(post_id__in=post_ids, comment__isnull=True)
+
+
+class ModerationQueue:
+    """Grupos de reportes por contenido, del reporte más antiguo al más reciente."""
+
+    ordering = ('first_reported', 'post_id', 'comment_key')
+
+    def __init__(self, status='pending', per_page=20):
+        self.status = status
+        self.per_page = per_page
+
+    def groups(self):
+        return (
+            BlogReport.objects.filter(status=self.status)
+            .values('post_id', 'comment_id')
+            .annotate(
+                comment_key=Coalesce('comment_id', Value(0)),
+                total=Count('id'),
+                first_reported=Min('created_at'),
+                last_reported=Max('created_at'),
+            )
+        )
+
+    def page(self, cursor=None, reasons_per_group=3):
+        """Página de grupos con sus objetos y los reportes más recientes de cada uno.
+
+        Son cuatro consultas por página: grupos, publicaciones, comentarios y reportes.
+        """
+        page = KeysetPaginator(self.groups(), self.ordering, self.per_page).page(cursor)
+        groups = page.object_list
+        if not groups:
+            return page
+
+        posts = BlogPost.objects.select_related('author').in_bulk({group['post_id'] for group in groups})
+        comments = BlogComment.objects.select_related('author').in_bulk(
+            {group['comment_id'] for group in groups if group['comment_id']}
+        )
+        post_ids = {group['post_id'] for group in groups if not group['comment_id']}
+        # Solo los `reasons_per_group` más recientes de cada contenido, aunque tenga miles
+        reports = (
+            BlogReport.objects.filter(targets_filter(post_ids, set(comments)), status=self.status)
+            .annotate(target_rank=Window(
+                RowNumber(),
+                partition_by=[F('post_id'), F('comment_id')],
+                order_by=[F('created_at').desc(), F('id').desc()],
+            ))
+            .filter(target_rank__lte=reasons_per_group)
+            .select_related('reporter')
+            .order_by('-created_at', '-id')
+        )
+        by_target = {}
+        for report in reports:
+            by_target.setdefault((report.post_id, report.comment_id), []).append(report)
+
+        for group in groups:
+            group['post'] = posts.get(group['post_id'])
+            group['comment'] = comments.get(group['comment_id'])
+            group['target'] = f"comment:{group['comment_id']}" if group['comment_id'] else f"post:{group['post_id']}"
+            group['reports'] = by_target.get((group['post_id'], group['comment_id']), [])
+        return page
+
+
+class ModerationService:
+    """Acciones masivas sobre reportes y contenidos; cada una es un único UPDATE por tabla."""
+
+    def __init__(self, moderator):
+        self.moderator = moderator
+
+    def _close(self, queryset, status):
+        return queryset.update(status=status, processed_by=self.moderator, processed_at=Now())
+
+    def set_status(self, post_ids, comment_ids, status):
+        """Cambia el estado de todos los reportes abiertos de los contenidos indicados."""
+        if not post_ids and not comment_ids:
+            return 0
+        reports = BlogReport.objects.filter(targets_filter(post_ids, comment_ids), status__in=OPEN_STATUSES)
+        if status == 'in_review':
+            reports = reports.filter(status='pending')
+        return self._close(reports, status)
+
+    def hide_targets(self, post_ids, comment_ids):
+        """Oculta los contenidos indicados y resuelve sus reportes abiertos."""
+        self._hide(Q(pk__in=post_ids), Q(pk__in=comment_ids))
+        return self.set_status(post_ids, comment_ids, 'resolved')
+
+    def hide_author(self, user):
+        """Oculta todas las publicaciones y comentarios del usuario y resuelve sus reportes."""
+        self._hide(Q(author=user), Q(author=user))
+        reports = BlogReport.objects.filter(
+            Q(post__author=user, comment__isnull=True) | Q(comment__author=user),
+            status__in=OPEN_STATUSES,
+        )
+        return self._close(reports, 'resolved')
+
+    def dismiss_reporter(self, user):
+        """Descarta todos los reportes abiertos enviados por el usuario (reportes abusivos)."""
+        return self._close(BlogReport.objects.filter(reporter=user, status__in=OPEN_STATUSES), 'dismissed')
+
+    def _hide(self, posts, comments):
+        hidden_posts = list(BlogPost.objects.filter(posts, is_active=True).values_list('pk', flat=True))
+        BlogPost.objects.filter(pk__in=hidden_posts).update(is_active=False, updated_at=Now())
+        blog_post_index.remove_many(hidden_posts)
+
+        comments = BlogComment.objects.filter(comments, is_active=True)
+        affected = set(comments.values_list('post_id', flat=True).distinct())
+        if comments.update(is_active=False, updated_at=Now()):
+            # update() no pasa por las señales: recalcular el contador de las publicaciones afectadas
+            active = (
+                BlogComment.objects.filter(post=OuterRef('pk'), is_active=True)
+                .order_by().values('post').annotate(total=Count('id')).values('total')
+            )
+            BlogPost.objects.filter(pk__in=affected).update(comment_count=Coalesce(Subquery(active), 0))
@@ -0,0 +1,141 @@
+"""
+Reacciones con contador diferido
+
+Cada reacción se guarda como fila propia (una por usuario), pero el contador de
+la publicación no se actualiza en cada clic: los cambios se acumulan en la
+caché compartida (Redis en producción) y `flush` los aplica a
+`BlogPost.reaction_count` con un solo UPDATE por publicación. Así una ráfaga de
+"me gusta" sobre la misma publicación no compite por su fila. El conteo visible
+es el valor guardado más el pendiente en caché, sin COUNT.
+
+El volcado corre en los workers de Celery, así que el conteo diferido requiere
+una caché compartida (Redis, `CACHE_URL`). Con la caché en memoria de cada
+proceso el contador se actualiza al momento con un UPDATE atómico.
+
+Si la caché pierde un pendiente, `reconcile_blog_counters` corrige el valor.
+"""
+import time
+
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+
+from apps.core.cache import is_shared_cache
+
+from .models import BlogPost, BlogReaction
+from .signals import adjust_counter, reactions_counted_by_service
+
+DIRTY_KEY = 'blog:reactions:dirty'
+LOCK_KEY = 'blog:reactions:dirty-lock'
+
+
+class ReactionService:
+    """Registra reacciones de forma idempotente y lleva el conteo por publicación."""
+
+    reaction_type = 'like'
+
+    @staticmethod
+    def _delta_key(post_id):
+        return f'blog:reactions:delta:{post_id}'
+
+    @staticmethod
+    def _marker_key(post_id):
+        return f'blog:reactions:pending:{post_id}'
+
+    # ------------------------------------------------------------------ escritura
+
+    def set_reaction(self, post, user, reacted):
+        """Deja la reacción del usuario en el estado pedido y retorna el conteo resultante.
+
+        Repetir la misma petición (doble clic, reintento, peticiones concurrentes)
+        no cambia el conteo: solo cuenta la fila que realmente se insertó o borró.
+        """
+        reactions = BlogReaction.objects.filter(post=post, user=user, reaction_type=self.reaction_type)
+        token = reactions_counted_by_service.set(True)
+        try:
+            if reacted:
+                try:
+                    with transaction.atomic():
+                        BlogReaction.objects.create(post=post, user=user, reaction_type=self.reaction_type)
+                    delta = 1
+                except IntegrityError:
+                    delta = 0
+            else:
+                deleted, _ = reactions.delete()
+                delta = -1 if deleted else 0
+        finally:
+            reactions_counted_by_service.reset(token)
+
+        if not is_shared_cache():
+            # El volcado de Celery no vería los pendientes de este proceso: se cuenta al momento
+            if delta:
+                adjust_counter(post.pk, 'reaction_count', delta)
+            return BlogPost.objects.filter(pk=post.pk).values_list('reaction_count', flat=True).first() or 0
+
+        pending = self._add(post.pk, delta)
+        return max(post.reaction_count + pending, 0)
+
+    def toggle(self, post, user):
+        exists = BlogReaction.objects.filter(post=post, user=user, reaction_type=self.reaction_type).exists()
+        return not exists, self.set_reaction(post, user, not exists)
+
+    def _add(self, post_id, delta):
+        key = self._delta_key(post_id)
+        if not delta:
+            return cache.get(key, 0)
+        cache.add(key, 0, None)
+        try:
+            pending = cache.incr(key, delta)
+        except ValueError:
+            cache.set(key, delta, None)
+            pending = delta
+        # Solo el primer cambio desde el último volcado registra la publicación como pendiente
+        if cache.add(self._marker_key(post_id), 1, None):
+            self._update_dirty(lambda ids: ids | {post_id})
+        return pending
+
+    def _update_dirty(self, change):
+        for _ in range(50):
+            if cache.add(LOCK_KEY, 1, 5):
+                try:
+                    ids = set(cache.get(DIRTY_KEY) or ())
+                    result = change(ids)
+                    cache.set(DIRTY_KEY, sorted(result), None)
+                    return ids
+                finally:
+                    cache.delete(LOCK_KEY)
+            time.sleep(0.01)
+        raise RuntimeError('No se pudo tomar el bloqueo de reacciones pendientes.')
+
+    # ------------------------------------------------------------------ lectura
+
+    def count(self, post):
+        """Conteo actual: el guardado en la publicación más lo pendiente en caché."""
+        return max(post.reaction_count + cache.get(self._delta_key(post.pk), 0), 0)
+
+    def counts(self, posts):
+        pending = cache.get_many([self._delta_key(post.pk) for post in posts])
+        return {
+            post.pk: max(post.reaction_count + pending.get(self._delta_key(post.pk), 0), 0)
+            for post in posts
+        }
+
+    # ------------------------------------------------------------------ volcado
+
+    def flush(self):
+        """Aplica los conteos pendientes a la base de datos. Retorna las publicaciones actualizadas."""
+        post_ids = self._update_dirty(lambda ids: set())
+        updated = 0
+        for post_id in sorted(post_ids):
+            # Borrar la marca antes de tomar el pendiente: un clic posterior vuelve a registrarla
+            cache.delete(self._marker_key(post_id))
+            key = self._delta_key(post_id)
+            pending = cache.get(key, 0)
+            if not pending:
+                continue
+            try:
+                cache.decr(key, pending)
+            except ValueError:
+                continue
+            adjust_counter(post_id, 'reaction_count', pending)
+            updated += 1
+        return updated
@@ -0,0 +1,118 @@
+"""
+Publicaciones relacionadas precalculadas
+
+Una tarea nocturna representa cada publicación activa como un vector TF-IDF
+disperso (términos del índice de búsqueda, con el título pesando más que el
+contenido) y guarda sus vecinos más similares por coseno dentro de la misma
+categoría en `BlogRelatedPost`. La página de detalle solo lee esa lista con una
+consulta; no se calcula ninguna similitud por petición.
+
+Los productos punto se acumulan recorriendo un índice invertido, así que solo
+se comparan publicaciones que comparten términos. Cada vector conserva sus
+términos de mayor peso, se ignoran los términos presentes en más del 10 % de la
+categoría y cada término recorre solo las publicaciones donde más pesa, lo que
+acota el trabajo por publicación aun con decenas de miles de ellas.
+"""
+import heapq
+import math
+from collections import Counter, defaultdict
+
+from django.db import transaction
+
+from apps.core.search import tokenize
+
+from .models import BlogCategory, BlogPost, BlogRelatedPost
+
+TOP_N = 4
+TITLE_WEIGHT = 3
+MAX_TERMS = 32
+MAX_DF_RATIO = 0.1
+MIN_DF_CAP = 20
+MAX_POSTINGS = 100
+MIN_SCORE = 0.05
+
+
+def term_counts(title, content):
+    counts = Counter(tokenize(content))
+    for term in tokenize(title):
+        counts[term] += TITLE_WEIGHT
+    return counts
+
+
+def tfidf_vectors(documents):
+    """`{pk: Counter}` -> `{pk: [(término, peso)]}` normalizados (norma L2 igual a 1)."""
+    total = len(documents)
+    df = Counter(term for counts in documents.values() for term in counts)
+    # En categorías pequeñas casi todo término es "común"; el tope solo aplica a las grandes
+    max_df = max(int(total * MAX_DF_RATIO), MIN_DF_CAP)
+
+    vectors = {}
+    for pk, counts in documents.items():
+        weights = {
+            term: (1 + math.log(tf)) * (math.log((1 + total) / (1 + df[term])) + 1)
+            for term, tf in counts.items() if df[term] <= max_df
+        }
+        top = heapq.nlargest(MAX_TERMS, weights.items(), key=lambda item: item[1])
+        norm = math.sqrt(sum(weight * weight for _, weight in top))
+        if norm:
+            vectors[pk] = [(term, weight / norm) for term, weight in top]
+    return vectors
+
+
+def nearest_neighbours(vectors, top_n=TOP_N):
+    """`{pk: [(vecino, similitud)]}` con los `top_n` vecinos por coseno de cada vector."""
+    postings = defaultdict(list)
+    for pk, vector in vectors.items():
+        for term, weight in vector:
+            postings[term].append((pk, weight))
+    # En cada término solo cuentan las publicaciones donde más pesa
+    for term, entries in postings.items():
+        if len(entries) > MAX_POSTINGS:
+            postings[term] = heapq.nlargest(MAX_POSTINGS, entries, key=lambda item: item[1])
+
+    neighbours = {}
+    for pk, vector in vectors.items():
+        scores = defaultdict(float)
+        for term, weight in vector:
+            for other, other_weight in postings[term]:
+                if other != pk:
+                    scores[other] += weight * other_weight
+        best = heapq.nlargest(top_n, scores.items(), key=lambda item: (item[1], -item[0]))
+        neighbours[pk] = [(other, score) for other, score in best if score >= MIN_SCORE]
+    return neighbours
+
+
+def rebuild_category(category_id, top_n=TOP_N):
+    """Recalcula las relaciones de una categoría. Retorna cuántas filas se guardaron."""
+    rows = BlogPost.objects.filter(category_id=category_id, is_active=True).values_list('pk', 'title', 'content')
+    documents = {pk: term_counts(title, content) for pk, title, content in rows.iterator()}
+    neighbours = nearest_neighbours(tfidf_vectors(documents), top_n)
+
+    links = [
+        BlogRelatedPost(post_id=pk, related_id=other, score=round(score, 6), rank=rank)
+        for pk, related in neighbours.items()
+        for rank, (other, score) in enumerate(related, start=1)
+    ]
+    with transaction.atomic():
+        # Incluye las filas de publicaciones ocultas o que ya no pertenecen a la categoría
+        BlogRelatedPost.objects.filter(post__category_id=category_id).delete()
+        BlogRelatedPost.objects.bulk_create(links, batch_size=1000)
+    return len(links)
+
+
+def rebuild_related(top_n=TOP_N):
+    """Recalcula todas las categorías, una transacción por categoría. Retorna `{categoría: filas}`."""
+    return {
+        category.name: rebuild_category(category.pk, top_n)
+        for category in BlogCategory.objects.only('pk', 'name')
+    }
+
+
+def related_posts(post, limit=TOP_N):
+    """Publicaciones relacionadas precalculadas de `post`, con una consulta."""
+    links = (
+        BlogRelatedPost.objects.filter(post=post, related__is_active=True)
+        .select_related('related__category')
+        .order_by('rank')[:limit]
+    )
+    return [link.related for link in links]
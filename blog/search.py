@@ -0,0 +1,29 @@
+"""
+Índice de búsqueda del blog
+
+Usa el mismo índice BM25 del repositorio normativo (tildes, palabras vacías y
+stemming ligero en español). El título pesa más que el relato del caso. Los
+comentarios no se indexan: reindexar la publicación con cada comentario
+costaría más de lo que aporta al ranking.
+"""
+from apps.core.search import SearchIndex
+
+from .models import BlogPost
+
+blog_post_index = SearchIndex('blog.blogpost', {
+    'title': 5,
+    'content': 1,
+})
+
+
+def index_post(post):
+    """Indexa la publicación o la retira del índice si está inactiva."""
+    if post.is_active:
+        blog_post_index.index(post.pk, {field: getattr(post, field) for field in blog_post_index.fields})
+    else:
+        blog_post_index.remove(post.pk)
+
+
+def rebuild_index():
+    rows = BlogPost.objects.filter(is_active=True).values('pk', *blog_post_index.fields).iterator(chunk_size=500)
+    return blog_post_index.rebuild((row.pop('pk'), row) for row in rows)
@@ -0,0 +1,96 @@
+from contextvars import ContextVar
+
+from django.db import transaction
+from django.db.models import Case, F, Value, When
+from django.db.models.signals import post_delete, post_init, post_save, pre_save
+from django.dispatch import receiver
+
+from .images import delete_variants
+from .models import BlogComment, BlogImage, BlogPost, BlogReaction
+from .search import blog_post_index, index_post
+
+# ReactionService cuenta sus propias reacciones; mientras está activo las señales no las cuentan
+reactions_counted_by_service = ContextVar('reactions_counted_by_service', default=False)
+
+
+def adjust_counter(post_id, field, delta):
+    """Suma `delta` al contador de la publicación con un UPDATE atómico, sin bajar de cero"""
+    if delta >= 0:
+        value = F(field) + delta
+    else:
+        # En MySQL/MariaDB la columna es UNSIGNED: restar por debajo de cero falla (ERROR 1690)
+        # en lugar de dar un negativo, así que la resta solo se evalúa cuando alcanza
+        value = Case(When(**{f'{field}__gte': -delta}, then=F(field) - (-delta)), default=Value(0))
+    BlogPost.objects.filter(pk=post_id).update(**{field: value})
+
+
+@receiver(post_save, sender=BlogPost)
+def reindex_post(sender, instance, update_fields=None, **kwargs):
+    """Mantener el índice de búsqueda al día; los contadores no cambian el texto"""
+    if update_fields and not {'title', 'content', 'is_active'} & set(update_fields):
+        return
+    index_post(instance)
+
+
+@receiver(post_delete, sender=BlogPost)
+def remove_post_from_index(sender, instance, **kwargs):
+    blog_post_index.remove(instance.pk)
+
+
+@receiver(post_init, sender=BlogComment)
+def remember_comment_state(sender, instance, **kwargs):
+    """Recordar si el comentario estaba activo para detectar cambios al guardarlo.
+
+    Si `is_active` quedó diferido no se consulta; los cambios hechos con `update()`
+    tampoco pasan por aquí y los corrige `reconcile_blog_counters`.
+    """
+    instance._counted_active = instance.__dict__.get('is_active') if instance.pk else False
+
+
+@receiver(post_save, sender=BlogComment)
+def count_saved_comment(sender, instance, **kwargs):
+    """Solo los comentarios activos cuentan; ocultar o reactivar uno ajusta el contador"""
+    if instance._counted_active is not None and instance.is_active != instance._counted_active:
+        adjust_counter(instance.post_id, 'comment_count', 1 if instance.is_active else -1)
+        instance._counted_active = instance.is_active
+
+
+@receiver(post_delete, sender=BlogComment)
+def discount_deleted_comment(sender, instance, **kwargs):
+    if instance._counted_active:
+        adjust_counter(instance.post_id, 'comment_count', -1)
+
+
+@receiver(post_save, sender=BlogReaction)
+def count_saved_reaction(sender, instance, created, **kwargs):
+    """Las reacciones creadas fuera de ReactionService (admin, scripts) se cuentan aquí"""
+    if created and not reactions_counted_by_service.get():
+        adjust_counter(instance.post_id, 'reaction_count', 1)
+
+
+@receiver(post_delete, sender=BlogReaction)
+def discount_deleted_reaction(sender, instance, **kwargs):
+    if not reactions_counted_by_service.get():
+        adjust_counter(instance.post_id, 'reaction_count', -1)
+
+
+@receiver(pre_save, sender=BlogImage)
+def detect_image_upload(sender, instance, **kwargs):
+    # Un archivo recién subido aún no está guardado en el storage antes de `save()`
+    instance._image_uploaded = bool(instance.image) and not instance.image._committed
+
+
+@receiver(post_save, sender=BlogImage)
+def queue_image_processing(sender, instance, **kwargs):
+    """Procesar en segundo plano cada archivo subido; la subida responde sin esperar"""
+    if not getattr(instance, '_image_uploaded', False):
+        return
+    instance._image_uploaded = False
+    from .tasks import queue_image_processing as enqueue
+
+    transaction.on_commit(lambda: enqueue(instance.pk))
+
+
+@receiver(post_delete, sender=BlogImage)
+def remove_image_variants(sender, instance, **kwargs):
+    delete_variants(instance)
@@ -0,0 +1,199 @@
+"""
+Filtro previo de spam para comentarios anónimos
+
+Antes de guardar un comentario anónimo se aplican, en orden:
+
+1. Límites por IP y por correo sobre la caché compartida (Redis en producción).
+2. Reglas baratas, como el número máximo de enlaces.
+3. Un clasificador bayesiano ingenuo con hashing de términos. Se entrena con
+   los desenlaces de moderación: los comentarios con reportes resueltos cuentan
+   como spam y los descartados o nunca reportados como legítimos.
+
+El modelo entrenado es un diccionario `{cubeta: peso}` que se guarda en la caché
+y se copia en memoria de cada proceso. Puntuar un comentario son unas decenas
+de búsquedas en ese diccionario, sin consultas a la base de datos.
+
+El modelo lo entrena un worker de Celery y lo leen los procesos web, así que
+ambos deben ver la misma caché: se usa `shared_cache`, que sin `CACHE_URL`
+recurre al Redis del broker. Si tampoco hay Redis se registra una advertencia;
+los límites cuentan entonces por proceso y los procesos web no reciben el
+modelo entrenado por el worker (el comentario pasa solo con límites y reglas).
+"""
+import math
+import re
+import time
+import zlib
+from dataclasses import dataclass
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from apps.core.cache import shared_cache
+from apps.core.search import tokenize
+
+from .models import BlogComment, BlogReport
+
+MODEL_KEY = 'blog:spam-model'
+BUCKETS = 2 ** 18
+MIN_EXAMPLES = 20
+HAM_SAMPLE = 5000
+LOCAL_REFRESH = 60
+
+URL_RE = re.compile(r'https?://|www\.', re.IGNORECASE)
+DOMAIN_RE = re.compile(r'(?:https?://|www\.)([^/\s]+)', re.IGNORECASE)
+RATE_UNITS = {'s': 1, 'm': 60, 'h': 60 * 60, 'd': 60 * 60 * 24}
+
+_local = {'model': None, 'checked_at': 0.0}
+
+
+@dataclass
+class Verdict:
+    allowed: bool
+    reason: str = ''
+    score: float | None = None
+
+
+def features(content, name='', email=''):
+    """Términos del comentario más rasgos de forma (enlaces, dominios, mayúsculas, correo)."""
+    content = content or ''
+    tokens = set(tokenize(content))
+    tokens.update(f'name:{token}' for token in tokenize(name))
+    links = len(URL_RE.findall(content))
+    tokens.add(f'links:{min(links, 5)}')
+    tokens.update(f'domain:{domain.lower()}' for domain in DOMAIN_RE.findall(content))
+    letters = [char for char in content if char.isalpha()]
+    if letters and sum(char.isupper() for char in letters) / len(letters) > 0.6:
+        tokens.add('shouting')
+    if email and '@' in email:
+        tokens.add(f'email-domain:{email.rsplit("@", 1)[1].lower()}')
+    tokens.add(f'length:{min(len(content) // 200, 10)}')
+    return tokens
+
+
+def bucket(token):
+    return zlib.crc32(token.encode('utf-8')) % BUCKETS
+
+
+def client_ip(request):
+    if settings.BLOG_TRUST_X_FORWARDED_FOR:
+        forwarded = request.META.get('HTTP_X_FORWARDED_FOR', '')
+        if forwarded:
+            return forwarded.split(',')[0].strip()
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def parse_rate(rate):
+    """'10/h' -> (10, 3600)"""
+    count, _, unit = str(rate).partition('/')
+    return int(count), RATE_UNITS.get(unit or 'm', 60)
+
+
+class RateLimiter:
+    """Ventanas fijas por identificador sobre la caché compartida."""
+
+    def hit(self, scope, identifier, rate):
+        """Registra un intento y retorna False si supera el límite de la ventana actual."""
+        limit, window = parse_rate(rate)
+        slot = int(time.time() // window)
+        key = f'blog:comment-rate:{scope}:{identifier}:{slot}'
+        cache = shared_cache()
+        cache.add(key, 0, window)
+        try:
+            current = cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, window)
+            current = 1
+        return current <= limit
+
+
+class SpamFilter:
+    """Clasificador bayesiano ingenuo con hashing de términos, entrenado con la moderación."""
+
+    # ------------------------------------------------------------------ puntuación
+
+    def model(self):
+        """Modelo vigente, refrescado desde la caché como máximo una vez por minuto."""
+        now = time.monotonic()
+        if now - _local['checked_at'] > LOCAL_REFRESH:
+            _local['model'] = shared_cache().get(MODEL_KEY)
+            _local['checked_at'] = now
+        return _local['model']
+
+    def score(self, content, name='', email=''):
+        """Probabilidad de spam entre 0 y 1, o None si aún no hay modelo entrenado."""
+        model = self.model()
+        if not model:
+            return None
+        weights = model['weights']
+        default = model['default']
+        total = model['prior'] + sum(weights.get(bucket(token), default) for token in features(content, name, email))
+        total = max(min(total, 50.0), -50.0)
+        return 1 / (1 + math.exp(-total))
+
+    def check(self, request, content, name='', email=''):
+        """Decide si un comentario anónimo puede guardarse."""
+        limiter = RateLimiter()
+        if not limiter.hit('ip', client_ip(request), settings.BLOG_COMMENT_IP_RATE):
+            return Verdict(False, 'rate')
+        if email and not limiter.hit('email', email.strip().lower(), settings.BLOG_COMMENT_EMAIL_RATE):
+            return Verdict(False, 'rate')
+        if len(URL_RE.findall(content or '')) > settings.BLOG_SPAM_MAX_LINKS:
+            return Verdict(False, 'links')
+        score = self.score(content, name, email)
+        if score is not None and score >= settings.BLOG_SPAM_THRESHOLD:
+            return Verdict(False, 'spam', score)
+        return Verdict(True, score=score)
+
+    # ------------------------------------------------------------------ entrenamiento
+
+    def examples(self):
+        """Pares (campos, es_spam) a partir de los reportes de comentarios ya moderados."""
+        reported = BlogReport.objects.filter(comment=OuterRef('pk'))
+        spam = BlogComment.objects.filter(Exists(reported.filter(status='resolved')))
+        ham = BlogComment.objects.filter(Exists(reported.filter(status='dismissed'))).exclude(pk__in=spam.values('pk'))
+        # Comentarios activos con más de una semana y sin reportes también cuentan como legítimos
+        unreported = (
+            BlogComment.objects.filter(is_active=True, created_at__lt=timezone.now() - timedelta(days=7))
+            .exclude(Exists(reported)).order_by('-created_at')[:HAM_SAMPLE]
+        )
+        fields = ('content', 'name', 'email')
+        for row in spam.values(*fields).iterator():
+            yield row, True
+        for queryset in (ham, unreported):
+            for row in queryset.values(*fields).iterator():
+                yield row, False
+
+    def train(self):
+        """Entrena y publica el modelo. Retorna (spam, legítimos) o None si faltan ejemplos."""
+        counts = {True: {}, False: {}}
+        docs = {True: 0, False: 0}
+        tokens_total = {True: 0, False: 0}
+        for row, is_spam in self.examples():
+            docs[is_spam] += 1
+            table = counts[is_spam]
+            for token in features(row['content'], row['name'], row['email']):
+                index = bucket(token)
+                table[index] = table.get(index, 0) + 1
+                tokens_total[is_spam] += 1
+
+        if docs[True] < MIN_EXAMPLES or docs[False] < MIN_EXAMPLES:
+            return None
+
+        spam_norm = math.log(tokens_total[True] + BUCKETS)
+        ham_norm = math.log(tokens_total[False] + BUCKETS)
+        weights = {
+            index: math.log(counts[True].get(index, 0) + 1) - spam_norm - math.log(counts[False].get(index, 0) + 1) + ham_norm
+            for index in set(counts[True]) | set(counts[False])
+        }
+        model = {
+            'weights': weights,
+            'default': ham_norm - spam_norm,
+            'prior': math.log(docs[True] / docs[False]),
+            'trained_at': timezone.now().isoformat(),
+            'examples': docs,
+        }
+        shared_cache().set(MODEL_KEY, model, None)
+        _local.update(model=model, checked_at=time.monotonic())
+        return docs[True], docs[False]
@@ -0,0 +1,54 @@
+import logging
+
+from celery import shared_task
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(acks_late=True)
+def process_blog_image_task(image_id):
+    """Genera las variantes responsivas de una imagen del blog recién subida."""
+    from .images import ImageProcessingError, process_image
+    from .models import BlogImage
+
+    image = BlogImage.objects.filter(pk=image_id).first()
+    if image is None or not image.image:
+        return None
+    try:
+        process_image(image)
+    except ImageProcessingError as exc:
+        logger.warning('Imagen del blog %s sin procesar: %s', image_id, exc)
+        return None
+    return image_id
+
+
+@shared_task
+def flush_reaction_counts_task():
+    """Tarea periódica: vuelca a la base de datos los conteos de reacciones acumulados en caché."""
+    from .reactions import ReactionService
+
+    return ReactionService().flush()
+
+
+@shared_task
+def train_spam_filter_task():
+    """Tarea nocturna: reentrena el filtro de spam de comentarios con los reportes moderados."""
+    from .spam import SpamFilter
+
+    return SpamFilter().train()
+
+
+@shared_task
+def rebuild_related_posts_task():
+    """Tarea nocturna: recalcula las publicaciones relacionadas de cada categoría."""
+    from .related import rebuild_related
+
+    return rebuild_related()
+
+
+def queue_image_processing(image_id):
+    """Encola el procesamiento; si el broker no responde, la imagen queda pendiente para `process_blog_images`."""
+    try:
+        process_blog_image_task.delay(image_id)
+    except Exception:
+        logger.exception('No se pudo encolar el procesamiento de la imagen del blog %s', image_id)
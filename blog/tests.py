@@ -1,3 +1,200 @@
-from django.test import TestCase
+import importlib
+from unittest import mock
 
-# Create your tests here.
+from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.cache.backends.locmem import LocMemCache
+from django.test import SimpleTestCase, TestCase
+
+from .comments import CommentTree
+from .models import BlogCategory, BlogComment, BlogPost, BlogReaction, BlogReport
+from .moderation import ModerationQueue
+from .reactions import ReactionService
+from .signals import adjust_counter
+from .spam import RateLimiter
+
+
+class BlogTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.author = User.objects.create_user(email='autor@example.com', username='autor', password='x')
+        cls.reader = User.objects.create_user(email='lector@example.com', username='lector', password='x')
+        cls.category = BlogCategory.objects.create(name='Pruebas', slug='pruebas')
+        cls.post = BlogPost.objects.create(category=cls.category, author=cls.author, title='Paneles solares', content='Texto')
+
+    def setUp(self):
+        cache.clear()
+
+    def stored_count(self):
+        return BlogPost.objects.values_list('reaction_count', flat=True).get(pk=self.post.pk)
+
+
+class ReactionServiceTests(BlogTestCase):
+    def test_process_local_cache_updates_counter_immediately(self):
+        service = ReactionService()
+        self.assertEqual(service.set_reaction(self.post, self.reader, True), 1)
+        self.assertEqual(self.stored_count(), 1)
+        self.assertEqual(service.set_reaction(self.post, self.reader, False), 0)
+        self.assertEqual(self.stored_count(), 0)
+
+    def test_repeated_unlike_counts_once(self):
+        # Solo cuenta la petición cuyo DELETE borró la fila, como entre dos peticiones concurrentes
+        service = ReactionService()
+        service.set_reaction(self.post, self.reader, True)
+        service.set_reaction(self.post, self.author, True)
+        service.set_reaction(self.post, self.reader, False)
+        self.assertEqual(service.set_reaction(self.post, self.reader, False), 1)
+        self.assertEqual(self.stored_count(), 1)
+
+    def test_shared_cache_defers_counter_until_flush(self):
+        service = ReactionService()
+        with mock.patch('blog.reactions.is_shared_cache', return_value=True):
+            self.assertEqual(service.set_reaction(self.post, self.reader, True), 1)
+            self.assertEqual(service.set_reaction(self.post, self.reader, True), 1)
+            self.assertEqual(self.stored_count(), 0)
+            self.assertEqual(service.flush(), 1)
+        self.assertEqual(self.stored_count(), 1)
+
+    def test_flush_of_negative_pending_clamps_at_zero(self):
+        service = ReactionService()
+        BlogReaction.objects.create(post=self.post, user=self.reader)
+        BlogPost.objects.filter(pk=self.post.pk).update(reaction_count=0)
+        with mock.patch('blog.reactions.is_shared_cache', return_value=True):
+            service.set_reaction(self.post, self.reader, False)
+            self.assertEqual(service.flush(), 1)
+        self.assertEqual(self.stored_count(), 0)
+
+    def test_reactions_outside_service_are_counted_by_signals(self):
+        reaction = BlogReaction.objects.create(post=self.post, user=self.reader)
+        self.assertEqual(self.stored_count(), 1)
+        reaction.delete()
+        self.assertEqual(self.stored_count(), 0)
+
+
+class AdjustCounterTests(BlogTestCase):
+    def test_negative_delta_clamps_at_zero(self):
+        adjust_counter(self.post.pk, 'reaction_count', 2)
+        adjust_counter(self.post.pk, 'reaction_count', -1)
+        self.assertEqual(self.stored_count(), 1)
+        adjust_counter(self.post.pk, 'reaction_count', -5)
+        self.assertEqual(self.stored_count(), 0)
+
+
+class UniqueSlugTests(BlogTestCase):
+    def create_post(self, title, slug=''):
+        return BlogPost.objects.create(category=self.category, author=self.author, title=title, slug=slug, content='Texto')
+
+    def test_next_free_suffix_ignores_longer_titles_with_the_same_prefix(self):
+        self.create_post('Paneles solares térmicos')
+        self.create_post('Otro', slug='paneles-solares-termicos-9')
+        self.assertEqual(self.create_post('Paneles solares').slug, 'paneles-solares-2')
+        self.create_post('Otro', slug='paneles-solares-5')
+        self.assertEqual(self.create_post('Paneles solares').slug, 'paneles-solares-6')
+
+
+class RateLimiterTests(SimpleTestCase):
+    def test_limits_are_counted_in_the_shared_cache(self):
+        shared = LocMemCache('blog-tests-shared', {})
+        with mock.patch('blog.spam.shared_cache', return_value=shared):
+            limiter = RateLimiter()
+            self.assertTrue(limiter.hit('ip', '203.0.113.7', '2/h'))
+            self.assertTrue(limiter.hit('ip', '203.0.113.7', '2/h'))
+            self.assertFalse(limiter.hit('ip', '203.0.113.7', '2/h'))
+            self.assertTrue(limiter.hit('ip', '203.0.113.8', '2/h'))
+        shared.clear()
+
+
+class CommentTestCase(BlogTestCase):
+    def comment(self, parent=None, **kwargs):
+        return BlogComment.objects.create(post=self.post, parent=parent, name='Ana', content='Comentario', **kwargs)
+
+    def chain(self, root, depth):
+        comments = [root]
+        for _ in range(depth):
+            comments.append(self.comment(parent=comments[-1]))
+        return comments
+
+
+class CommentTreeTests(CommentTestCase):
+    def test_replies_deeper_than_three_levels_are_nested(self):
+        chain = self.chain(self.comment(), 5)
+        with self.assertNumQueries(2):
+            page = CommentTree(self.post).page()
+        node = page.object_list[0]
+        for expected in chain[1:]:
+            self.assertEqual([child.pk for child in node.tree_children], [expected.pk])
+            node = node.tree_children[0]
+        self.assertEqual(node.tree_children, [])
+
+    def test_hidden_ancestor_hides_its_subtree(self):
+        root = self.comment()
+        visible = self.comment(parent=root)
+        hidden, below_hidden = self.chain(self.comment(parent=root), 1)
+        self.comment(parent=below_hidden)
+        BlogComment.objects.filter(pk=hidden.pk).update(is_active=False)
+
+        node = CommentTree(self.post).page().object_list[0]
+        self.assertEqual([child.pk for child in node.tree_children], [visible.pk])
+        self.assertEqual(node.tree_children[0].tree_children, [])
+
+    def test_next_page_cursor_continues_after_the_last_root(self):
+        first, second, third = self.comment(), self.comment(), self.comment()
+        reply = self.comment(parent=second)
+        tree = CommentTree(self.post, per_page=2)
+
+        page = tree.page()
+        self.assertEqual([root.pk for root in page], [first.pk, second.pk])
+        self.assertEqual([child.pk for child in page.object_list[1].tree_children], [reply.pk])
+        self.assertTrue(page.has_next)
+
+        page = tree.page(page.next_cursor)
+        self.assertEqual([root.pk for root in page], [third.pk])
+        self.assertFalse(page.has_next)
+
+
+class CommentPathBackfillTests(CommentTestCase):
+    backfill_paths = staticmethod(importlib.import_module('blog.migrations.0009_comment_paths').backfill_paths)
+
+    def test_backfill_matches_paths_assigned_on_save(self):
+        # Más profundo que el largo máximo de la ruta: las últimas respuestas se recuelgan
+        chain = self.chain(self.comment(), 40)
+        sibling = self.comment(parent=chain[2])
+        saved = dict(BlogComment.objects.values_list('pk', 'path'))
+        parents = dict(BlogComment.objects.values_list('pk', 'parent_id'))
+        self.assertNotEqual(parents[chain[-1].pk], chain[-2].pk)
+
+        # Estado previo a la migración: sin rutas y cada respuesta colgada de su padre original
+        BlogComment.objects.update(path='')
+        for parent, comment in zip(chain, chain[1:]):
+            BlogComment.objects.filter(pk=comment.pk).update(parent=parent.pk)
+        self.backfill_paths(apps, None)
+
+        self.assertEqual(dict(BlogComment.objects.values_list('pk', 'path')), saved)
+        self.assertEqual(dict(BlogComment.objects.values_list('pk', 'parent_id')), parents)
+        self.assertTrue(saved[sibling.pk].startswith(saved[chain[2].pk] + BlogComment.PATH_SEPARATOR))
+
+
+class ModerationQueueTests(BlogTestCase):
+    def test_each_group_loads_only_its_latest_reports(self):
+        comment = BlogComment.objects.create(post=self.post, name='Ana', content='Comentario')
+        comment_reports = [
+            BlogReport.objects.create(target_type='comment', post=self.post, comment=comment, reason=f'spam {i}')
+            for i in range(10)
+        ]
+        post_reports = [
+            BlogReport.objects.create(target_type='post', post=self.post, reason=f'falso {i}')
+            for i in range(5)
+        ]
+
+        with self.assertNumQueries(4):
+            groups = ModerationQueue().page(reasons_per_group=3).object_list
+
+        by_target = {group['target']: group for group in groups}
+        comment_group = by_target[f'comment:{comment.pk}']
+        self.assertEqual(comment_group['total'], 10)
+        self.assertEqual([report.pk for report in comment_group['reports']], [r.pk for r in comment_reports[:-4:-1]])
+        post_group = by_target[f'post:{self.post.pk}']
+        self.assertEqual(post_group['total'], 5)
+        self.assertEqual([report.pk for report in post_group['reports']], [r.pk for r in post_reports[:-4:-1]])
@@ -7,6 +7,7 @@ app_name = 'blog'
 urlpatterns = [
 path('', views.BlogPostListView.as_view(), name='home'),
 path('nueva/', views.BlogPostCreateView.as_view(), name='create'),
+path('api/publicaciones/', views.BlogPostFeedAPIView.as_view(), name='api_posts'),
 path('reportes/', views.BlogReportListView.as_view(), name='report_list'),
 path('<slug:slug>/reaccionar/', views.BlogPostToggleReactionView.as_view(), name='toggle_reaction'),
 path('<slug:slug>/reportar/', views.BlogPostReportView.as_view(), name='report'),
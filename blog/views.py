@@ -1,17 +1,24 @@
-from django.shortcuts import render
-
-# Create your views here.
 from django.contrib import messages
+from django.contrib.auth import get_user_model
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.db.models import Count, Q
-from django.http import JsonResponse
+from django.http import Http404, JsonResponse
 from django.shortcuts import redirect, get_object_or_404
 from django.urls import reverse_lazy
-from django.utils.text import slugify
+from django.utils import timezone
+from django.utils.text import Truncator
 from django.views.generic import ListView, DetailView, CreateView, View
 
+from apps.core.pagination import InvalidCursor, KeysetPaginator, ranked_page
+from apps.core.search import highlight
+
+from .comments import CommentTree
 from .forms import BlogPostForm, BlogImageFormSet, BlogCommentForm, BlogReportForm
-from .models import BlogPost, BlogCategory, BlogComment, BlogReaction, BlogReport
+from .models import BlogPost, BlogComment, BlogReport
+from .moderation import ModerationQueue, ModerationService, parse_targets
+from .reactions import ReactionService
+from .related import related_posts
+from .search import blog_post_index
+from .spam import SpamFilter
 
 
 class AdminRoleRequiredMixin(LoginRequiredMixin):
@@ -21,40 +28,72 @@ class AdminRoleRequiredMixin(LoginRequiredMixin):
         return super().dispatch(request, *args, **kwargs)
 
 
+FEED_ORDERINGS = {
+    'recent': ('-created_at', '-id'),
+    'popular': ('-comment_count', '-reaction_count', '-created_at', '-id'),
+}
+
+SPAM_MESSAGES = {
+    'rate': 'Has enviado demasiados comentarios. Intenta de nuevo más tarde.',
+    'links': 'Tu comentario tiene demasiados enlaces.',
+    'spam': 'Tu comentario parece spam y no fue publicado. Inicia sesión para comentar sin este filtro.',
+}
+
+
+def feed_page(queryset, params, per_page):
+    """Página del listado según `q`, `ordering` y `cursor` de los parámetros GET.
+
+    Con búsqueda, el orden por defecto es la relevancia BM25 y cada publicación
+    trae `snippet` con las coincidencias resaltadas. Retorna `(página, orden, búsqueda)`
+    y lanza `InvalidCursor` si el cursor no corresponde al listado.
+    """
+    search = (params.get('q') or '').strip()
+    ordering = (params.get('ordering') or '').strip() or ('relevance' if search else 'recent')
+    if ordering not in FEED_ORDERINGS and not (ordering == 'relevance' and search):
+        ordering = 'recent'
+    cursor = params.get('cursor')
+
+    queryset = queryset.filter(is_active=True)
+    if not search:
+        page = KeysetPaginator(queryset, FEED_ORDERINGS[ordering], per_page).page(cursor)
+    else:
+        ranked = blog_post_index.search(search)
+        if ordering == 'relevance':
+            page = ranked_page(queryset, ranked, cursor, per_page)
+        else:
+            queryset = queryset.filter(pk__in=[object_id for object_id, _ in ranked])
+            page = KeysetPaginator(queryset, FEED_ORDERINGS[ordering], per_page).page(cursor)
+        for post in page:
+            post.snippet = highlight(post.content, search)
+
+    # Sumar las reacciones aún no volcadas a la base de datos
+    counts = ReactionService().counts(page.object_list)
+    for post in page:
+        post.reaction_count = counts[post.pk]
+    return page, ordering, search
+
+
 class BlogPostListView(ListView):
+    """Listado con desplazamiento infinito: cada página pide la siguiente con un cursor, sin OFFSET ni COUNT"""
     model = BlogPost
     template_name = 'blog/post_list.html'
     context_object_name = 'posts'
-    paginate_by = 9
+    page_size = 9
 
     def get_queryset(self):
-        qs = BlogPost.objects.filter(is_active=True).select_related('category', 'author').prefetch_related('images')
-        qs = qs.annotate(
-            comment_count=Count('comments', filter=Q(comments__is_active=True), distinct=True),
-            reaction_count=Count('reactions', distinct=True)
-        )
-
-        ordering = (self.request.GET.get('ordering') or 'recent').strip()
-        search = (self.request.GET.get('q') or '').strip()
-
-        if search:
-            qs = qs.filter(
-                Q(title__icontains=search) |
-                Q(content__icontains=search)
-            )
-
-        if ordering == 'popular':
-            qs = qs.order_by('-comment_count', '-reaction_count', '-created_at')
-        else:
-            qs = qs.order_by('-created_at')
-
-        return qs
+        return BlogPost.objects.select_related('category', 'author').prefetch_related('images')
 
     def get_context_data(self, **kwargs):
-        context = super().get_context_data(**kwargs)
+        try:
+            page, ordering, search = feed_page(self.object_list, self.request.GET, self.page_size)
+        except InvalidCursor:
+            raise Http404('Cursor inválido.')
+
+        context = super().get_context_data(object_list=page.object_list, **kwargs)
         context.update({
-            'selected_ordering': (self.request.GET.get('ordering') or 'recent').strip() or 'recent',
-            'search_query': (self.request.GET.get('q') or '').strip(),
+            'next_cursor': page.next_cursor,
+            'selected_ordering': ordering,
+            'search_query': search,
         })
         return context
 
@@ -66,10 +105,54 @@ class BlogPostListView(ListView):
             return JsonResponse({
                 'posts_html': posts_html,
                 'pagination_html': pagination_html,
+                'next_cursor': context['next_cursor'],
             })
         return super().render_to_response(context, **response_kwargs)
 
 
+class BlogPostFeedAPIView(View):
+    """Publicaciones en JSON paginadas por cursor; `next` es la URL de la página siguiente"""
+
+    page_size = 20
+
+    def get(self, request):
+        qs = BlogPost.objects.select_related('category', 'author').only(
+            'id', 'title', 'slug', 'content', 'created_at', 'comment_count', 'reaction_count',
+            'category__name', 'category__slug', 'author__first_name', 'author__last_name', 'author__email',
+        )
+        try:
+            page, _, _ = feed_page(qs, request.GET, self.page_size)
+        except InvalidCursor as exc:
+            return JsonResponse({'error': str(exc)}, status=400)
+
+        next_url = None
+        if page.has_next:
+            params = request.GET.copy()
+            params['cursor'] = page.next_cursor
+            next_url = f"{request.path}?{params.urlencode()}"
+
+        return JsonResponse({
+            'results': [
+                {
+                    'id': post.id,
+                    'title': post.title,
+                    'url': post.get_absolute_url(),
+                    'excerpt': Truncator(post.content).words(35),
+                    'category': {'name': post.category.name, 'slug': post.category.slug},
+                    'author': (post.author.get_full_name() or post.author.email) if post.author else None,
+                    'created_at': post.created_at.isoformat(),
+                    'comment_count': post.comment_count,
+                    'reaction_count': post.reaction_count,
+                    'snippet': getattr(post, 'snippet', None),
+                    'relevance': getattr(post, 'relevance', None),
+                }
+                for post in page
+            ],
+            'next_cursor': page.next_cursor,
+            'next': next_url,
+        })
+
+
 class BlogPostDetailView(DetailView):
     model = BlogPost
     template_name = 'blog/post_detail.html'
@@ -84,9 +167,15 @@ class BlogPostDetailView(DetailView):
         context = super().get_context_data(**kwargs)
         post = context['post']
         context['comment_form'] = BlogCommentForm(user=self.request.user)
-        context['comments'] = post.comments.filter(is_active=True, parent__isnull=True).select_related('author').prefetch_related('replies__author', 'replies__replies__author')
-        context['comment_count'] = post.comments.filter(is_active=True).count()
-        context['reaction_count'] = post.reactions.count()
+        try:
+            threads = CommentTree(post).page(self.request.GET.get('comentarios'))
+        except InvalidCursor:
+            raise Http404('Cursor inválido.')
+        context['comments'] = threads.object_list
+        context['comments_next_cursor'] = threads.next_cursor
+        context['comment_count'] = post.comment_count
+        context['reaction_count'] = ReactionService().count(post)
+        context['related_posts'] = related_posts(post)
         context['user_has_reacted'] = False
         if self.request.user.is_authenticated:
             context['user_has_reacted'] = post.reactions.filter(user=self.request.user, reaction_type='like').exists()
@@ -107,6 +196,14 @@ class BlogPostDetailView(DetailView):
                 comment.name = request.user.get_full_name() or request.user.email
                 comment.email = request.user.email
 
+            else:
+                verdict = SpamFilter().check(request, comment.content, comment.name, comment.email)
+                if not verdict.allowed:
+                    context = self.get_context_data()
+                    context['comment_form'] = form
+                    messages.error(request, SPAM_MESSAGES[verdict.reason])
+                    return self.render_to_response(context, status=429 if verdict.reason == 'rate' else 200)
+
             parent_id = request.POST.get('parent_id')
             if parent_id:
                 parent = BlogComment.objects.filter(pk=parent_id, post=self.object).first()
@@ -140,15 +237,18 @@ class BlogPostDetailView(DetailView):
 
 
 class BlogPostToggleReactionView(LoginRequiredMixin, View):
+    """Marca o desmarca "me gusta". Con `reacted=1|0` fija el estado pedido, así repetir la petición no cambia el conteo"""
+
     def post(self, request, slug):
-        post = get_object_or_404(BlogPost, slug=slug, is_active=True)
-        reaction, created = BlogReaction.objects.get_or_create(post=post, user=request.user, defaults={'reaction_type': 'like'})
-        if not created:
-            reaction.delete()
-            reacted = False
+        post = get_object_or_404(BlogPost.objects.only('pk', 'reaction_count'), slug=slug, is_active=True)
+        service = ReactionService()
+        desired = request.POST.get('reacted')
+        if desired in ('0', '1'):
+            reacted = desired == '1'
+            count = service.set_reaction(post, request.user, reacted)
         else:
-            reacted = True
-        return JsonResponse({'reacted': reacted, 'count': post.reactions.count()})
+            reacted, count = service.toggle(post, request.user)
+        return JsonResponse({'reacted': reacted, 'count': count})
 
 
 class BlogPostReportView(View):
@@ -170,53 +270,69 @@ class BlogPostReportView(View):
 
 
 class BlogReportListView(AdminRoleRequiredMixin, ListView):
-    model = BlogReport
+    """Cola de moderación: un renglón por contenido reportado, con acciones masivas"""
     template_name = 'blog/report_list.html'
-    context_object_name = 'reports'
-    paginate_by = 20
+    context_object_name = 'groups'
 
-    def get_queryset(self):
-        status = (self.request.GET.get('status') or 'pending').strip()
-        qs = BlogReport.objects.select_related('post', 'comment', 'reporter', 'processed_by')
-        if status:
-            qs = qs.filter(status=status)
-        return qs.order_by('-created_at')
-
-    def post(self, request, *args, **kwargs):
-        if not request.POST.get('report_id'):
-            return redirect('blog:report_list')
+    STATUS_ACTIONS = {'in_review', 'resolved', 'dismissed'}
 
-        report = get_object_or_404(BlogReport, pk=request.POST['report_id'])
-        action = request.POST.get('action')
-        new_status = None
-        if action == 'in_review':
-            new_status = 'in_review'
-        elif action == 'resolved':
-            new_status = 'resolved'
-        elif action == 'dismissed':
-            new_status = 'dismissed'
-
-        if new_status:
-            report.status = new_status
-            report.processed_by = request.user
-            from django.utils import timezone
-            report.processed_at = timezone.now()
-            report.save(update_fields=['status', 'processed_by', 'processed_at'])
-            messages.success(request, f'Reporte #{report.id} marcado como {report.get_status_display().lower()}.')
-        else:
-            messages.error(request, 'Acción inválida para el reporte.')
+    def get_status(self):
+        status = (self.request.GET.get('status') or 'pending').strip()
+        return status if status in dict(BlogReport.STATUS_CHOICES) else 'pending'
 
-        return redirect(request.path + f"?status={request.GET.get('status', 'pending')}")
+    def get_queryset(self):
+        return ModerationQueue(self.get_status())
 
     def get_context_data(self, **kwargs):
-        context = super().get_context_data(**kwargs)
-        context['report_status_choices'] = BlogReport.STATUS_CHOICES
+        try:
+            page = self.object_list.page(self.request.GET.get('cursor'))
+        except InvalidCursor:
+            raise Http404('Cursor inválido.')
+        context = super().get_context_data(object_list=page.object_list, **kwargs)
+        context.update({
+            'report_status_choices': BlogReport.STATUS_CHOICES,
+            'selected_status': self.object_list.status,
+            'next_cursor': page.next_cursor,
+            # Un formulario oculto por usuario para las acciones "descartar sus reportes" y "ocultar su contenido"
+            'reporter_ids': sorted({report.reporter_id for group in page for report in group['reports'] if report.reporter_id}),
+            'author_ids': sorted({
+                (group['comment'] or group['post']).author_id for group in page
+                if (group['comment'] or group['post']) and (group['comment'] or group['post']).author_id
+            }),
+        })
         return context
 
-    def get_context_data(self, **kwargs):
-        context = super().get_context_data(**kwargs)
-        context['report_status_choices'] = BlogReport.STATUS_CHOICES
-        return context
+    def post(self, request, *args, **kwargs):
+        action = request.POST.get('action')
+        service = ModerationService(request.user)
+
+        if request.POST.get('report_id'):
+            # Acción sobre un reporte puntual
+            report = get_object_or_404(BlogReport, pk=request.POST['report_id'])
+            if action in self.STATUS_ACTIONS:
+                count = BlogReport.objects.filter(pk=report.pk).update(
+                    status=action, processed_by=request.user, processed_at=timezone.now(),
+                )
+            else:
+                count = None
+        elif action in ('hide_author', 'dismiss_reporter'):
+            User = get_user_model()
+            user = get_object_or_404(User, pk=request.POST.get('user_id'))
+            count = getattr(service, action)(user)
+        else:
+            post_ids, comment_ids = parse_targets(request.POST.getlist('target'))
+            if action in self.STATUS_ACTIONS:
+                count = service.set_status(post_ids, comment_ids, action)
+            elif action == 'hide':
+                count = service.hide_targets(post_ids, comment_ids)
+            else:
+                count = None
+
+        if count is None:
+            messages.error(request, 'Acción inválida para el reporte.')
+        else:
+            messages.success(request, f'{count} reporte(s) actualizados.')
+        return redirect(request.path + f"?status={request.POST.get('status') or request.GET.get('status', 'pending')}")
 
 
 class BlogPostCreateView(LoginRequiredMixin, CreateView):
@@ -235,15 +351,7 @@ class BlogPostCreateView(LoginRequiredMixin, CreateView):
 
     def form_valid(self, form):
         form.instance.author = self.request.user
-        base_slug = slugify(form.instance.title) or 'publicacion'
-
-        candidate = base_slug
-        counter = 1
-        while BlogPost.objects.filter(slug=candidate).exists():
-            counter += 1
-            candidate = f"{base_slug}-{counter}"
-
-        form.instance.slug = candidate
+        # El slug se asigna al guardar (UniqueSlugMixin) con el siguiente sufijo libre
 
         image_formset = BlogImageFormSet(self.request.POST, self.request.FILES)
         if image_formset.is_valid():
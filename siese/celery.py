@@ -8,14 +8,31 @@ app = Celery('siese')
 app.config_from_object('django.conf:settings', namespace='CELERY')
 app.autodiscover_tasks()
 
-# Programación: actualizar Ley 1715 todos los días a medianoche
+# Programación de tareas periódicas
 app.conf.beat_schedule = {
-    'update-ley-1715-midnight': {
-        'task': 'apps.regulatory.tasks.update_ley_1715_task',
+    # Scraping de todos los marcos legales activos, repartido entre los workers
+    'scrape-legal-frameworks-midnight': {
+        'task': 'apps.regulatory.tasks.run_scraping_orchestrator_task',
         'schedule': crontab(minute=0, hour=0),
     },
-    'update-ley-2099-midnight': {
-        'task': 'apps.regulatory.tasks.update_ley_2099_task',
-        'schedule': crontab(minute=0, hour=0),
+    # Analítica de cursos fuera de horas pico
+    'rebuild-course-analytics-nightly': {
+        'task': 'apps.educational.tasks.rebuild_course_analytics_task',
+        'schedule': crontab(minute=30, hour=2),
+    },
+    # Conteos de reacciones del blog acumulados en caché
+    'flush-blog-reaction-counts': {
+        'task': 'blog.tasks.flush_reaction_counts_task',
+        'schedule': 60.0,
+    },
+    # Filtro de spam de comentarios, con los reportes moderados del día
+    'train-blog-spam-filter-nightly': {
+        'task': 'blog.tasks.train_spam_filter_task',
+        'schedule': crontab(minute=15, hour=3),
+    },
+    # Publicaciones relacionadas del blog (similitud TF-IDF por categoría)
+    'rebuild-blog-related-posts-nightly': {
+        'task': 'blog.tasks.rebuild_related_posts_task',
+        'schedule': crontab(minute=45, hour=3),
     },
 }
@@ -176,6 +176,12 @@ ACCOUNT_FORMS = {
 
 OPENAI_API_KEY = config('OPENAI_API_KEY', default='')
 
+# Generación de contenido normativo con IA (ver apps.regulatory.ai_content)
+AI_SUMMARY_CLIENT = config('AI_SUMMARY_CLIENT', default='apps.regulatory.ai_content.OpenAIClient')
+AI_SUMMARY_MODEL = config('AI_SUMMARY_MODEL', default='gpt-4.1-2025-04-14')
+AI_SUMMARY_RATE_LIMIT = config('AI_SUMMARY_RATE_LIMIT', default='20/m')
+AI_SUMMARY_MAX_CHARS = config('AI_SUMMARY_MAX_CHARS', default=6000, cast=int)
+
 # Django REST Framework
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
@@ -201,6 +207,43 @@ CORS_ALLOWED_ORIGINS = [
 CRISPY_ALLOWED_TEMPLATE_PACKS = "tailwind"
 CRISPY_TEMPLATE_PACK = "tailwind"
 
+# Cache Configuration
+# En producción se usa Redis (CACHE_URL); en desarrollo basta la caché en memoria.
+# Sin ella el límite por host del scraping y el filtro de spam del blog usan el Redis del
+# broker (REDIS_URL), y los contadores de reacciones se escriben al momento.
+CACHE_URL = config('CACHE_URL', default='')
+if CACHE_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': CACHE_URL,
+            'KEY_PREFIX': 'siese',
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'siese-default',
+        }
+    }
+
+# Verificación pública de certificados
+CERTIFICATE_VERIFICATION_CACHE_TIMEOUT = config('CERTIFICATE_VERIFICATION_CACHE_TIMEOUT', default=60 * 60 * 24, cast=int)
+
+# Orquestador de scraping de normativas
+SCRAPING_PER_HOST_CONCURRENCY = config('SCRAPING_PER_HOST_CONCURRENCY', default=2, cast=int)
+SCRAPING_MAX_ATTEMPTS = config('SCRAPING_MAX_ATTEMPTS', default=4, cast=int)
+SCRAPING_RETRY_BACKOFF = config('SCRAPING_RETRY_BACKOFF', default=30, cast=int)
+
+# Filtro de spam y límites para comentarios anónimos del blog (ver blog.spam)
+BLOG_COMMENT_IP_RATE = config('BLOG_COMMENT_IP_RATE', default='10/h')
+BLOG_COMMENT_EMAIL_RATE = config('BLOG_COMMENT_EMAIL_RATE', default='5/h')
+BLOG_SPAM_THRESHOLD = config('BLOG_SPAM_THRESHOLD', default=0.9, cast=float)
+BLOG_SPAM_MAX_LINKS = config('BLOG_SPAM_MAX_LINKS', default=3, cast=int)
+# Solo detrás de un proxy de confianza: toma la IP del cliente de X-Forwarded-For
+BLOG_TRUST_X_FORWARDED_FOR = config('BLOG_TRUST_X_FORWARDED_FOR', default=False, cast=bool)
+
 # Celery Configuration
 CELERY_BROKER_URL = config('REDIS_URL', default='redis://localhost:6379/0')
 CELERY_RESULT_BACKEND = config('REDIS_URL', default='redis://localhost:6379/0')